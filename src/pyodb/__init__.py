@@ -1 +1,4 @@
-from .pyodb import PyODB, PyODBCache  # noqa: F401
+from .async_pyodb import AsyncPyODB, AsyncPyODBCache  # noqa: F401
+from .blob import Blob  # noqa: F401
+from .pyodb import CacheInfo, PyODB, PyODBCache  # noqa: F401
+from .serializer import Serializer  # noqa: F401
@@ -0,0 +1,72 @@
+"""Hit, miss and latency statistics of PyODBCache.
+"""
+from bisect import bisect_left
+from threading import Lock
+from typing import Any
+
+# Sources serving a call of `PyODBCache.get_data` and background refreshes
+MEMORY = "memory"
+SHARED = "shared"
+DATABASE = "database"
+MISS = "miss"
+REFRESH = "refresh"
+SOURCES = (MEMORY, SHARED, DATABASE, MISS, REFRESH)
+
+# Upper bounds of the latency histogram buckets in seconds
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+
+class CacheStats:
+    """Counts and latency histograms of one cache by source: served from memory, served from
+    shared memory, served from the database, served by calling the data function (miss) and
+    refreshed in the background."""
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.reset()
+
+
+    def record(self, source: str, seconds: float):
+        """Records one call.
+
+        Args:
+            source (str): One of `SOURCES`.
+            seconds (float): Duration of the call.
+        """
+        with self._lock:
+            self._counts[source] += 1
+            self._totals[source] += seconds
+            self._buckets[source][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+
+    def count(self, source: str) -> int:
+        """Returns the number of recorded calls of the source."""
+        return self._counts[source]
+
+
+    def reset(self):
+        """Resets all counts and histograms."""
+        with self._lock:
+            self._counts = dict.fromkeys(SOURCES, 0)
+            self._totals = dict.fromkeys(SOURCES, 0.0)
+            self._buckets = {source: [0] * len(LATENCY_BUCKETS) for source in SOURCES}
+
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the counts and, per source, the total duration and the histogram which maps
+        the upper bound of every bucket to the number of calls."""
+        with self._lock:
+            return {
+                "memory_hits": self._counts[MEMORY],
+                "shared_hits": self._counts[SHARED],
+                "db_hits": self._counts[DATABASE],
+                "misses": self._counts[MISS],
+                "refreshes": self._counts[REFRESH],
+                "latency": {
+                    source: {
+                        "count": self._counts[source],
+                        "total": self._totals[source],
+                        "buckets": dict(zip(LATENCY_BUCKETS, self._buckets[source])),
+                    }
+                    for source in SOURCES
+                },
+            }
@@ -0,0 +1,66 @@
+"""Database backed leases which let exactly one cache instance refresh an entry at a time, across
+threads and processes sharing the database.
+"""
+import sqlite3 as sql
+from time import time
+from typing import Callable
+
+
+class LeaseTable:
+    """Table of refresh leases by key. A lease is held until it is released or its timeout
+    passes, so leases of crashed owners are taken over eventually.
+
+    Args:
+        name (str): Name of the lease table.
+        connect (Callable[[], sql.Connection]): Returns the current thread's connection to the
+            database file holding the table.
+    """
+    def __init__(self, name: str, connect: Callable[[], sql.Connection]) -> None:
+        self._name = name
+        self._connect = connect
+
+
+    def create(self):
+        """Creates the lease table if it does not exist yet."""
+        conn = self._connect()
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS \"{self._name}\" "
+            "(key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL);"
+        )
+        conn.commit()
+
+
+    def acquire(self, key: str, owner: str, timeout: float) -> bool:
+        """Tries to take the lease of the key. Expired leases are taken over.
+
+        Args:
+            key (str): The leased key.
+            owner (str): Unique identifier of the caller.
+            timeout (float): Seconds until the lease expires.
+
+        Returns:
+            bool: Whether the caller holds the lease now.
+        """
+        now = time()
+        conn = self._connect()
+        conn.execute(
+            f"INSERT INTO \"{self._name}\" (key, owner, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+            f"WHERE \"{self._name}\".expires < ?;",
+            [key, owner, now + timeout, now]
+        )
+        acquired = conn.execute("SELECT changes();").fetchone()[0] > 0
+        conn.commit()
+        return acquired
+
+
+    def release(self, key: str, owner: str):
+        """Releases the lease of the key if it is still held by the owner.
+
+        Args:
+            key (str): The leased key.
+            owner (str): Unique identifier of the caller.
+        """
+        conn = self._connect()
+        conn.execute(f"DELETE FROM \"{self._name}\" WHERE key = ? AND owner = ?;", [key, owner])
+        conn.commit()
@@ -0,0 +1,221 @@
+"""Size-bounded in-memory tier of PyODBCache. Evicted entries are still held by the database tier,
+so eviction only costs a reload of the entry.
+"""
+import sys
+from collections import OrderedDict
+from threading import Lock
+from time import time
+from typing import Any, Hashable
+
+EVICTION_POLICIES = ("lru", "lfu")
+
+
+def approximate_size(val: Any) -> int:
+    """Approximates the memory used by a value including all objects it references through
+    containers and instance dictionaries. Shared objects are counted once.
+
+    Args:
+        val (Any): The value to measure.
+
+    Returns:
+        int: The approximate size in bytes.
+    """
+    seen: set[int] = set()
+    pending = [val]
+    size = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+        elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+            pending.append(obj.__dict__)
+    return size
+
+
+class _Entry:
+    __slots__ = ("data", "expires", "keep_until", "size", "hits")
+
+
+    def __init__(self, data: Any, expires: float, keep_until: float, size: int) -> None:
+        self.data = data
+        self.expires = expires
+        self.keep_until = keep_until
+        self.size = size
+        self.hits = 0
+
+
+class MemoryTier:
+    """In-memory store of cache entries bounded by entry count and approximate size. Once a bound
+    is exceeded, entries are evicted by least recent (`lru`) or least frequent (`lfu`) use.
+    Entries are kept past their expiry until `keep_until` so they can be served while being
+    refreshed.
+
+    Args:
+        max_entries (int | None, optional): Maximum number of entries. Defaults to None which is
+            unbounded.
+        max_bytes (int | None, optional): Maximum approximate size of all entries in bytes.
+            Defaults to None which is unbounded.
+        eviction (str, optional): "lru" or "lfu". Defaults to "lru".
+
+    Raises:
+        ValueError: In case the eviction policy is unknown or a bound is less than 1.
+    """
+    def __init__(
+            self,
+            max_entries: int | None = None,
+            max_bytes: int | None = None,
+            eviction: str = "lru"
+        ) -> None:
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(
+                f"Unknown eviction policy '{eviction}'! Use one of {list(EVICTION_POLICIES)}"
+            )
+        if any(bound is not None and bound < 1 for bound in (max_entries, max_bytes)):
+            raise ValueError("max_entries and max_bytes must be >= 1!")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction = eviction
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._size = 0
+        self._evictions = 0
+        self._lock = Lock()
+
+
+    @property
+    def size(self) -> int:
+        """Approximate size of all entries in bytes."""
+        return self._size
+
+
+    @property
+    def evictions(self) -> int:
+        """Number of entries evicted because a bound was exceeded."""
+        return self._evictions
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+    def get(self, key: Hashable, stale: bool = False) -> tuple[Any, float] | None:
+        """Returns the data and expiry time of an entry and marks it as used.
+
+        Args:
+            key (Hashable): Key of the entry.
+            stale (bool, optional): Whether expired entries are returned. Defaults to False.
+
+        Returns:
+            tuple[Any, float] | None: Data and expiry time or None if there is no such entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (not stale and entry.expires < time()):
+                return None
+            entry.hits += 1
+            self._entries.move_to_end(key)
+            return entry.data, entry.expires
+
+
+    def put(self, key: Hashable, data: Any, expires: float, keep_until: float | None = None):
+        """Stores an entry and evicts other entries in case a bound is exceeded. Entries larger
+        than `max_bytes` are not stored at all.
+
+        Args:
+            key (Hashable): Key of the entry.
+            data (Any): The cached data.
+            expires (float): Expiry time of the data.
+            keep_until (float | None, optional): Time until the entry is kept after it expired.
+                Defaults to None which is the expiry time.
+        """
+        size = approximate_size(data)
+        with self._lock:
+            self._remove(key)
+            self._prune()
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            entry = _Entry(data, expires, max(expires, keep_until or expires), size)
+            self._entries[key] = entry
+            self._size += size
+            self._evict(key)
+
+
+    def set_expiry(self, key: Hashable, expires: float):
+        """Changes the expiry time of an entry.
+
+        Args:
+            key (Hashable): Key of the entry.
+            expires (float): The new expiry time.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires = expires
+
+
+    def pop(self, key: Hashable):
+        """Removes an entry.
+
+        Args:
+            key (Hashable): Key of the entry.
+        """
+        with self._lock:
+            self._remove(key)
+
+
+    def sizes(self) -> dict[Hashable, int]:
+        """Returns the approximate size in bytes of every entry."""
+        with self._lock:
+            return {key: entry.size for key, entry in self._entries.items()}
+
+
+    def keys(self) -> list[Hashable]:
+        """Returns the keys of all entries from least to most recently used."""
+        with self._lock:
+            return list(self._entries)
+
+
+    def clear(self):
+        """Removes all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+
+    def _prune(self):
+        """Removes entries which are not kept anymore."""
+        now = time()
+        for key in [key for key, entry in self._entries.items() if entry.keep_until < now]:
+            self._remove(key)
+
+
+    def _evict(self, new_key: Hashable):
+        """Evicts entries other than the new one until all bounds are met."""
+        while (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._size > self.max_bytes)
+        ):
+            candidates = (key for key in self._entries if key != new_key)
+            if self.eviction == "lfu":
+                # Ties are broken by recency since the entries are ordered by their last use
+                key = min(candidates, key=lambda key: self._entries[key].hits)
+            else:
+                key = next(candidates)
+            self._remove(key)
+            self._evictions += 1
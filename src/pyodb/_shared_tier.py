@@ -0,0 +1,239 @@
+"""Shared-memory tier of PyODBCache which lets processes on one host read serialized cache entries
+without querying the database and without holding a copy per process. The database remains the
+source of truth, the tier only mirrors entries saved by the instances using it.
+"""
+import hashlib
+import os
+import struct
+import sys
+from collections import OrderedDict
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock
+
+try:
+    import _posixshmem
+except ImportError: # Windows removes segments once no process has them open
+    _posixshmem = None
+
+# Every cache has an index segment holding its epoch. Clearing the cache increments the epoch,
+# which invalidates all entries written before.
+_INDEX = struct.Struct("<Q")
+# Every entry has a header segment holding a sequence number, which is odd while the header is
+# written, the generation of the payload segment, the expiry time, the payload size and the epoch
+_HEADER = struct.Struct("<QQdQQ")
+# Attempts to read a header which is written concurrently
+_READ_ATTEMPTS = 8
+# Maximum number of attached header and index segments. Every mapping holds a file descriptor.
+_MAX_ATTACHED = 128
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> SharedMemory:
+    """Creates or attaches a segment which outlives the process. Segments are not tracked, since
+    the resource tracker would unlink them once the process exits. The descriptor of the segment
+    is closed right away, since the mapping holds it's own one."""
+    if sys.version_info >= (3, 13):
+        segment = SharedMemory(name, create, size, track=False)
+    else:
+        segment = SharedMemory(name, create, size)
+        resource_tracker.unregister(segment._name, "shared_memory")
+    if _posixshmem is not None:
+        os.close(segment._fd)
+        segment._fd = -1
+    return segment
+
+
+def _unlink(name: str):
+    """Removes a segment by name. Processes which attached it keep their mapping. Unlike
+    `SharedMemory.unlink` the segment is not unregistered from the resource tracker a second
+    time."""
+    if _posixshmem is None:
+        return
+    try:
+        _posixshmem.shm_unlink(f"/{name}")
+    except FileNotFoundError:
+        pass
+
+
+class SharedTier:
+    """Serialized cache entries in named shared memory segments. Names are derived from the
+    namespace (the database folder), the cache key and the arguments hash, so every process using
+    the same namespace finds the same segments.
+
+    Payloads are written once into a new segment per generation. Writers publish a generation by
+    updating the entry's header like a sequence lock, so readers never see a partially written
+    header and always read a complete payload. Concurrent writers of one entry are prevented by the
+    refresh lease of the entry.
+
+    Args:
+        namespace (str): Identifies the caches sharing the segments.
+    """
+    def __init__(self, namespace: str) -> None:
+        self._namespace = namespace
+        self._segments: OrderedDict[str, SharedMemory] = OrderedDict()
+        self._created: set[str] = set()
+        self._lock = Lock()
+
+
+    def get(self, cache_key: str, args_hash: str) -> tuple[bytes, float] | None:
+        """Reads an entry.
+
+        Args:
+            cache_key (str): Key of the cache.
+            args_hash (str): Hash of the data function's arguments.
+
+        Returns:
+            tuple[bytes, float] | None: The serialized data and it's expiry time, which may have
+                passed. None if there is no such entry, it was invalidated or the segments cannot
+                be attached, e.g. since the process reached it's limit of open files.
+        """
+        name = self._entry_name(cache_key, args_hash)
+        try:
+            fields = self._read_header(name)
+            if fields is None or fields[0] == 0 or fields[3] != self._epoch(cache_key):
+                return None
+            generation, expires, size, _ = fields
+            payload = self._read_payload(name, generation, size)
+        except OSError:
+            return None
+        return (payload, expires) if payload is not None else None
+
+
+    def put(self, cache_key: str, args_hash: str, payload: bytes, expires: float):
+        """Writes an entry. Readers keep reading the previous payload until the new one is
+        completely written.
+
+        Args:
+            cache_key (str): Key of the cache.
+            args_hash (str): Hash of the data function's arguments.
+            payload (bytes): The serialized data.
+            expires (float): Expiry time of the data.
+        """
+        name = self._entry_name(cache_key, args_hash)
+        header = self._segment(name, _HEADER.size)
+        epoch = self._epoch(cache_key)
+        seq, old_generation = _HEADER.unpack_from(header.buf)[:2]
+        generation = old_generation % 0xFFFFFFFF + 1
+
+        segment = self._create(f"{name}_{generation:08x}", max(len(payload), 1))
+        segment.buf[:len(payload)] = payload
+        segment.close()
+
+        seq += seq % 2 + 1
+        struct.pack_into("<Q", header.buf, 0, seq)
+        _HEADER.pack_into(header.buf, 0, seq, generation, expires, len(payload), epoch)
+        struct.pack_into("<Q", header.buf, 0, seq + 1)
+
+        if old_generation:
+            self._drop(f"{name}_{old_generation:08x}")
+
+
+    def invalidate(self, cache_key: str):
+        """Invalidates all entries of a cache.
+
+        Args:
+            cache_key (str): Key of the cache.
+        """
+        index = self._segment(self._index_name(cache_key), _INDEX.size)
+        _INDEX.pack_into(index.buf, 0, _INDEX.unpack_from(index.buf)[0] + 1)
+
+
+    def close(self, unlink: bool = False):
+        """Detaches all segments.
+
+        Args:
+            unlink (bool, optional): Whether to remove the segments created by this instance.
+                Other processes fall back to the database once they attach a removed segment.
+                Defaults to False.
+        """
+        with self._lock:
+            segments = list(self._segments.values())
+            self._segments.clear()
+            created, self._created = self._created, set()
+        for segment in segments:
+            segment.close()
+        if unlink:
+            for name in created:
+                _unlink(name)
+
+
+    def _entry_name(self, cache_key: str, args_hash: str) -> str:
+        # Names are kept short, since some platforms limit them to 31 characters
+        digest = hashlib.blake2b(
+            f"{self._namespace}\0{cache_key}\0{args_hash}".encode(), digest_size=8
+        ).hexdigest()
+        return f"pyodb_{digest}"
+
+
+    def _index_name(self, cache_key: str) -> str:
+        return self._entry_name(cache_key, "")
+
+
+    def _epoch(self, cache_key: str) -> int:
+        index = self._segment(self._index_name(cache_key))
+        return _INDEX.unpack_from(index.buf)[0] if index is not None else 0
+
+
+    def _read_header(self, name: str) -> tuple[int, float, int, int] | None:
+        """Reads generation, expiry time, payload size and epoch of an entry. Returns None if
+        there is no such entry or the header is written concurrently during all attempts."""
+        header = self._segment(name)
+        for _ in range(_READ_ATTEMPTS if header is not None else 0):
+            seq, generation, expires, size, epoch = _HEADER.unpack_from(header.buf)
+            if seq % 2 == 0 and struct.unpack_from("<Q", header.buf)[0] == seq:
+                return generation, expires, size, epoch
+        return None
+
+
+    def _segment(self, name: str, create_size: int | None = None) -> SharedMemory | None:
+        """Returns an attached header or index segment. Attaches the segment or, if
+        `create_size` is given, creates it in case it does not exist yet. Only the most recently
+        used segments stay attached. Others are detached once no reader uses them anymore."""
+        with self._lock:
+            segment = self._segments.get(name)
+            if segment is not None:
+                self._segments.move_to_end(name)
+                return segment
+        try:
+            segment = _open_segment(name)
+        except (FileNotFoundError, ValueError):
+            # Segments being created by another process are empty for a moment
+            if create_size is None:
+                return None
+            try:
+                segment = self._create(name, create_size)
+            except FileExistsError:
+                segment = _open_segment(name)
+        with self._lock:
+            segment = self._segments.setdefault(name, segment)
+            while len(self._segments) > _MAX_ATTACHED:
+                self._segments.popitem(last=False)
+        return segment
+
+
+    def _read_payload(self, name: str, generation: int, size: int) -> bytes | None:
+        """Copies the payload of an entry's generation. Payloads are detached right after
+        copying, so the number of mapped segments does not grow with the number of entries.
+        Returns None if the generation was replaced and removed in the meantime."""
+        try:
+            segment = _open_segment(f"{name}_{generation:08x}")
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            return bytes(segment.buf[:size])
+        finally:
+            segment.close()
+
+
+    def _create(self, name: str, size: int) -> SharedMemory:
+        segment = _open_segment(name, create=True, size=size)
+        with self._lock:
+            self._created.add(name)
+        return segment
+
+
+    def _drop(self, name: str):
+        """Removes a payload segment which was replaced by a newer generation."""
+        with self._lock:
+            self._created.discard(name)
+        _unlink(name)
@@ -1,4 +1,19 @@
+import hashlib
+import os
+import re
 import secrets
+from importlib import import_module
+from concurrent.futures import ThreadPoolExecutor
+from threading import local
+from types import FunctionType
+from typing import Any, Callable, TypeVar
+
+from pyodb.error import CacheError
+
+T = TypeVar("T")
+_worker_state = local()
+# Default reprs contain the address of the object, which differs between calls and processes
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
 
 
 def generate_uid(length: int = 32) -> str:
@@ -11,3 +26,127 @@ def generate_uid(length: int = 32) -> str:
         str: ASCII UID
     """
     return secrets.token_urlsafe(length)[:length]
+
+
+def locate_type(fqcn: str) -> type | None:
+    """Finds a type by it's fully qualified class name. Unlike `pydoc.locate` this does not
+    swallow exceptions of failed imports, which keep the calling frames alive in reference cycles.
+
+    Args:
+        fqcn (str): Fully qualified class name like "module.sub_module.ClassName"
+
+    Returns:
+        type | None: The found type or None if it does not exist.
+    """
+    module, _, name = fqcn.rpartition(".")
+    try:
+        return getattr(import_module(module), name, None)
+    except (ImportError, ValueError):
+        return None
+
+
+def hash_args(args: tuple, kwargs: dict[str, Any]) -> str:
+    """Generates a hash of function arguments which is stable across processes. Keyword arguments
+    as well as the items of dictionaries and sets are hashed independent of their order.
+
+    Args:
+        args (tuple): Positional arguments.
+        kwargs (dict[str, Any]): Keyword arguments.
+
+    Returns:
+        str: Hex digest of the arguments.
+
+    Raises:
+        CacheError: In case an argument cannot be represented deterministically, like lambdas or
+            objects whose repr contains their address.
+    """
+    canonical = repr((_canonical(args), _canonical(kwargs)))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def _canonical(val: Any) -> Any:
+    """Converts a value into a structure with a deterministic repr. Objects without a dedicated
+    repr are represented by their type and members, including `__slots__`. Module level functions
+    are represented by their qualified name."""
+    if isinstance(val, FunctionType):
+        if "<" in val.__qualname__:
+            raise CacheError(f"{val.__qualname__} cannot be hashed! Use a module level function.")
+        return ("function", f"{val.__module__}.{val.__qualname__}")
+    if type(val).__repr__ is object.__repr__:
+        val = _members(val) | {"__type__": type(val).__qualname__}
+
+    if isinstance(val, dict):
+        val = ("dict", sorted((repr(_canonical(k)), _canonical(v)) for k, v in val.items()))
+    elif isinstance(val, (set, frozenset)):
+        val = ("set", sorted(repr(_canonical(item)) for item in val))
+    elif isinstance(val, (list, tuple)):
+        val = (type(val).__name__, [_canonical(item) for item in val])
+    elif _ADDRESS.search(repr(val)):
+        raise CacheError(f"{type(val)} cannot be hashed! It's repr contains it's address.")
+    return val
+
+
+def _members(obj: object) -> dict[str, Any]:
+    """Returns the members of the object, both from it's `__dict__` and it's `__slots__`."""
+    members = dict(vars(obj)) if hasattr(obj, "__dict__") else {}
+    for cls in type(obj).__mro__:
+        slots = getattr(cls, "__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+                members[name] = getattr(obj, name)
+    return members
+
+
+class FanOutPool:
+    """Lazily created thread pool used to run independent queries concurrently. Every worker thread
+    uses it's own database connections. sqlite3 releases the GIL while a query is executed so the
+    queries actually run in parallel.
+
+    Fan-outs started from within a worker are run inline to prevent the pool from deadlocking.
+    The pool is re-created in forked child processes since the worker threads are not forked.
+
+    Args:
+        max_workers (int | None, optional): Maximum number of worker threads. Defaults to None
+            which uses the ThreadPoolExecutor default.
+    """
+    def __init__(self, max_workers: int | None = None) -> None:
+        self._max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._pid = os.getpid()
+
+
+    def map(self, funcs: list[Callable[[], T]]) -> list[T]:
+        """Runs all passed functions concurrently and returns their results in order.
+
+        Args:
+            funcs (list[Callable[[], T]]): The functions to run.
+
+        Returns:
+            list[T]: The results of the functions.
+        """
+        if len(funcs) <= 1 or getattr(_worker_state, "active", False):
+            return [func() for func in funcs]
+
+        executor = self._get_executor()
+        futures = [executor.submit(self._run, func) for func in funcs]
+        return [future.result() for future in futures]
+
+
+    def shutdown(self):
+        """Shuts down the worker threads. The pool is re-created on the next fan-out."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(self._max_workers, thread_name_prefix="pyodb")
+            self._pid = os.getpid()
+        return self._executor
+
+
+    @staticmethod
+    def _run(func: Callable[[], T]) -> T:
+        _worker_state.active = True
+        return func()
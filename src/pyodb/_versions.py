@@ -0,0 +1,76 @@
+"""Version counters which let cache instances notice changes made by other processes sharing the
+database without reloading their data.
+"""
+import sqlite3 as sql
+from threading import local
+from typing import Callable
+
+
+class VersionTable:
+    """Version counter of one key, stored in a table shared by all keys of a database file.
+    Writers bump the counter in the transaction of their change. Readers first check
+    `PRAGMA data_version`, which only changes once another connection committed to the file, and
+    only then read the counter.
+
+    Args:
+        name (str): Name of the version table.
+        key (str): Key of the counter.
+        connect (Callable[[], sql.Connection]): Returns the current thread's connection to the
+            database file holding the table.
+    """
+    def __init__(self, name: str, key: str, connect: Callable[[], sql.Connection]) -> None:
+        self._name = name
+        self._key = key
+        self._connect = connect
+        self._local = local()
+
+
+    def create(self):
+        """Creates the version table and the counter if they do not exist yet."""
+        conn = self._connect()
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS \"{self._name}\" "
+            "(key TEXT PRIMARY KEY, version INTEGER NOT NULL);"
+        )
+        conn.execute(
+            f"INSERT OR IGNORE INTO \"{self._name}\" (key, version) VALUES (?, 0);", [self._key]
+        )
+        conn.commit()
+
+
+    def changed(self) -> bool:
+        """Whether another connection committed to the database file since the last call of the
+        current thread. The first call of every thread returns True.
+
+        Returns:
+            bool: True if the counter may have changed.
+        """
+        data_version = self._connect().execute("PRAGMA data_version;").fetchone()[0]
+        changed = getattr(self._local, "data_version", None) != data_version
+        self._local.data_version = data_version
+        return changed
+
+
+    def get(self) -> int:
+        """Returns the current value of the counter."""
+        row = self._connect().execute(
+            f"SELECT version FROM \"{self._name}\" WHERE key = ?;", [self._key]
+        ).fetchone()
+        return row[0] if row is not None else 0
+
+
+    def bump(self) -> int:
+        """Increments the counter. Commits unless a transaction is running.
+
+        Returns:
+            int: The new value of the counter.
+        """
+        conn = self._connect()
+        conn.execute(
+            f"INSERT INTO \"{self._name}\" (key, version) VALUES (?, 1) "
+            "ON CONFLICT (key) DO UPDATE SET version = version + 1;",
+            [self._key]
+        )
+        version = self.get()
+        conn.commit()
+        return version
@@ -0,0 +1,174 @@
+"""Write-behind queue which coalesces single saves into batched transactions.
+"""
+import atexit
+import warnings
+from queue import Empty, Queue
+from threading import Thread
+from time import monotonic, time
+from typing import Callable
+
+from pyodb.error import ExpiryError, PyODBWarning
+from pyodb.schema.shard_schema import ShardSchema
+from pyodb.schema.unified_schema import UnifiedSchema
+
+ErrorCallback = Callable[[Exception, list[object]], None]
+
+# Queue markers
+_FLUSH = object()
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """Queues objects and writes them on a background thread. Queued objects are grouped by type
+    and expiry and written through the `insert_many` path in one transaction, either once
+    `batch_size` objects are queued or `interval` seconds after the first object of a batch.
+
+    The queue is bounded. Saving blocks while `max_size` objects are waiting to be written.
+    In case a batch cannot be written, it's objects are written one by one, so only the objects
+    which fail on their own are reported.
+
+    Args:
+        schema (ShardSchema | UnifiedSchema): The schema the objects are written to.
+        batch_size (int, optional): Number of objects written at once. Defaults to 500.
+        interval (float, optional): Maximum number of seconds an object waits before it is
+            written. Defaults to 0.05.
+        max_size (int, optional): Maximum number of queued objects. Defaults to 10000.
+        on_error (ErrorCallback | None, optional): Called with the error and the affected object
+            for every object which could not be written. Defaults to None which emits a
+            `PyODBWarning` instead.
+    """
+    def __init__(
+            self,
+            schema: ShardSchema | UnifiedSchema,
+            batch_size: int = 500,
+            interval: float = 0.05,
+            max_size: int = 10000,
+            on_error: ErrorCallback | None = None
+        ) -> None:
+        if batch_size < 1 or max_size < 1:
+            raise ValueError("batch_size and max_size must be >= 1!")
+        if interval < 0:
+            raise ValueError("interval must be >= 0!")
+
+        self._schema = schema
+        self._batch_size = batch_size
+        self._interval = interval
+        self._on_error = on_error
+        self._queue: Queue = Queue(max_size)
+        self._thread = Thread(target=self._run, name="pyodb-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+
+    def put(self, obj: object, expires: float | None):
+        """Queues an object. Blocks while the queue is full.
+
+        Args:
+            obj (object): The object to save. It's type must be known by the schema.
+            expires (float | None): When the object expires.
+
+        Raises:
+            ExpiryError: In case the object already expired.
+            RuntimeError: In case the writer thread stopped.
+        """
+        if expires and expires <= time():
+            raise ExpiryError("expires must be greater than the current timestamp")
+        self._check_alive()
+        self._queue.put((obj, expires))
+
+
+    def flush(self):
+        """Writes all queued objects and blocks until they are written.
+
+        Raises:
+            RuntimeError: In case the writer thread stopped before all objects were written.
+        """
+        if self._thread.is_alive():
+            self._queue.put(_FLUSH)
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                self._check_alive()
+                self._queue.all_tasks_done.wait(0.1)
+
+
+    def close(self):
+        """Writes all queued objects and stops the writer thread."""
+        atexit.unregister(self.close)
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+
+    def _check_alive(self):
+        # Called while holding the queue's mutex during `flush`, so `qsize` must not be used
+        if not self._thread.is_alive():
+            raise RuntimeError(
+                "The write-behind thread stopped! "
+                f"{self._queue.unfinished_tasks} objects are not written."
+            )
+
+
+    def _run(self):
+        batch: list[tuple[object, float | None]] = []
+        deadline = 0.
+
+        while True:
+            try:
+                timeout = max(deadline - monotonic(), 0) if batch else None
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                # The oldest object waited for `interval` seconds
+                self._write(batch)
+                batch = []
+                continue
+
+            if item is _FLUSH or item is _STOP:
+                self._write(batch)
+                batch = []
+                self._queue.task_done()
+                if item is _STOP:
+                    return
+                continue
+
+            if not batch:
+                deadline = monotonic() + self._interval
+            batch += [item]
+            if len(batch) >= self._batch_size:
+                self._write(batch)
+                batch = []
+
+
+    def _write(self, batch: list[tuple[object, float | None]]):
+        """Writes the batch in one transaction and marks it's items as done."""
+        if not batch:
+            return
+
+        groups: dict[tuple[type, float | None], list[object]] = {}
+        for obj, expires in batch:
+            groups.setdefault((type(obj), expires), []).append(obj)
+
+        try:
+            with self._schema.transaction():
+                for (_, expires), objs in groups.items():
+                    self._schema.insert_many(objs, expires)
+        except Exception:
+            for obj, expires in batch:
+                try:
+                    self._schema.insert(obj, expires)
+                except Exception as err:
+                    self._report(err, [obj])
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+
+    def _report(self, err: Exception, objs: list[object]):
+        """Passes the error to the error callback. Errors of the callback itself must not stop the
+        writer thread."""
+        if self._on_error is None:
+            warnings.warn(f"Could not write {len(objs)} queued objects: {err!r}", PyODBWarning)
+            return
+        try:
+            self._on_error(err, objs)
+        except Exception as cb_err:
+            warnings.warn(f"Write-behind error callback failed: {cb_err!r}", PyODBWarning)
@@ -0,0 +1,443 @@
+"""Asyncio counterparts of PyODB and PyODBCache.
+All database I/O and assembly is run on a dedicated thread pool so the event loop is never blocked.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Event, Semaphore
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+from pyodb._util import hash_args
+from pyodb.pyodb import PyODB, PyODBCache
+from pyodb.schema.base._sql_builders import Delete, Select, _Query
+
+T = TypeVar("T")
+# Number of chunks `aiter` fetches ahead of the consumer
+PREFETCH_CHUNKS = 2
+
+
+class _AsyncQuery:
+    """Async wrapper around a query. Filters are added synchronously since they do not access the
+    database. See `Select` for the documentation of the filters.
+
+    Args:
+        query (_Query): The wrapped query.
+        executor (ThreadPoolExecutor): The executor the query is run on.
+    """
+    def __init__(self, query: _Query, executor: ThreadPoolExecutor) -> None:
+        self._query = query
+        self._executor = executor
+
+
+    def eq(self, or_: bool = False, **kwargs):
+        self._query.eq(or_, **kwargs)
+        return self
+
+
+    def ne(self, or_: bool = False, **kwargs):
+        self._query.ne(or_, **kwargs)
+        return self
+
+
+    def lt(self, or_: bool = False, **kwargs):
+        self._query.lt(or_, **kwargs)
+        return self
+
+
+    def gt(self, or_: bool = False, **kwargs):
+        self._query.gt(or_, **kwargs)
+        return self
+
+
+    def le(self, or_: bool = False, **kwargs):
+        self._query.le(or_, **kwargs)
+        return self
+
+
+    def ge(self, or_: bool = False, **kwargs):
+        self._query.ge(or_, **kwargs)
+        return self
+
+
+    def like(self, or_: bool = False, **kwargs):
+        self._query.like(or_, **kwargs)
+        return self
+
+
+    def nlike(self, or_: bool = False, **kwargs):
+        self._query.nlike(or_, **kwargs)
+        return self
+
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+
+class AsyncSelect(_AsyncQuery):
+    """Awaitable counterpart of `Select`.
+
+    ```python
+    objs = await odb.select(MyType).gt(number=5).all()
+    async for obj in odb.select(MyType).aiter():
+        ...
+    ```
+    """
+    _query: Select
+
+
+    def limit(self, limit: int, offset: int | None = None):
+        self._query.limit(limit, offset)
+        return self
+
+
+    async def one(self) -> Any:
+        """See `Select.one`"""
+        return await self._run(self._query.one)
+
+
+    async def first(self) -> Any:
+        """See `Select.first`"""
+        return await self._run(self._query.first)
+
+
+    async def all(self) -> list[Any]:
+        """See `Select.all`"""
+        return await self._run(self._query.all)
+
+
+    async def count(self) -> int:
+        """See `Select.count`"""
+        return await self._run(self._query.count)
+
+
+    async def update(self, **kwargs) -> int:
+        """See `Select.update`"""
+        return await self._run(partial(self._query.update, **kwargs))
+
+
+    async def incr(self, **kwargs) -> int:
+        """See `Select.incr`"""
+        return await self._run(partial(self._query.incr, **kwargs))
+
+
+    async def aiter(self, chunk_size: int = 100) -> AsyncIterator[Any]:
+        """Asynchronously iterates over all results of the query. Rows are fetched and assembled
+        in chunks of `chunk_size` by one worker thread, which stays at most `PREFETCH_CHUNKS`
+        chunks ahead of the consumer. The worker is released once the iteration ends or stops.
+
+        Args:
+            chunk_size (int, optional): Number of objects assembled at once. Defaults to 100.
+
+        Yields:
+            Any: Objects of the base type of the table.
+        """
+        objs = self._query.iter(chunk_size)
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        slots, stop = Semaphore(PREFETCH_CHUNKS), Event()
+        put = partial(loop.call_soon_threadsafe, chunks.put_nowait)
+        job = loop.run_in_executor(
+            self._executor, self._produce, objs, chunk_size, put, slots, stop
+        )
+        try:
+            while (chunk := await chunks.get()) is not None:
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                slots.release()
+                for obj in chunk:
+                    yield obj
+        finally:
+            stop.set()
+            slots.release()
+            await job
+
+
+    @staticmethod
+    def _produce(
+            objs,
+            chunk_size: int,
+            put: Callable[[Any], Any],
+            slots: Semaphore,
+            stop: Event
+        ):
+        """Passes the objects in chunks to `put` until they are exhausted or `stop` is set. Ends
+        with None or the raised error. The iterator is consumed on this thread only, since it holds
+        cursors of the thread's connections."""
+        try:
+            while slots.acquire() and not stop.is_set():
+                chunk = []
+                for obj in objs:
+                    chunk += [obj]
+                    if len(chunk) == chunk_size:
+                        break
+                if not chunk:
+                    break
+                put(chunk)
+            put(None)
+        except BaseException as err:
+            put(err)
+
+
+class AsyncDelete(_AsyncQuery):
+    """Awaitable counterpart of `Delete`."""
+    _query: Delete
+
+
+    async def commit(self, full_count: bool = False) -> int:
+        """See `Delete.commit`"""
+        return await self._run(self._query.commit, full_count)
+
+
+class AsyncPyODB:
+    """Awaitable counterpart of `PyODB` for asyncio applications.
+
+    Every database operation is run on a dedicated thread pool. Each worker thread uses it's own
+    database connections. Objects saved concurrently by many coroutines are written together in
+    shared transactions.
+
+    ```python
+    odb = AsyncPyODB(sharding=True)
+    await odb.save(MyType())
+    objs = await odb.select(MyType).gt(number=5).all()
+    ```
+
+    Args:
+        *args: Passed to `PyODB`.
+        max_workers (int | None, optional): Maximum number of worker threads. Defaults to None
+            which uses the ThreadPoolExecutor default.
+        **kwargs: Passed to `PyODB`.
+    """
+    def __init__(self, *args, max_workers: int | None = None, **kwargs) -> None:
+        self._pyodb = PyODB(*args, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="pyodb-async")
+        self._pending: list[tuple[object, float | None, asyncio.Future]] = []
+        # Futures of all saves which are not written yet, including the running batch
+        self._unfinished: set[asyncio.Future] = set()
+        self._flushing = False
+
+
+    @property
+    def pyodb(self) -> PyODB:
+        """The internal (synchronous) pyodb instance"""
+        return self._pyodb
+
+
+    async def save(self, obj: object, expires: float | None = None):
+        """Saves object to the database. Adds type in case it is not known. Saves of concurrently
+        running coroutines are bundled into one transaction.
+
+        Args:
+            obj (object): The object to save.
+            expires (float | None, optional): When the object expires and gets removed from the
+                database. Defaults to None.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._unfinished.add(future)
+        future.add_done_callback(self._unfinished.discard)
+        self._pending += [(obj, expires, future)]
+        if not self._flushing:
+            self._flushing = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        await future
+
+
+    async def save_multiple(self, objs: list[Any], expires: float | None = None):
+        """See `PyODB.save_multiple`"""
+        await self._run(self._pyodb.save_multiple, objs, expires)
+
+
+    async def add_type(self, type_: type):
+        """See `PyODB.add_type`"""
+        await self._run(self._pyodb.add_type, type_)
+
+
+    async def remove_type(self, type_: type):
+        """See `PyODB.remove_type`"""
+        await self._run(self._pyodb.remove_type, type_)
+
+
+    async def clear(self):
+        """See `PyODB.clear`"""
+        await self._run(self._pyodb.clear)
+
+
+    async def collect_blobs(self) -> int:
+        """See `PyODB.collect_blobs`"""
+        return await self._run(self._pyodb.collect_blobs)
+
+
+    def select(self, type_: type) -> AsyncSelect:
+        """See `PyODB.select`"""
+        return AsyncSelect(self._pyodb.select(type_), self._executor)
+
+
+    def delete(self, type_: type) -> AsyncDelete:
+        """See `PyODB.delete`"""
+        return AsyncDelete(self._pyodb.delete(type_), self._executor)
+
+
+    def contains_type(self, type_: type) -> bool:
+        """See `PyODB.contains_type`"""
+        return self._pyodb.contains_type(type_)
+
+
+    @property
+    def known_types(self) -> list[type]:
+        return self._pyodb.known_types
+
+
+    async def aclose(self):
+        """Waits for all pending saves and shuts down the worker threads."""
+        while self._unfinished:
+            await asyncio.gather(*self._unfinished, return_exceptions=True)
+        self._executor.shutdown()
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, *_):
+        await self.aclose()
+
+
+    def _flush(self):
+        """Writes all pending objects in one transaction on the executor. Objects saved while the
+        transaction is running are written in the next one."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            self._flushing = False
+            return
+
+        job = asyncio.get_running_loop().run_in_executor(
+            self._executor, self._write_batch, [(obj, expires) for obj, expires, _ in batch]
+        )
+        job.add_done_callback(partial(self._batch_done, batch))
+
+
+    def _batch_done(self, batch: list[tuple[object, float | None, asyncio.Future]], job):
+        """Resolves the futures of the batch with the error of their save. Errors escaping the
+        batch, like a `KeyboardInterrupt` or a cancelled job, are passed to every future."""
+        try:
+            errors: list[BaseException | None] = job.result()
+        except BaseException as err:
+            errors = [err] * len(batch)
+        for (_, _, future), err in zip(batch, errors):
+            if future.done():
+                continue
+            if err is None:
+                future.set_result(None)
+            elif isinstance(err, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(err)
+        self._flush()
+
+
+    def _write_batch(self, batch: list[tuple[object, float | None]]) -> list[Exception | None]:
+        """Saves all objects in one transaction. In case of an error the objects are saved one by
+        one so only the failing saves report an error. Unknown types are added beforehand, so
+        their tables are not rolled back together with a failed batch.
+
+        Returns:
+            list[Exception | None]: The error of every save if any.
+        """
+        for obj_type in {type(obj) for obj, _ in batch}:
+            try:
+                if not self._pyodb.contains_type(obj_type):
+                    self._pyodb.add_type(obj_type)
+            except Exception:
+                pass # Reported by the saves of the type below
+
+        try:
+            with self._pyodb.transaction():
+                for obj, expires in batch:
+                    self._pyodb.save(obj, expires)
+            return [None] * len(batch)
+        except Exception:
+            pass
+
+        errors: list[Exception | None] = []
+        for obj, expires in batch:
+            try:
+                self._pyodb.save(obj, expires)
+                errors += [None]
+            except Exception as err:
+                errors += [err]
+        return errors
+
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+
+class AsyncPyODBCache:
+    """Awaitable counterpart of `PyODBCache` for asyncio applications.
+
+    Data functions and database I/O are run on a dedicated thread pool. Concurrent requests for the
+    same cache and arguments are served by one single call.
+
+    ```python
+    cache = AsyncPyODBCache()
+    await cache.add_cache("key", data_func, MyType)
+    data = await cache.get_data("key")
+    ```
+
+    Args:
+        *args: Passed to `PyODBCache`.
+        max_workers (int | None, optional): Maximum number of worker threads. Defaults to None
+            which uses the ThreadPoolExecutor default.
+        **kwargs: Passed to `PyODBCache`.
+    """
+    def __init__(self, *args, max_workers: int | None = None, **kwargs) -> None:
+        self._cache = PyODBCache(*args, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="pyodb-async")
+        self._running: dict[tuple[str, str], asyncio.Future] = {}
+
+
+    @property
+    def cache(self) -> PyODBCache:
+        """The internal (synchronous) cache instance"""
+        return self._cache
+
+
+    def cache_exists(self, cache_key: str) -> bool:
+        """See `PyODBCache.cache_exists`"""
+        return self._cache.cache_exists(cache_key)
+
+
+    async def add_cache(self, *args, **kwargs):
+        """See `PyODBCache.add_cache`"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, partial(self._cache.add_cache, *args, **kwargs))
+
+
+    async def get_data(self, cache_key: str, *args, **kwargs) -> list[Any]:
+        """See `PyODBCache.get_data`"""
+        key = (cache_key, hash_args(args, kwargs))
+        if key in self._running:
+            return await asyncio.shield(self._running[key])
+
+        loop = asyncio.get_running_loop()
+        job = loop.run_in_executor(
+            self._executor, partial(self._cache.get_data, cache_key, *args, **kwargs)
+        )
+        self._running[key] = job
+        try:
+            return await asyncio.shield(job)
+        finally:
+            if self._running.get(key) is job:
+                del self._running[key]
+
+
+    async def aclose(self):
+        """Shuts down the worker threads."""
+        self._executor.shutdown()
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, *_):
+        await self.aclose()
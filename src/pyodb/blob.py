@@ -0,0 +1,171 @@
+"""Streaming binary member type which is written and read in chunks using SQLite's incremental
+blob I/O.
+"""
+import io
+import sqlite3 as sql
+from typing import BinaryIO, Callable
+
+# Number of bytes copied at once when a blob is saved
+CHUNK_SIZE = 1024 * 1024
+
+# Incremental blob I/O is available since Python 3.11
+STREAMING_SUPPORTED = hasattr(sql.Connection, "blobopen")
+
+BlobOpener = Callable[[bool], "sql.Blob"]
+
+
+class Blob(io.RawIOBase):
+    """Binary member for large payloads which should never be held in memory at once. Annotate
+    members with `Blob` or `Blob | None` to use it.
+
+    A new blob wraps a source which is copied into the database in chunks when the owning object
+    is saved. Loaded blobs are file-like objects reading and writing the stored value in place.
+    Stored blobs have a fixed size. Their rows only hold the size, so queries not touching the
+    payload stay cheap. Requires Python 3.11 or newer.
+
+    ```python
+    class Video:
+        name: str
+        data: Blob
+
+    with open("video.mp4", "rb") as file:
+        pyodb.save(Video("intro", Blob(file)))
+
+    video = pyodb.select(Video).eq(name="intro").one()
+    video.data.seek(1024)
+    header = video.data.read(64)
+    ```
+
+    Args:
+        source (bytes | BinaryIO, optional): The initial content. File-like objects are read from
+            their current position once the owning object is saved. Defaults to b"".
+        size (int | None, optional): Number of bytes to read from a file-like source. Defaults to
+            None which reads up to the end. Required for sources which are not seekable.
+
+    Raises:
+        ValueError: In case the size of the source cannot be determined.
+    """
+    def __init__(self, source: bytes | bytearray | BinaryIO = b"", size: int | None = None) -> None:
+        super().__init__()
+        if isinstance(source, (bytes, bytearray)):
+            size = len(source) if size is None else size
+            source = io.BytesIO(source)
+        elif size is None:
+            if not source.seekable():
+                raise ValueError("size is required for sources which are not seekable!")
+            pos = source.tell()
+            size = source.seek(0, io.SEEK_END) - pos
+            source.seek(pos)
+
+        self._source: BinaryIO | None = source
+        self._size = size
+        self._pos = 0
+        self._opener: BlobOpener | None = None
+        self.key: tuple[str, str, str] | None = None
+
+
+    def _bind(self, key: tuple[str, str, str], size: int, opener: BlobOpener):
+        """Binds the blob to a stored value. Further I/O accesses the stored value.
+
+        Args:
+            key (tuple[str, str, str]): The table, the uid of the owning row and the member name.
+            size (int): The size of the stored value.
+            opener (BlobOpener): Opens the stored value on the current thread's connection.
+                Takes whether the value is opened read-only.
+        """
+        self._source = None
+        self._size = size
+        self._pos = 0
+        self._opener = opener
+        self.key = key
+
+
+    @property
+    def stored(self) -> bool:
+        """Whether the blob accesses a stored value."""
+        return self._opener is not None
+
+
+    def __len__(self) -> int:
+        return self._size
+
+
+    def readable(self) -> bool:
+        return True
+
+
+    def writable(self) -> bool:
+        return self.stored
+
+
+    def seekable(self) -> bool:
+        return self.stored or bool(self._source and self._source.seekable())
+
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._size - self._pos)
+        if size <= 0:
+            return 0
+        data = self._read(size)
+        buffer[:len(data)] = data
+        return len(data)
+
+
+    def readall(self) -> bytes:
+        # Reads the remaining payload at once instead of in small buffers
+        return self._read(self._size - self._pos) if self._pos < self._size else b""
+
+
+    def write(self, data) -> int:
+        """Writes the data at the current position of a stored blob. Stored blobs cannot grow.
+
+        Raises:
+            io.UnsupportedOperation: In case the blob is not stored yet.
+            ValueError: In case the data would exceed the end of the blob.
+        """
+        if self._opener is None:
+            raise io.UnsupportedOperation("Only stored blobs are writable!")
+        if self._pos + len(data) > self._size:
+            raise ValueError("Stored blobs cannot grow!")
+        with self._opener(False) as handle:
+            handle.seek(self._pos)
+            handle.write(data)
+        self._pos += len(data)
+        return len(data)
+
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if self._opener is None:
+            if self._source is None or not self._source.seekable():
+                raise io.UnsupportedOperation("The source of the blob is not seekable!")
+            start = self._source.tell() - self._pos
+            self._source.seek(start + self._position(offset, whence))
+        self._pos = self._position(offset, whence)
+        return self._pos
+
+
+    def tell(self) -> int:
+        return self._pos
+
+
+    def _position(self, offset: int, whence: int) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._size}[whence]
+        if base + offset < 0:
+            raise ValueError("Negative seek position!")
+        return base + offset
+
+
+    def _read(self, size: int) -> bytes:
+        if self._opener is None:
+            data = self._source.read(size) if self._source is not None else b""
+        else:
+            # Handles are only held during one read so they never block other writers
+            with self._opener(True) as handle:
+                handle.seek(self._pos)
+                data = handle.read(size)
+        self._pos += len(data)
+        return data
+
+
+    def __repr__(self) -> str:
+        return f"Blob(size={self._size}, stored={self.stored})"
@@ -30,5 +30,14 @@ class UnknownTypeError(PyODBError):
 class BadTypeError(PyODBError):
     """Bad/Unexpected Type Error"""
 
+class UpdateError(PyODBError):
+    """Stored object could not be updated."""
+
 class CacheError(PyODBError):
     """An error occured in a datacache or datacache function."""
+
+class TransactionError(PyODBError):
+    """A database file cannot take part in the running transaction."""
+
+class PyODBWarning(UserWarning):
+    """An error occured on a background thread and no error callback handled it."""
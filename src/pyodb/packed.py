@@ -0,0 +1,110 @@
+"""Packed storage of homogeneous numeric sequences. Members annotated with `array.array` or
+`memoryview` are stored as raw machine values instead of being pickled element by element.
+"""
+import sys
+from array import array, typecodes
+from types import UnionType
+from typing import Any
+
+from pyodb.error import BadTypeError
+from pyodb.serializer import loads
+
+PACKED_TYPES: tuple[type, ...] = (array, memoryview)
+
+# Packed values start with this tag, followed by the byte order, the typecode and padding which
+# keeps the values 8-byte aligned
+_MAGIC = b"\x00a"
+_HEADER_SIZE = 8
+_NATIVE = b"<" if sys.byteorder == "little" else b">"
+_BYTEORDERS = {"": _NATIVE, "@": _NATIVE, "=": _NATIVE, "<": b"<", ">": b">", "!": b">"}
+
+
+def is_packed(type_: type | UnionType) -> bool:
+    """Whether members of the annotated type are stored packed.
+
+    Args:
+        type_ (type | UnionType): The annotated type of the member.
+
+    Returns:
+        bool: True for `array` and `memoryview` as well as their optional variants.
+    """
+    if isinstance(type_, UnionType):
+        return any(arg in PACKED_TYPES for arg in type_.__args__)
+    return type_ in PACKED_TYPES
+
+
+def pack(val: Any) -> bytes:
+    """Packs a numeric sequence into a tagged byte string.
+
+    Args:
+        val (Any): An `array`, any object supporting the buffer protocol with a numeric format
+            (like memoryviews or NumPy arrays) or a list/tuple of ints or floats.
+
+    Returns:
+        bytes: The packed value.
+
+    Raises:
+        BadTypeError: In case the value is no homogeneous numeric sequence.
+    """
+    try:
+        if isinstance(val, (list, tuple)):
+            val = array("q" if all(isinstance(item, int) for item in val) else "d", val)
+        view = memoryview(val)
+    except TypeError as err:
+        raise BadTypeError(f"Cannot pack value of type {type(val)}!") from err
+
+    fmt = val.typecode if isinstance(val, array) else view.format
+    byteorder, typecode = _BYTEORDERS.get(fmt[:-1]), fmt[-1:]
+    if byteorder is None or typecode not in typecodes or typecode == "u":
+        raise BadTypeError(f"Cannot pack values of format '{fmt}'!")
+
+    header = _MAGIC + byteorder + typecode.encode()
+    return header.ljust(_HEADER_SIZE, b"\x00") + view.tobytes()
+
+
+def unpack(data: bytes | memoryview, type_: type) -> array | memoryview:
+    """Unpacks a packed value. Values saved before the member was packed are deserialized.
+
+    Args:
+        data (bytes | memoryview): The stored value.
+        type_ (type): `array` or `memoryview`.
+
+    Returns:
+        array | memoryview: Memoryviews are read-only views of the stored data without any copy,
+            unless the value was written on a machine with a different byte order.
+    """
+    if bytes(data[:2]) != _MAGIC:
+        val = loads(data)
+        data = pack(val if not isinstance(val, (set, frozenset)) else list(val))
+
+    byteorder, typecode = bytes(data[2:3]), chr(data[3])
+    values = memoryview(data)[_HEADER_SIZE:]
+    if type_ is memoryview and byteorder == _NATIVE:
+        return values.cast(typecode)
+
+    arr = array(typecode)
+    arr.frombytes(values)
+    if byteorder != _NATIVE:
+        arr.byteswap()
+    return arr if type_ is array else memoryview(arr)
+
+
+def to_numpy(val: array | memoryview) -> Any:
+    """Returns a NumPy array viewing the data of a loaded packed member without copying it.
+
+    Args:
+        val (array | memoryview): The loaded member.
+
+    Returns:
+        numpy.ndarray: The NumPy view. Read-only if the member is a memoryview.
+
+    Raises:
+        ImportError: In case NumPy is not installed.
+    """
+    # NumPy is optional and slow to import, so it is only imported once it is needed
+    try:
+        import numpy
+    except ImportError as err:
+        raise ImportError("NumPy is required for NumPy views of packed members!") from err
+    dtype = val.typecode if isinstance(val, array) else val.format
+    return numpy.frombuffer(val, dtype=dtype)
@@ -1,13 +1,28 @@
 """Main module handling containing the main capabilities of the library.
 """
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+import re
+import warnings
+from contextlib import AbstractContextManager
 from pathlib import Path
-from time import time
-from typing import Any, Callable
-
-from pyodb.error import BadTypeError, CacheError
+from threading import Lock
+from time import perf_counter, sleep, time
+from functools import wraps
+from typing import Any, Callable, Iterable, NamedTuple, TypeVar
+
+from pyodb._cache_stats import DATABASE, MEMORY, MISS, REFRESH, SHARED, CacheStats
+from pyodb._lease import LeaseTable
+from pyodb._memory_tier import MemoryTier
+from pyodb._shared_tier import SharedTier
+from pyodb._util import generate_uid, hash_args, locate_type
+from pyodb._versions import VersionTable
+from pyodb._write_behind import ErrorCallback, WriteBehindQueue
+from pyodb.error import BadTypeError, CacheError, PyODBWarning
 from pyodb.schema.base._sql_builders import Delete, Select
 from pyodb.schema.shard_schema import ShardSchema
 from pyodb.schema.unified_schema import UnifiedSchema
+from pyodb.serializer import Serializer
 
 
 class PyODB:
@@ -51,29 +66,54 @@ class PyODB:
             Defaults to False.
         load_existing (bool, optional): Whether to load an existing schema or ignore it.
             Defaults to True.
+        partitions (int, optional): Number of db files the rows of every type are spread across.
+            Rows are routed by a hash of their uid or the member named by `__odb_shard_key__`.
+            Types loaded from an existing schema keep the partition count they were created with.
+            Only available with sharding. Defaults to 1.
+        attach (bool, optional): Whether to attach all db files to one connection per thread so
+            nested objects and cascading deletes are written in one transaction across files.
+            Only available with sharding. Defaults to False.
+        blob_threshold (int | None, optional): Minimum size in bytes of binary members and pickled
+            values which are stored as files under `pyodb_folder` instead of inside the rows.
+            Equal values are stored once. Defaults to None which stores all values inline.
+        serializer (Serializer | None, optional): Serializer of containers and objects past the
+            max depth. Members may override it by a dictionary named `__odb_serializers__`.
+            Defaults to None which pickles with the highest protocol.
     """
     _schema: ShardSchema | UnifiedSchema
 
 
-    def __init__(
+    def __init__( # noqa: PLR0913
             self,
             max_depth: int = 2,
             pyodb_folder: str | Path = ".pyodb",
             persistent: bool = False,
             sharding: bool = False,
-            load_existing: bool = True
+            load_existing: bool = True,
+            partitions: int = 1,
+            attach: bool = False,
+            blob_threshold: int | None = None,
+            serializer: Serializer | None = None
         ) -> None:
+        if (partitions > 1 or attach) and not sharding:
+            raise ValueError("partitions and attach can only be used together with sharding!")
+        if partitions < 1:
+            raise ValueError("partitions must be >= 1!")
         if not isinstance(pyodb_folder, Path):
             pyodb_folder = Path(pyodb_folder)
         pyodb_folder.mkdir(mode=755, exist_ok=True)
 
         self._schema = (
-            ShardSchema(pyodb_folder, max_depth, persistent)
+            ShardSchema(pyodb_folder, max_depth, persistent, partitions, attach)
             if sharding
             else UnifiedSchema(pyodb_folder, max_depth, persistent)
         )
+        self._schema.blob_threshold = blob_threshold
+        if serializer is not None:
+            self._schema.serializer = serializer
         if load_existing:
             self._schema.load_existing()
+        self._write_behind: WriteBehindQueue | None = None
 
 
     @property
@@ -87,6 +127,55 @@ class PyODB:
         self._schema.max_depth = val
 
 
+    @property
+    def blob_threshold(self) -> int | None:
+        """Minimum size in bytes of binary members and pickled values which are stored outside of
+        the rows. Such members are loaded as memory-mapped blobs. Binary members are returned as
+        read-only memoryview. None stores all values inline."""
+        return self._schema.blob_threshold
+
+
+    @blob_threshold.setter
+    def blob_threshold(self, val: int | None):
+        self._schema.blob_threshold = val
+
+
+    @property
+    def serializer(self) -> Serializer:
+        """Serializer of containers and objects past the max depth. Rows written by other
+        serializers stay readable."""
+        return self._schema.serializer
+
+
+    @serializer.setter
+    def serializer(self, val: Serializer):
+        self._schema.serializer = val
+
+
+    @property
+    def track_loaded(self) -> bool:
+        """Whether loaded objects can be updated in place with `update`. Remembering the rows of
+        all loaded objects costs time and memory, so it is disabled by default."""
+        return self._schema.track_loaded
+
+
+    @track_loaded.setter
+    def track_loaded(self, val: bool):
+        self._schema.track_loaded = val
+
+
+    @property
+    def track_saved(self) -> bool:
+        """Whether saved objects can be updated in place with `update`. Remembering the rows of
+        all saved objects costs time and memory, so it is disabled by default."""
+        return self._schema.track_saved
+
+
+    @track_saved.setter
+    def track_saved(self, val: bool):
+        self._schema.track_saved = val
+
+
     @property
     def persistent(self) -> bool:
         """Whether the database is persistent after closing.
@@ -106,12 +195,145 @@ class PyODB:
             obj (object): The object to save.
             expires (float | None, optional): When the object expires and gets removed from the
                 database. Defaults to None.
+
+        Raises:
+            ExpiryError: In case the object already expired.
+        """
+        obj_type = type(obj)
+
+        if not self._schema.is_known_type(obj_type):
+            self._schema.add_type(obj_type)
+        if self._write_behind is not None:
+            self._write_behind.put(obj, expires)
+        else:
+            self._schema.insert(obj, expires)
+
+
+    def update(self, obj: object):
+        """Updates a loaded or saved object in the database. Only changed members are written.
+        Nested objects are updated in place unless they were replaced by another object.
+
+        ```python
+        pyodb.track_loaded = True
+        obj = pyodb.select(MyClass).first()
+        obj.counter += 1
+        pyodb.update(obj)
+        ```
+
+        Args:
+            obj (object): The object to update. Must have been loaded while `track_loaded` was
+                enabled or saved while `track_saved` was enabled by this instance.
+
+        Raises:
+            UnknownTypeError: In case the type of the object is not known.
+            UpdateError: In case the object was neither loaded nor saved by this instance with
+                tracking enabled or it was deleted in the meantime.
+        """
+        self._schema.update(obj)
+
+
+    def upsert(self, obj: object, key: str | None = None, expires: float | None = None):
+        """Updates the object if it is already stored, otherwise it is saved. Objects which were
+        not loaded or saved by this instance with tracking enabled are matched by the member `key`.
+
+        ```python
+        pyodb.upsert(User(name="alice", visits=3), key="name")
+        ```
+
+        Args:
+            obj (object): The object to update or save. Adds the type in case it is not known.
+            key (str | None, optional): Name of a primitive member identifying the stored object.
+                Defaults to None.
+            expires (float | None, optional): When the object expires in case it is saved.
+                Defaults to None.
         """
         obj_type = type(obj)
 
         if not self._schema.is_known_type(obj_type):
             self._schema.add_type(obj_type)
-        self._schema.insert(obj, expires)
+        self._schema.upsert(obj, key, expires)
+
+
+    def enable_write_behind(
+            self,
+            batch_size: int = 500,
+            interval: float = 0.05,
+            max_size: int = 10000,
+            on_error: ErrorCallback | None = None
+        ):
+        """Enables the write-behind mode. `save` then only queues the object and a background
+        thread writes the queued objects in batches, grouped by type, with one transaction per
+        batch. Queued objects are not visible to queries until they are written. Use `flush` to
+        wait for them.
+
+        Args:
+            batch_size (int, optional): Number of objects written at once. Defaults to 500.
+            interval (float, optional): Maximum number of seconds an object waits before it is
+                written. Defaults to 0.05.
+            max_size (int, optional): Maximum number of queued objects. `save` blocks while the
+                queue is full. Defaults to 10000.
+            on_error (ErrorCallback | None, optional): Called with the error and the affected
+                object for every object which could not be written. Objects of a failed batch
+                are retried one by one. Defaults to None which emits a `PyODBWarning`.
+        """
+        self.disable_write_behind()
+        self._write_behind = WriteBehindQueue(
+            self._schema, batch_size, interval, max_size, on_error
+        )
+
+
+    def disable_write_behind(self):
+        """Writes all queued objects and disables the write-behind mode."""
+        if self._write_behind is not None:
+            self._write_behind.close()
+            self._write_behind = None
+
+
+    def flush(self):
+        """Blocks until all objects queued in write-behind mode are written."""
+        if self._write_behind is not None:
+            self._write_behind.flush()
+
+
+    def transaction(self) -> AbstractContextManager[None]:
+        """Returns a context manager which bundles all writes of the current thread into one
+        transaction. Nothing is written in case of an error.
+
+        ```python
+        with pyodb.transaction():
+            pyodb.save(obj1)
+            pyodb.save(obj2)
+        ```
+
+        Returns:
+            AbstractContextManager[None]: The transaction context manager.
+        """
+        return self._schema.transaction()
+
+
+    def bulk_load(self, cache_size: int = -262144) -> AbstractContextManager[None]:
+        """Returns a context manager for large imports. Secondary indexes are dropped, durability
+        is turned off and a large page cache is used. Everything saved by the current thread
+        within the context is written in one transaction. On exit the indexes are rebuilt, the
+        normal pragmas are restored and ANALYZE updates the query planner statistics.
+
+        Only database files of types known when entering the context are tuned, so add the types
+        beforehand. Data may be lost if the process crashes during the import.
+
+        ```python
+        pyodb.add_type(MyClass)
+        with pyodb.bulk_load():
+            pyodb.save_iter(read_feed())
+        ```
+
+        Args:
+            cache_size (int, optional): Value of SQLite's cache_size pragma during the import.
+                Negative values are KiB. Defaults to -262144 (256 MiB).
+
+        Returns:
+            AbstractContextManager[None]: The bulk load context manager.
+        """
+        return self._schema.bulk_load(cache_size)
 
 
     @property
@@ -120,16 +342,76 @@ class PyODB:
 
 
     def save_multiple(self, objs: list[Any], expires: float | None = None):
-        """Saves multiple objects to the database. Does not add the type beforehand unlike `save`!
+        """Saves multiple objects to the database. The objects may be of different types. Unknown
+        types are added. The objects are grouped by type and every group is inserted in batches.
+        All objects are written in one transaction.
 
         Args:
             obj (list[object]): The objects to save.
             expires (float | None, optional): When the object expires and gets removed from the
                 database. Defaults to None.
         """
-        if not objs:
-            return
-        self._schema.insert_many(objs, expires)
+        groups: dict[type, list[Any]] = {}
+        for obj in objs:
+            groups.setdefault(type(obj), []).append(obj)
+
+        for obj_type in groups:
+            if not self._schema.is_known_type(obj_type):
+                self._schema.add_type(obj_type)
+
+        with self._schema.transaction():
+            for group in groups.values():
+                self._schema.insert_many(group, expires)
+
+
+    def save_iter(
+            self,
+            objs: Iterable[Any],
+            expires: float | None = None,
+            chunk_size: int | None = None
+        ) -> int:
+        """Saves all objects of an iterable (like a generator) in chunks using `save_multiple`.
+        Only one chunk is held in memory at once. Every chunk is written in it's own transaction.
+
+        Args:
+            objs (Iterable[Any]): The objects to save. May be of different types.
+            expires (float | None, optional): When the objects expire and get removed from the
+                database. Defaults to None.
+            chunk_size (int | None, optional): Number of objects per chunk. Defaults to None which
+                estimates the chunk size from the row width of the saved types.
+
+        Returns:
+            int: The number of saved objects.
+
+        Raises:
+            ValueError: In case chunk_size is < 1.
+        """
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1!")
+
+        sizes: dict[type, int] = {}
+        chunk: list[Any] = []
+        limit = 0
+        saved = 0
+        for obj in objs:
+            obj_type = type(obj)
+            if obj_type not in sizes:
+                if not self._schema.is_known_type(obj_type):
+                    self._schema.add_type(obj_type)
+                sizes[obj_type] = chunk_size or self._schema._tables[obj_type].chunk_size
+
+            # The widest type within the chunk determines it's size
+            limit = min(limit, sizes[obj_type]) if chunk else sizes[obj_type]
+            chunk += [obj]
+            if len(chunk) >= limit:
+                self.save_multiple(chunk, expires)
+                saved += len(chunk)
+                chunk = []
+
+        if chunk:
+            self.save_multiple(chunk, expires)
+            saved += len(chunk)
+        return saved
 
 
     def remove_type(self, type_: type):
@@ -147,7 +429,7 @@ class PyODB:
     def add_type(self, type_: type):
         """Adds a new type to the database schema.
         Does not accept python primitives like int, float, list or dict.
-        This might be necessary in some special cases or before using the `insert_multiple` method.
+        Types are added automatically when saving, so this is only necessary in special cases.
 
         Args:
             type_ (type): The type to add.
@@ -192,6 +474,16 @@ class PyODB:
         self._schema.clear()
 
 
+    def collect_blobs(self) -> int:
+        """Removes all externally stored values which are not referenced anymore. Blobs are
+        shared by equal values and therefore not removed when objects are deleted.
+
+        Returns:
+            int: The number of removed blobs.
+        """
+        return self._schema.collect_blobs()
+
+
     def contains_type(self, type_: type) -> bool:
         """Check whether the given type is known by the schema.
 
@@ -206,6 +498,84 @@ class PyODB:
         return self._schema.is_known_type(type_)
 
 
+    def __del__(self):
+        if getattr(self, "_write_behind", None) is not None:
+            self.disable_write_behind()
+
+
+# Hash of calls without any arguments
+NO_ARGS = hash_args((), {})
+# Seconds between the first and the last check for data refreshed by another instance
+LEASE_POLL_INTERVAL = (0.01, 0.5)
+# Number of threads refreshing stale cache entries in the background
+REFRESH_WORKERS = 4
+# Table holding the version counters of all caches of a database file
+VERSION_TABLE = "pyodb.cache_versions"
+# "rows" stores every element of the cached data as an object, "blob" the serialized data at once
+CACHE_STORAGES = ("rows", "blob")
+
+T = TypeVar("T")
+
+
+def _same_function(old: Callable, new: Callable) -> bool:
+    """Whether a function re-decorated by `PyODBCache.cached` replaces the old one. Local
+    functions share their qualified name with all other functions created by the same call site,
+    so they are only equal to themselves."""
+    if old is new:
+        return True
+    qualname = getattr(new, "__qualname__", "<")
+    return (
+        "<" not in qualname
+        and getattr(old, "__module__", None) == new.__module__
+        and getattr(old, "__qualname__", None) == qualname
+    )
+
+
+class _CacheDefinition:
+    """Persisted definition of a cache, which lets `PyODBCache.warm` restore the cache."""
+    cache_key: str
+    data_func: str
+    data_type: str
+    lifetime: float
+    lease_timeout: float
+    stale_ttl: float
+    serializer: bytes | None
+
+
+    def __init__( # noqa: PLR0913
+            self,
+            cache_key: str,
+            data_func: str,
+            data_type: str,
+            lifetime: float,
+            lease_timeout: float,
+            stale_ttl: float,
+            serializer: bytes | None
+        ) -> None:
+        self.cache_key = cache_key
+        self.data_func = data_func
+        self.data_type = data_type
+        self.lifetime = lifetime
+        self.lease_timeout = lease_timeout
+        self.stale_ttl = stale_ttl
+        self.serializer = serializer
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of one cache.
+
+    Attributes:
+        hits (int): Calls served by cached data.
+        misses (int): Calls which called the data function.
+        lifetime (float): Lifetime of the cached data in seconds.
+        size (int): Number of entries of the cache held in memory.
+    """
+    hits: int
+    misses: int
+    lifetime: float
+    size: int
+
+
 class PyODBCache:
     """Class that caches arbitrary data and returns cached data if available.
     Also updates the data if it is expired. Expiry times are set when adding a new cache.
@@ -218,34 +588,106 @@ class PyODBCache:
             Defaults to False.
         sharding (bool, optional): Whether to use sharding.
             Defaults to False.
+        max_entries (int | None, optional): Maximum number of entries held in memory across all
+            caches. Defaults to None which is unbounded.
+        max_bytes (int | None, optional): Maximum approximate size in bytes of all entries held
+            in memory. Defaults to None which is unbounded.
+        eviction (str, optional): Entries exceeding a bound are evicted from memory by least
+            recent ("lru") or least frequent ("lfu") use. Evicted entries are reloaded from the
+            database. Defaults to "lru".
+        shared_memory (bool, optional): Whether to mirror the serialized entries in shared memory,
+            so processes on the same host using the same folder read them without querying the
+            database. Only entries saved by instances with shared memory are mirrored.
+            Defaults to False.
+
+    Raises:
+        ValueError: In case the eviction policy is unknown or a bound is less than 1.
     """
     class _CacheItem:
-        """Cache-Definition containing the data function, the data type and the lifetime."""
-        def __init__(
+        """Cache-Definition containing the data function, the data type and the lifetime.
+        Data is kept in the in-memory tier per hash of the data function's arguments. Each entry
+        expires on it's own."""
+        def __init__( # noqa: PLR0913
                 self,
+                cache_key: str,
                 data_func: Callable,
                 data_type: type,
                 lifetime: float,
-                dataclass: type
+                dataclass: type,
+                lease: LeaseTable,
+                lease_timeout: float,
+                stale_ttl: float,
+                memory: MemoryTier,
+                versions: VersionTable,
+                serializer: Serializer | None
             ) -> None:
+            self.cache_key = cache_key
             self.data_func = data_func
             self.data_type = data_type
             self.lifetime = lifetime
             self.dataclass = dataclass
-            self.data: list = []
-            self.expires: float = 0
+            self.lease = lease
+            self.lease_timeout = lease_timeout
+            self.stale_ttl = stale_ttl
+            self.memory = memory
+            self.versions = versions
+            self.version = versions.get()
+            self.serializer = serializer
+            self.stats = CacheStats()
+
+
+        @property
+        def storage(self) -> str:
+            """How the data is stored in the database. See `CACHE_STORAGES`."""
+            return "rows" if self.serializer is None else "blob"
+
+
+        @property
+        def data(self) -> list:
+            """Data of the entry without arguments"""
+            return self.get_stale_data() or []
+
+
+        @property
+        def expires(self) -> float:
+            """Expiry time of the entry without arguments"""
+            entry = self.get_entry()
+            return entry[1] if entry is not None else 0
+
+
+        @expires.setter
+        def expires(self, val: float):
+            self.memory.set_expiry((self.cache_key, NO_ARGS), val)
+
+
+        def get_data(self, args_hash: str = NO_ARGS) -> list | None:
+            entry = self.memory.get((self.cache_key, args_hash))
+            return entry[0] if entry is not None else None
+
 
+        def get_stale_data(self, args_hash: str = NO_ARGS) -> list | None:
+            """Returns the data of the entry even if it is expired."""
+            entry = self.get_entry(args_hash)
+            return entry[0] if entry is not None else None
 
-        def get_data(self) -> list | None:
-            if self.expires < time():
-                self.data = []
-                return None
-            return self.data
 
+        def get_entry(self, args_hash: str = NO_ARGS) -> tuple[list, float] | None:
+            """Returns the data and the expiry time of the entry even if it is expired."""
+            return self.memory.get((self.cache_key, args_hash), stale=True)
 
-        def set_data(self, data: list, expires: float):
-            self.data = data
-            self.expires = expires
+
+        def set_data(self, data: list, expires: float, args_hash: str = NO_ARGS):
+            # Expired entries are kept for at least one more lifetime to be served while being
+            # refreshed
+            keep_until = expires + max(self.lifetime, self.stale_ttl)
+            self.memory.put((self.cache_key, args_hash), data, expires, keep_until)
+
+
+        def clear(self):
+            """Removes all entries of the cache from the in-memory tier."""
+            for key in self.memory.keys():
+                if key[0] == self.cache_key:
+                    self.memory.pop(key)
 
 
     _caches: dict[str, _CacheItem]
@@ -264,12 +706,22 @@ class PyODBCache:
         return self._caches.copy()
 
 
-    def __init__(
+    @property
+    def memory(self) -> MemoryTier:
+        """The in-memory tier shared by all caches"""
+        return self._memory
+
+
+    def __init__( # noqa: PLR0913
             self,
             max_depth: int = 0,
             pyodb_folder: str | Path = ".pyodb",
             persistent: bool = False,
             sharding: bool = False,
+            max_entries: int | None = None,
+            max_bytes: int | None = None,
+            eviction: str = "lru",
+            shared_memory: bool = False
         ) -> None:
         self._pyodb = PyODB(
             max_depth=max_depth,
@@ -280,6 +732,11 @@ class PyODBCache:
         )
         self._pyodb._schema.save_table_defs = False
         self._caches = {}
+        self._memory = MemoryTier(max_entries, max_bytes, eviction)
+        self._shared = SharedTier(str(Path(pyodb_folder).resolve())) if shared_memory else None
+        self._refresh_executor: ThreadPoolExecutor | None = None
+        self._refreshing: set[tuple[str, str]] = set()
+        self._refreshing_lock = Lock()
 
 
     def cache_exists(self, cache_key: str) -> bool:
@@ -295,22 +752,49 @@ class PyODBCache:
 
 
     @staticmethod
-    def _dataclass_constructor(self_, data: Any, expires: float):
+    def _dataclass_constructor(self_, data: Any, expires: float, args_hash: str = NO_ARGS):
         self_.data = data
         self_.expires = expires
+        self_.args_hash = args_hash
 
 
-    def add_cache(
+    @staticmethod
+    def _blob_dataclass_constructor(
+            self_, payload: bytes, expires: float, args_hash: str = NO_ARGS
+        ):
+        self_.payload = payload
+        self_.expires = expires
+        self_.args_hash = args_hash
+
+
+    def add_cache( # noqa: PLR0913
             self,
             cache_key: str,
             data_func: Callable,
             data_type: type,
             lifetime: float = 60,
-            force: bool = False
+            force: bool = False,
+            lease_timeout: float = 30,
+            stale_ttl: float = 0,
+            storage: str = "rows",
+            serializer: Serializer | None = None
         ):
         """Add a new cache identified by the passed cache_key. Data returned by the data_func must
         be contained in a list. (Even if it is one element only)
 
+        Expired data is refreshed by one single call of the data_func across all cache instances
+        sharing the database. The refreshing instance holds a lease on the entry while the other
+        instances serve their expired data or wait for the refreshed data.
+
+        With a `stale_ttl`, expired data is returned for up to `stale_ttl` seconds past its expiry
+        while it is refreshed on a background thread, so callers never wait for the data_func
+        unless the data expired longer ago.
+
+        By default every element of the data is stored as an object in the database. With the
+        "blob" storage, the data of an entry is serialized into one single row instead, which makes
+        saving and loading entries a lot faster. The data then does not need to be a list of the
+        data_type, but it must be serializable.
+
         Args:
             cache_key (str): Unique Key of the cache.
             data_func (Callable): A function returning a list of the specified data_type.
@@ -318,34 +802,241 @@ class PyODBCache:
             lifetime (float, optional): Cached data expires in `lifetime` seconds. Defaults to 60.
             force (bool, optional): Forces the cache to be overridden in case it already exists.
                 Defaults to False.
+            lease_timeout (float, optional): Seconds the refresh of an entry may take until other
+                instances take it over. Defaults to 30.
+            stale_ttl (float, optional): Seconds expired data is served while being refreshed in
+                the background. Defaults to 0 which refreshes expired data synchronously.
+            storage (str, optional): "rows" or "blob". Defaults to "rows".
+            serializer (Serializer | None, optional): Serializer (and compression) of the "blob"
+                storage. Defaults to None which pickles the data uncompressed.
 
         Raises:
             CacheError: Is thrown in case the cache already exists and `force` is False.
+            ValueError: In case the storage is unknown.
         """
+        if storage not in CACHE_STORAGES:
+            raise ValueError(f"Unknown storage '{storage}'! Use one of {list(CACHE_STORAGES)}")
+        if storage == "blob":
+            serializer = serializer or Serializer()
+        else:
+            serializer = None
+
         if self.cache_exists(cache_key):
             if not force:
                 raise CacheError(
                     f"Cache '{cache_key}' already exists! Use 'force=True' to suppress this error."
                 )
-            elif data_type != self._caches[cache_key].data_type:
+            elif (
+                    data_type != self._caches[cache_key].data_type
+                    or storage != self._caches[cache_key].storage
+                ):
+                    self._caches[cache_key].clear()
                     self.pyodb.remove_type(self.caches[cache_key].dataclass)
             else:
                 self._caches[cache_key].data_func = data_func
                 self._caches[cache_key].lifetime = lifetime
+                self._caches[cache_key].lease_timeout = lease_timeout
+                self._caches[cache_key].stale_ttl = stale_ttl
+                self._caches[cache_key].serializer = serializer
+                self._save_definition(self._caches[cache_key])
                 return
 
+        if serializer is None:
+            init, annotations = self._dataclass_constructor, {"data": data_type | None}
+        else:
+            init, annotations = self._blob_dataclass_constructor, {"payload": bytes}
         dataclass = type(f"PyODBCache_{cache_key}", (), {
-                "__init__": self._dataclass_constructor,
-                "__annotations__": {"data": data_type | None, "expires": float}
+                "__init__": init,
+                "__annotations__": annotations | {"expires": float, "args_hash": str}
             }
         )
         globals().update({dataclass.__name__: dataclass})
         self.pyodb.add_type(dataclass)
-        self._caches[cache_key] = self._CacheItem(data_func, data_type, lifetime, dataclass)
+        self._migrate(dataclass)
+        table = self.pyodb._schema._tables[dataclass]
+        lease = LeaseTable(f"{table.fqcn}.leases", lambda: table.dbconn)
+        lease.create()
+        versions = VersionTable(VERSION_TABLE, cache_key, lambda: table.dbconn)
+        versions.create()
+        self._caches[cache_key] = self._CacheItem(
+            cache_key,
+            data_func,
+            data_type,
+            lifetime,
+            dataclass,
+            lease,
+            lease_timeout,
+            stale_ttl,
+            self._memory,
+            versions,
+            serializer
+        )
+        self._save_definition(self._caches[cache_key])
+
+
+    def cached(
+            self,
+            lifetime: float = 60,
+            cache_key: str | None = None,
+            stale_ttl: float = 0,
+            lease_timeout: float = 30,
+            serializer: Serializer | None = None
+        ) -> Callable[[Callable[..., T]], Callable[..., T]]:
+        """Decorator memoising a function in a new cache. Return values are cached per arguments
+        using the "blob" storage, so they may be of any serializable type.
+
+        The decorated function provides `cache_info()` returning the `CacheInfo` of it's cache,
+        `cache_clear()` clearing it's cache and the `cache_key`.
+
+        ```python
+        @cache.cached(lifetime=30)
+        def fetch_prices(symbol: str) -> dict[str, float]:
+            ...
+
+        prices = fetch_prices("ABC")
+        fetch_prices.cache_info()
+        ```
+
+        Args:
+            lifetime (float, optional): Return values expire in `lifetime` seconds.
+                Defaults to 60.
+            cache_key (str | None, optional): Key of the cache. Defaults to None which derives the
+                key from the module and the qualified name of the function.
+            stale_ttl (float, optional): See `add_cache`. Defaults to 0.
+            lease_timeout (float, optional): See `add_cache`. Defaults to 30.
+            serializer (Serializer | None, optional): See `add_cache`. Defaults to None.
 
+        Returns:
+            Callable[[Callable[..., T]], Callable[..., T]]: The decorator.
 
-    def get_data(self, cache_key: str, *args, **kwargs) -> list[Any]:
-        """Gets the data from the specified cache.
+        Raises:
+            CacheError: In case the cache key is used by another function.
+        """
+        def decorator(func: Callable[..., T]) -> Callable[..., T]:
+            key = cache_key or re.sub(r"\W", "_", f"{func.__module__}.{func.__qualname__}")
+            if key in self._caches and not _same_function(self._caches[key].data_func, func):
+                raise CacheError(
+                    f"Cache '{key}' already exists for another function! Pass a unique "
+                    "'cache_key', e.g. for functions defined within other functions."
+                )
+            self.add_cache(
+                key,
+                func,
+                object,
+                lifetime,
+                force=True,
+                lease_timeout=lease_timeout,
+                stale_ttl=stale_ttl,
+                storage="blob",
+                serializer=serializer
+            )
+
+            @wraps(func)
+            def wrapper(*args, **kwargs) -> T:
+                return self.get_data(key, *args, **kwargs)
+
+            wrapper.cache_key = key # type: ignore
+            wrapper.cache_info = lambda: self.cache_info(key) # type: ignore
+            wrapper.cache_clear = lambda: self.clear(key) # type: ignore
+            return wrapper
+        return decorator
+
+
+    def warm(self, cache_keys: Iterable[str] | None = None) -> int:
+        """Loads all cached data of the database, which may still be served, into memory. Meant to
+        be called on startup of persistent caches, so restarted processes do not call all data
+        functions again.
+
+        Caches which were added by an earlier instance but not by this one are restored, as long
+        as their data function and data type can be imported by their qualified names.
+
+        Args:
+            cache_keys (Iterable[str] | None, optional): Keys of the caches to load. Defaults to
+                None which loads all caches.
+
+        Raises:
+            CacheError: Cache with passed key does not exist.
+
+        Returns:
+            int: Number of loaded entries.
+        """
+        self._restore_definitions()
+        count = 0
+        for cache_key in self._caches if cache_keys is None else cache_keys:
+            if not self.cache_exists(cache_key):
+                raise CacheError(f"Cache with id '{cache_key}' does not exist!")
+            cache = self._caches[cache_key]
+
+            version = cache.versions.get()
+            rows: dict[str, list] = {}
+            for row in self.pyodb.select(cache.dataclass).all():
+                rows.setdefault(row.args_hash, []).append(row)
+            cache.version = max(cache.version, version)
+            for args_hash, entry_rows in rows.items():
+                cache.set_data(self._row_data(cache, entry_rows), entry_rows[0].expires, args_hash)
+            count += len(rows)
+        return count
+
+
+    def _save_definition(self, cache: _CacheItem):
+        """Persists the definition of the cache so it can be restored by `warm`. Definitions of
+        non-persistent caches are not needed after closing. Lambdas and local functions cannot be
+        imported by their qualified name, so their caches are not restored. An earlier definition
+        of such a cache is removed."""
+        if not self.pyodb.persistent:
+            return
+        func = cache.data_func
+        if "<" in func.__qualname__:
+            if self.pyodb.contains_type(_CacheDefinition):
+                self.pyodb.delete(_CacheDefinition).eq(cache_key=cache.cache_key).commit()
+            return
+        self.pyodb.upsert(_CacheDefinition(
+            cache.cache_key,
+            f"{func.__module__}.{func.__qualname__}",
+            f"{cache.data_type.__module__}.{cache.data_type.__qualname__}",
+            cache.lifetime,
+            cache.lease_timeout,
+            cache.stale_ttl,
+            pickle.dumps(cache.serializer) if cache.serializer is not None else None
+        ), key="cache_key")
+
+
+    def _restore_definitions(self):
+        """Adds the caches of persisted definitions which are unknown to this instance."""
+        if not self.pyodb.contains_type(_CacheDefinition):
+            self.pyodb.add_type(_CacheDefinition)
+        for definition in self.pyodb.select(_CacheDefinition).all():
+            data_func = locate_type(definition.data_func)
+            data_type = locate_type(definition.data_type)
+            if self.cache_exists(definition.cache_key) or data_func is None or data_type is None:
+                continue
+            serializer = pickle.loads(definition.serializer) if definition.serializer else None
+            self.add_cache(
+                definition.cache_key,
+                getattr(data_func, "__wrapped__", data_func),
+                data_type,
+                definition.lifetime,
+                lease_timeout=definition.lease_timeout,
+                stale_ttl=definition.stale_ttl,
+                storage="rows" if serializer is None else "blob",
+                serializer=serializer
+            )
+
+
+    def _migrate(self, dataclass: type):
+        """Recreates cache tables of persistent databases written with another storage or before
+        entries were keyed by the data function's arguments. The cached rows are dropped."""
+        table = self.pyodb._schema._tables[dataclass]
+        columns = table.dbconn.execute(f"PRAGMA table_info(\"{table.fqcn}\")").fetchall()
+        if not set(table.members) <= {column[1] for column in columns}:
+            self.pyodb.remove_type(dataclass)
+            self.pyodb.add_type(dataclass)
+
+
+    def get_data(self, cache_key: str, *args, **kwargs) -> Any:
+        """Gets the data from the specified cache. Data is cached per arguments, so calls with
+        different arguments never share their data. Arguments are identified by a hash of their
+        representation, which therefore must be deterministic.
 
         Accessing data via dictionary style `cache["key"]` is also possible, as long as no arguments
         are needed for the cache's data function.
@@ -360,35 +1051,309 @@ class PyODBCache:
             Exception: Exception thrown in data function or when trying to save the result.
 
         Returns:
-            list[Any]: list of cached objects.
+            Any: list of cached objects. Any serializable value with the "blob" storage.
+        """
+        if not self.cache_exists(cache_key):
+            raise CacheError(f"Cache with id '{cache_key}' does not exist!")
+        cache = self._caches[cache_key]
+
+        start = perf_counter()
+        args_hash = hash_args(args, kwargs)
+        self._sync_version(cache)
+        data, source = self._get(cache, args_hash, args, kwargs)
+        cache.stats.record(source, perf_counter() - start)
+        return data
+
+
+    def _get(self, cache: _CacheItem, args_hash: str, args: tuple, kwargs: dict) -> tuple[Any, str]:
+        """Returns the data of the entry and the source which served it. Tries the in-memory
+        cache first, then shared memory, then the database and calls the data function last."""
+        source = MEMORY
+        entry = cache.get_entry(args_hash)
+        if entry is None or entry[1] + cache.stale_ttl < time():
+            for load, load_source in ((self._load_shared, SHARED), (self._load, DATABASE)):
+                loaded = load(cache, args_hash)
+                if loaded is not None:
+                    entry, source = loaded, load_source
+                    break
+
+        if entry is not None:
+            data, expires = entry
+            if expires + cache.stale_ttl >= time():
+                if expires < time():
+                    self._refresh_in_background(cache, args_hash, args, kwargs)
+                return data, source
+
+        return self._refresh(cache, args_hash, args, kwargs)
+
+
+    def cache_info(self, cache_key: str) -> CacheInfo:
+        """Returns the statistics of a cache.
+
+        Args:
+            cache_key (str): Key of the cache.
+
+        Raises:
+            CacheError: Cache with passed key does not exist.
+
+        Returns:
+            CacheInfo: The statistics.
         """
         if not self.cache_exists(cache_key):
             raise CacheError(f"Cache with id '{cache_key}' does not exist!")
         cache = self._caches[cache_key]
+        size = sum(1 for key in self._memory.keys() if key[0] == cache_key)
+        hits = sum(cache.stats.count(source) for source in (MEMORY, SHARED, DATABASE))
+        return CacheInfo(hits, cache.stats.count(MISS), cache.lifetime, size)
+
+
+    def stats(self, cache_key: str | None = None, reset: bool = False) -> dict[str, dict[str, Any]]:
+        """Returns the statistics of the caches by cache key:
 
-        # Try to get data from in-memory cache
-        data = cache.get_data()
-        if data is not None:
-            return data
+        - `memory_hits`, `shared_hits`, `db_hits`, `misses` and `refreshes`: Number of calls
+            served from memory, from shared memory, from the database or by calling the data
+            function and number of background refreshes.
+        - `latency`: The number of calls, their total duration in seconds and a histogram of their
+            durations per source ("memory", "shared", "database", "miss" and "refresh").
+            Histograms map the upper bound of every bucket in seconds to the number of calls.
+        - `entries` and `size`: Number and approximate size in bytes of the entries held in
+            memory.
+
+        Args:
+            cache_key (str | None, optional): Key of the cache. Defaults to None which returns the
+                statistics of all caches.
+            reset (bool, optional): Whether to reset the counts and histograms after reading
+                them. Defaults to False.
+
+        Raises:
+            CacheError: Cache with passed key does not exist.
+
+        Returns:
+            dict[str, dict[str, Any]]: The statistics by cache key.
+        """
+        if cache_key is not None and not self.cache_exists(cache_key):
+            raise CacheError(f"Cache with id '{cache_key}' does not exist!")
+
+        sizes = self._memory.sizes()
+        stats = {}
+        for key in [cache_key] if cache_key else list(self._caches):
+            cache = self._caches[key]
+            entry_sizes = [size for (entry_key, _), size in sizes.items() if entry_key == key]
+            stats[key] = cache.stats.to_dict() | {
+                "entries": len(entry_sizes),
+                "size": sum(entry_sizes),
+            }
+            if reset:
+                cache.stats.reset()
+        return stats
+
+
+    def clear(self, cache_key: str | None = None):
+        """Removes all data of a cache from memory and from the database. Other instances sharing
+        the database drop their in-memory data of the cache as well.
+
+        Args:
+            cache_key (str | None, optional): Key of the cache to clear. Defaults to None which
+                clears all caches.
+
+        Raises:
+            CacheError: Cache with passed key does not exist.
+        """
+        if cache_key is not None and not self.cache_exists(cache_key):
+            raise CacheError(f"Cache with id '{cache_key}' does not exist!")
+
+        for cache in [self._caches[cache_key]] if cache_key else self._caches.values():
+            with self.pyodb.transaction():
+                self.pyodb.delete(cache.dataclass).commit()
+                cache.version = cache.versions.bump()
+            cache.clear()
+            if self._shared is not None:
+                self._shared.invalidate(cache.cache_key)
+
+
+    def _sync_version(self, cache: _CacheItem):
+        """Drops the in-memory data of the cache in case another instance changed the cache in
+        the database. Only reads the version counter if the database file changed at all."""
+        if not cache.versions.changed():
+            return
+        version = cache.versions.get()
+        if version != cache.version:
+            cache.version = version
+            cache.clear()
+
+
+    def _load(self, cache: _CacheItem, args_hash: str) -> tuple[list, float] | None:
+        """Loads data of the entry from the database into the in-memory cache. Rows are kept in
+        the database until their data is too stale to be served.
+
+        Returns:
+            tuple[list, float] | None: The data and it's expiry time. The data may be expired.
+        """
+        # The version is read first, so the loaded data is at least as new as the version
+        version = cache.versions.get()
+        db_res = self.pyodb.select(cache.dataclass).eq(args_hash=args_hash).all()
+        if not db_res:
+            return None
+        cache.version = max(cache.version, version)
+        data = self._row_data(cache, db_res)
+        cache.set_data(data, db_res[0].expires, args_hash)
+        return data, db_res[0].expires
+
+
+    def _load_shared(self, cache: _CacheItem, args_hash: str) -> tuple[Any, float] | None:
+        """Loads data of the entry from shared memory into the in-memory cache unless it is too
+        stale to be served."""
+        shared = self._shared.get(cache.cache_key, args_hash) if self._shared is not None else None
+        if shared is None or shared[1] + cache.stale_ttl < time():
+            return None
+        data, expires = Serializer.loads(shared[0]), shared[1]
+        cache.set_data(data, expires, args_hash)
+        return data, expires
 
-        # Try to get data from database
-        db_res = self.pyodb.select(cache.dataclass).all()
-        data = [dp.data for dp in db_res]
-        if data:
-            cache.set_data(data, db_res[0].expires)
-            return data
+
+    @staticmethod
+    def _row_data(cache: _CacheItem, rows: list) -> Any:
+        """Returns the cached data of the rows of one entry."""
+        if cache.serializer is None:
+            return [row.data for row in rows]
+        return cache.serializer.loads(rows[0].payload)
+
+
+    def _load_fresh(self, cache: _CacheItem, args_hash: str) -> tuple[Any, float] | None:
+        """Loads data of the entry from the database if it is not expired."""
+        entry = self._load(cache, args_hash)
+        return entry if entry is not None and entry[1] >= time() else None
+
+
+    def _refresh(
+            self,
+            cache: _CacheItem,
+            args_hash: str,
+            args: tuple,
+            kwargs: dict
+        ) -> tuple[Any, str]:
+        """Calls the data function while holding the entry's lease so the data is refreshed once
+        across all instances sharing the database. Returns the data and the source which served
+        it."""
+        owner = generate_uid()
+        if not cache.lease.acquire(args_hash, owner, cache.lease_timeout):
+            awaited = self._await_refresh(cache, args_hash, owner)
+            if awaited is not None:
+                return awaited
 
         try:
+            # The previous lease holder may just have saved new data
+            entry = self._load_fresh(cache, args_hash)
+            if entry is not None:
+                return entry[0], DATABASE
+
             data = cache.data_func(*args, **kwargs)
-            if not data:
-                return []
-            expires = time() + cache.lifetime
-            self.pyodb.save_multiple([cache.dataclass(dp, expires) for dp in data], expires)
-            cache.set_data(data, expires)
-            return data
+            # The rows storage cannot tell empty data from missing data
+            if data or cache.serializer is not None:
+                self._save(cache, args_hash, data)
+            return data if cache.serializer is not None else data or [], MISS
+        finally:
+            cache.lease.release(args_hash, owner)
+
+
+    def _save(self, cache: _CacheItem, args_hash: str, data: Any):
+        """Replaces the rows of the entry, which may still be served as stale data."""
+        expires = time() + cache.lifetime
+        with self.pyodb.transaction():
+            self.pyodb.delete(cache.dataclass).eq(args_hash=args_hash).commit()
+            if cache.serializer is None:
+                objs = [cache.dataclass(dp, expires, args_hash) for dp in data]
+            else:
+                objs = [cache.dataclass(cache.serializer.dumps(data), expires, args_hash)]
+            self.pyodb.save_multiple(objs, expires + cache.stale_ttl)
+            cache.version = cache.versions.bump()
+        cache.set_data(data, expires, args_hash)
+        self._publish(cache, args_hash, objs, data, expires)
+
+
+    def _publish(self, cache: _CacheItem, args_hash: str, objs: list, data: Any, expires: float):
+        """Mirrors saved data in shared memory. Readers fall back to the database in case the data
+        cannot be mirrored."""
+        if self._shared is None:
+            return
+        try:
+            payload = objs[0].payload if cache.serializer is not None else Serializer().dumps(data)
+            self._shared.put(cache.cache_key, args_hash, payload, expires)
+        except Exception as err:
+            warnings.warn(
+                f"Cache '{cache.cache_key}' cannot be shared in memory: {err!r}", PyODBWarning
+            )
+
+
+    def _await_refresh(
+            self,
+            cache: _CacheItem,
+            args_hash: str,
+            owner: str
+        ) -> tuple[Any, str] | None:
+        """Returns the expired in-memory data or polls the database until the lease holder saved
+        the new data. Returns None once the lease was taken over, because the holder failed or
+        timed out."""
+        delay, max_delay = LEASE_POLL_INTERVAL
+        while not cache.lease.acquire(args_hash, owner, cache.lease_timeout):
+            entry = cache.get_entry(args_hash)
+            if entry is not None:
+                return entry[0], MEMORY
+            sleep(delay)
+            delay = min(delay * 2, max_delay)
+            entry = self._load_fresh(cache, args_hash)
+            if entry is not None:
+                return entry[0], DATABASE
+        return None
+
+
+    def _refresh_in_background(
+            self,
+            cache: _CacheItem,
+            args_hash: str,
+            args: tuple,
+            kwargs: dict
+        ):
+        """Refreshes the entry on a worker thread unless it is already being refreshed."""
+        key = (cache.cache_key, args_hash)
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    REFRESH_WORKERS, thread_name_prefix="pyodb-cache-refresh"
+                )
+        self._refresh_executor.submit(self._run_refresh, key, cache, args_hash, args, kwargs)
+
+
+    def _run_refresh(
+            self,
+            key: tuple[str, str],
+            cache: _CacheItem,
+            args_hash: str,
+            args: tuple,
+            kwargs: dict
+        ):
+        start = perf_counter()
+        try:
+            self._refresh(cache, args_hash, args, kwargs)
+            cache.stats.record(REFRESH, perf_counter() - start)
         except Exception as err:
-            raise err
+            # Stale data is served until the next refresh attempt
+            warnings.warn(
+                f"Background refresh of cache '{cache.cache_key}' failed: {err!r}", PyODBWarning
+            )
+        finally:
+            with self._refreshing_lock:
+                self._refreshing.discard(key)
 
 
     def __getitem__(self, key: str) -> list[Any]:
         return self.get_data(key)
+
+
+    def __del__(self):
+        # Like the database, segments of non-persistent caches are removed
+        if getattr(self, "_shared", None) is not None:
+            self._shared.close(unlink=not self._pyodb.persistent)
@@ -1,11 +1,20 @@
-import pickle
+import sqlite3 as sql
+from contextlib import AbstractContextManager, contextmanager
 from pathlib import Path
 from types import UnionType
-
-from pyodb.error import DisassemblyError, ParentError, UnknownTypeError
+from typing import Iterator
+
+from pyodb._util import generate_uid, locate_type
+from pyodb.blob import Blob
+from pyodb.error import DisassemblyError, ParentError, QueryError, UnknownTypeError, UpdateError
+from pyodb.schema.base._blob_store import BLOB_PREFIX, BlobStore
+from pyodb.schema.base._connector import Connector
+from pyodb.schema.base._operators import REF_SEPARATOR
 from pyodb.schema.base._sql_builders import Delete, Insert, MultiInsert, Select
 from pyodb.schema.base._table import Table
 from pyodb.schema.base._type_defs import BASE_TYPES
+from pyodb.packed import is_packed, pack
+from pyodb.serializer import Serializer
 
 
 class BaseSchema:
@@ -24,6 +33,7 @@ class BaseSchema:
     _tables: dict[type, Table]
     _base_path: Path
     _max_depth: int
+    _connector: Connector
     is_persistent: bool
     save_table_defs: bool
 
@@ -32,10 +42,115 @@ class BaseSchema:
         self._tables = {}
         self._max_depth = max_depth
         self._base_path = base_path
+        self._connector = Connector()
+        self._blobs = BlobStore(base_path / "blobs")
+        self._serializer = Serializer()
+        self._track_loaded = False
+        self._track_saved = False
         self.is_persistent = persistent
         self.save_table_defs = True
 
 
+    def transaction(self) -> AbstractContextManager[None]:
+        """Returns a context manager which bundles all writes of the current thread into one
+        transaction per connection. Nothing is written in case of an error.
+
+        Returns:
+            AbstractContextManager[None]: The transaction context manager.
+        """
+        return self._connector.transaction()
+
+
+    @contextmanager
+    def bulk_load(self, cache_size: int = -262144) -> Iterator[None]:
+        """Context manager for large imports on the current thread. Secondary indexes are dropped,
+        durability is turned off and a large page cache is used for all known database files.
+        Everything written within the context is committed in one transaction. On exit the
+        indexes are rebuilt, the normal pragmas are restored and ANALYZE updates the statistics.
+
+        Args:
+            cache_size (int, optional): Value of the cache_size pragma during the import. Negative
+                values are KiB. Defaults to -262144 (256 MiB).
+        """
+        # Partitions are never attached, see `Table.dbconns`
+        files = {
+            path: table.partitions == 1
+            for table in self._tables.values()
+            for path in table.db_paths
+        }
+        pragmas = {
+            path: {
+                name: self._connector.pragma(path, name, shared=shared)
+                for name in ("synchronous", "cache_size")
+            }
+            for path, shared in files.items()
+        }
+
+        indexes = {path: self._drop_indexes(path) for path in files}
+        try:
+            for path, shared in files.items():
+                self._connector.pragma(path, "synchronous", "OFF", shared)
+                self._connector.pragma(path, "cache_size", cache_size, shared)
+            with self.transaction():
+                yield
+        finally:
+            for path, shared in files.items():
+                for name, value in pragmas[path].items():
+                    self._connector.pragma(path, name, value, shared)
+            for path, index_sqls in indexes.items():
+                self._run_ddl(path, index_sqls)
+
+        for path in files:
+            self._run_ddl(path, ["ANALYZE;"])
+
+
+    def _drop_indexes(self, path: Path) -> list[str]:
+        """Drops all secondary indexes of the database file.
+
+        Args:
+            path (Path): The path to the database file.
+
+        Returns:
+            list[str]: The SQL statements re-creating the dropped indexes.
+        """
+        conn = self._connector.connect_file(path)
+        # Automatic indexes of primary keys have no sql
+        indexes = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL;"
+        ).fetchall()
+        for index in indexes:
+            conn.execute(f"DROP INDEX IF EXISTS \"{index['name']}\";")
+        conn.commit()
+        conn.close()
+        return [index["sql"] for index in indexes]
+
+
+    def _run_ddl(self, path: Path, stmts: list[str]):
+        """Runs the statements on a dedicated connection to the database file. Statements on
+        attached connections would end up in the wrong database."""
+        if not stmts:
+            return
+        conn = self._connector.connect_file(path)
+        for stmt in stmts:
+            conn.execute(stmt)
+        conn.commit()
+        conn.close()
+
+
+    def _load_table_defs(self) -> list[Table]:
+        """Returns the saved table definitions. The partition count is added to definitions saved
+        by earlier versions, which did not store it yet."""
+        self.add_type(Table)
+        table = self._tables[Table]
+        try:
+            self._run_ddl(
+                table.db_paths[0], [f"ALTER TABLE \"{table.fqcn}\" ADD COLUMN _partitions INTEGER;"]
+            )
+        except sql.OperationalError:
+            pass # The column exists already
+        return self.select(Table).all()
+
+
     def is_known_type(self, obj_type: type) -> bool:
         """Check whether the type is already defined in the schema
 
@@ -160,26 +275,73 @@ class BaseSchema:
         if not self.is_known_type(type(obj)):
             raise UnknownTypeError(f"Tried to insert object of unknown type {type(obj)}")
 
+        if parent is None:
+            # The object and all of it's sub-objects are written in one transaction
+            with self.transaction():
+                self._insert(obj, expires, None, depth)
+            return
+        self._insert(obj, expires, parent, depth)
+
+
+    def _insert(
+            self,
+            obj: object,
+            expires: float | None,
+            parent: Insert | None,
+            depth: int,
+            memo: dict[int, str] | None = None
+        ):
+        """Inserts an object and all of it's sub-objects into the database. Sub-objects which
+        occur multiple times are stored once and referenced otherwise.
+
+        Args:
+            obj (object): The object to be inserted.
+            expires (float | None): The expiration time of the object.
+            parent (Insert | None): The parent object (if the object is nested).
+            depth (int): The depth of the object before pickling is used.
+            memo (dict[int, str] | None, optional): References to the already inserted objects by
+                their id. Defaults to None.
+        """
         table = self._tables[type(obj)]
 
         if parent:
-            inserter = Insert(table.fqcn, parent.uid, parent.table_name, expires)
+            inserter = Insert(table.fqcn, parent.uid, parent.table_name, expires, parent.partition)
         else:
             inserter = Insert(table.fqcn, None, None, expires)
+            inserter.partition = self._partition_of(table, obj, inserter.uid)
+        memo = {} if memo is None else memo
+        memo[id(obj)] = self._ref(table, inserter.uid)
 
         for key, member_type in table.members.items():
             member = getattr(obj, key)
+            if isinstance(member, Blob):
+                partition = inserter.partition % table.partitions
+                inserter.add_val(table.write_blob(member, inserter.uid, key, partition))
+                continue
+            if member is not None and is_packed(member_type):
+                inserter.add_val(pack(member), table.blobs)
+                continue
             if member and member_type not in BASE_TYPES:
+                if id(member) in memo:
+                    inserter.add_val(memo[id(member)])
+                    continue
                 if depth >= self._max_depth:
-                    inserter.add_val(pickle.dumps(member))
+                    inserter.add_val(table.serializer_of(key).dumps(member), table.blobs)
                     continue
-                self.insert(member, expires, inserter, depth+1)
-            inserter.add_val(member if isinstance(member, member_type) else member_type(member))
-        inserter.commit(table.dbconn)
+                self._insert(member, expires, inserter, depth+1, memo)
+            inserter.add_val(
+                member if isinstance(member, member_type) else member_type(member),
+                table.blobs,
+                table.serializer_of(key)
+            )
+        inserter.commit(table.dbconns[inserter.partition % table.partitions])
+        table.tracker.track_save(obj, inserter.vals)
 
 
     def insert_many(self, objs: list, expires: float | None):
         """Inserts a list of objects into the database. Objects must all have the same type.
+        Sub-objects shared by multiple objects are stored only once. Every entry of the list is
+        stored as a row of it's own, even if the same object occurs multiple times.
 
         Args:
             objs (list): The list of objects to be inserted.
@@ -195,45 +357,51 @@ class BaseSchema:
             raise UnknownTypeError(f"Tried to insert object of unknown type {base_type}")
 
         table = self._tables[base_type]
-        multi_inserter = MultiInsert(table.fqcn)
+        multi_inserters = [MultiInsert(table.fqcn) for _ in range(table.partitions)]
 
         if any(type(obj) != base_type for obj in objs):
             raise DisassemblyError("Types in inserted list must all be the same!")
 
-        subtypes: dict[type, list[tuple[object, Insert]]] = {}
+        # All top level objects are known before any sub-object may reference them
+        memo: dict[int, str] = {}
+        inserters: list[Insert] = []
         for obj in objs:
             inserter = Insert(table.fqcn, None, None, expires)
-
-            for member in table.members.keys():
-                member = getattr(obj, member)
-                membertype = type(member)
-                if member and membertype not in BASE_TYPES:
-                    if self._max_depth == 0:
-                        inserter.add_val(pickle.dumps(member))
-                        continue
-
-                    if membertype not in subtypes:
-                        subtypes[membertype] = []
-                    subtypes[membertype] += [(member, inserter)]
-                inserter.add_val(member)
-            multi_inserter += inserter
-
-        for sub in subtypes.values():
-            self._insert_many(sub, expires, 1)
-        multi_inserter.commit(table.dbconn)
-
-
-    def _insert_many(self, objs: list[tuple[object, Insert]], expires: float | None, depth: int):
+            inserter.partition = self._partition_of(table, obj, inserter.uid)
+            memo[id(obj)] = self._ref(table, inserter.uid)
+            inserters += [inserter]
+
+        subtypes: dict[type, list[tuple[object, Insert, str]]] = {}
+        # Blob members are already written while the values are collected
+        with self.transaction():
+            for obj, inserter in zip(objs, inserters):
+                self._add_batch_vals(table, obj, inserter, 0, subtypes, memo)
+                multi_inserters[inserter.partition] += inserter
+                table.tracker.track_save(obj, inserter.vals)
+
+            for sub in subtypes.values():
+                self._insert_many(sub, expires, 1, memo)
+            self._commit_partitioned(table, multi_inserters)
+
+
+    def _insert_many(
+            self,
+            objs: list[tuple[object, Insert, str]],
+            expires: float | None,
+            depth: int,
+            memo: dict[int, str]
+        ):
         """Inserts multiple objects into the database.
 
         If an object has members that are also objects, this method will recursively insert them as
         well, up to the maximum depth allowed by the schema. Then pickling is used.
 
         Args:
-            objs (list[tuple[object, Insert]]): A list of objects and their corresponding parent
-            insert statements.
+            objs (list[tuple[object, Insert, str]]): A list of objects, their corresponding parent
+            insert statements and their uids.
             expires (float | None): The expiration time for the objects.
             depth (int): The current recursion depth of the object hierarchy.
+            memo (dict[int, str]): References to all objects of the batch by their id.
 
         Raises:
             DBConnError: If the current table does not have a valid database connection.
@@ -241,29 +409,307 @@ class BaseSchema:
         base_type = type(objs[0][0])
 
         table = self._tables[base_type]
-        multi_inserter = MultiInsert(table.fqcn)
+        multi_inserters = [MultiInsert(table.fqcn) for _ in range(table.partitions)]
 
-        subtypes: dict[type, list[tuple[object, Insert]]] = {}
-        for obj in objs:
-            inserter = Insert(table.fqcn, obj[1].uid, obj[1].table_name, expires)
-
-            for member in table.members.keys():
-                member = getattr(obj[0], member)
-                membertype = type(member)
-                if member and membertype not in BASE_TYPES:
-                    if depth >= self._max_depth:
-                        inserter.add_val(pickle.dumps(member))
-                        continue
-
-                    if membertype not in subtypes:
-                        subtypes[membertype] = []
-                    subtypes[membertype] += [(member, inserter)]
-                inserter.add_val(member)
-            multi_inserter += inserter
+        subtypes: dict[type, list[tuple[object, Insert, str]]] = {}
+        for obj, parent, uid in objs:
+            inserter = Insert(
+                table.fqcn, parent.uid, parent.table_name, expires,
+                parent.partition % table.partitions, uid
+            )
+            self._add_batch_vals(table, obj, inserter, depth, subtypes, memo)
+            multi_inserters[inserter.partition] += inserter
+            table.tracker.track_save(obj, inserter.vals)
 
         for sub in subtypes.values():
-            self._insert_many(sub, expires, depth+1)
-        multi_inserter.commit(table.dbconn)
+            self._insert_many(sub, expires, depth+1, memo)
+        self._commit_partitioned(table, multi_inserters)
+
+
+    def _add_batch_vals( # noqa: PLR0913
+            self,
+            table: Table,
+            obj: object,
+            inserter: Insert,
+            depth: int,
+            subtypes: dict[type, list[tuple[object, Insert, str]]],
+            memo: dict[int, str]
+        ):
+        """Adds the member values of a batched object to it's insert. Sub-objects are queued in
+        `subtypes` unless they are already part of the batch, then a reference is stored.
+
+        Args:
+            table (Table): The table of the object.
+            obj (object): The object to insert.
+            inserter (Insert): The insert of the object.
+            depth (int): The current recursion depth of the object hierarchy.
+            subtypes (dict[type, list[tuple[object, Insert, str]]]): The queued sub-objects.
+            memo (dict[int, str]): References to all objects of the batch by their id.
+        """
+        for key, member_type in table.members.items():
+            member = getattr(obj, key)
+            membertype = type(member)
+            if isinstance(member, Blob):
+                partition = inserter.partition % table.partitions
+                inserter.add_val(table.write_blob(member, inserter.uid, key, partition))
+                continue
+            if member is not None and is_packed(member_type):
+                inserter.add_val(pack(member), table.blobs)
+                continue
+            if member and membertype not in BASE_TYPES:
+                if id(member) in memo:
+                    inserter.add_val(memo[id(member)])
+                    continue
+                if depth >= self._max_depth:
+                    inserter.add_val(table.serializer_of(key).dumps(member), table.blobs)
+                    continue
+
+                uid = generate_uid()
+                memo[id(member)] = self._ref(self._tables[membertype], uid)
+                subtypes.setdefault(membertype, []).append((member, inserter, uid))
+            inserter.add_val(member, table.blobs, table.serializer_of(key))
+
+
+    @staticmethod
+    def _ref(table: Table, uid: str) -> str:
+        """Returns the column value referencing an already stored object of the table."""
+        return f"{table.fqcn}{REF_SEPARATOR}{uid}"
+
+
+    @staticmethod
+    def _commit_partitioned(table: Table, multi_inserters: list[MultiInsert]):
+        """Commits the batched inserts of every partition of the table. Empty batches are skipped.
+
+        Args:
+            table (Table): The table the rows are inserted into.
+            multi_inserters (list[MultiInsert]): One batch per partition of the table.
+        """
+        for conn, multi_inserter in zip(table.dbconns, multi_inserters):
+            if multi_inserter.vals:
+                multi_inserter.commit(conn)
+
+
+    @staticmethod
+    def _partition_of(table: Table, obj: object, uid: str) -> int:
+        """Returns the partition a top-level object is routed to. The shard key may be declared by
+        setting `__odb_shard_key__` to the name of a member. Otherwise the uid is used.
+        Sub-objects are always stored in the same partition as their parent.
+
+        Args:
+            table (Table): The table of the object.
+            obj (object): The object to route.
+            uid (str): The uid of the object's row.
+
+        Returns:
+            int: Index of the partition.
+        """
+        shard_key = getattr(type(obj), "__odb_shard_key__", None)
+        return table.partition_of(getattr(obj, shard_key) if shard_key else uid)
+
+
+    def update(self, obj: object):
+        """Updates the rows of a loaded or saved object in place. Only changed columns are
+        written. Nested objects are updated recursively. Child rows are only re-written if the
+        nested object was replaced.
+
+        Args:
+            obj (object): The object to update. Must have been loaded or saved by this schema.
+
+        Raises:
+            UnknownTypeError: In case the type is not within the schema.
+            UpdateError: In case the object is not tracked or it's row does not exist anymore.
+        """
+        table = self._get_table(type(obj))
+        vals = self._tracked_vals(table, obj)
+        if vals is None:
+            raise UpdateError(
+                "Only objects loaded or saved by this database can be updated! Enable "
+                "'track_loaded' or 'track_saved' before loading or saving them, or use upsert."
+            )
+        with self.transaction():
+            self._update(table, obj, vals, 0)
+
+
+    def upsert(self, obj: object, key: str | None = None, expires: float | None = None):
+        """Updates the row of the object if it exists, otherwise the object is inserted.
+        Loaded or saved objects are matched by their row. Other objects are matched by the
+        member `key`. All child rows of a matched untracked object are re-written.
+
+        Args:
+            obj (object): The object to update or insert.
+            key (str | None, optional): Name of a primitive member identifying the object.
+                Defaults to None.
+            expires (float | None, optional): Expiration time in case the object is inserted.
+                Defaults to None.
+
+        Raises:
+            UnknownTypeError: In case the type is not within the schema.
+            QueryError: In case `key` is not a member of the object's type.
+        """
+        table = self._get_table(type(obj))
+        vals = self._tracked_vals(table, obj)
+        if vals is None and key is not None:
+            if key not in table.members:
+                raise QueryError(f"'{key}' is not a member of {table.base_type}!")
+            # Only top level rows are matched, sub-objects belong to their parent
+            stmt = f"SELECT * FROM \"{table.fqcn}\" WHERE {key} = ? AND _parent_ IS NULL LIMIT 1;"
+            for conn in table.dbconns:
+                row = conn.execute(stmt, [getattr(obj, key)]).fetchone()
+                if row is not None:
+                    vals = tuple(row)
+                    break
+
+        with self.transaction():
+            if vals is None:
+                self._insert(obj, expires, None, 0)
+            else:
+                self._update(table, obj, vals, 0)
+
+
+    def _update(
+            self,
+            table: Table,
+            obj: object,
+            vals: tuple,
+            depth: int,
+            seen: set[str] | None = None
+        ):
+        """Updates the row of the object and of all it's nested objects. Shared objects which are
+        still referenced keep their reference and are updated as well.
+
+        Args:
+            table (Table): The table of the object.
+            obj (object): The object to update.
+            vals (tuple): The currently stored row values of the object.
+            depth (int): The depth of the object before pickling is used.
+            seen (set[str] | None, optional): Uids of the already updated objects. Defaults to
+                None.
+        """
+        uid, expires = vals[0], vals[3]
+        seen = set() if seen is None else seen
+        seen.add(uid)
+        parent: Insert | None = None
+        # Converts the members to column values the same way inserts do
+        inserter = Insert(table.fqcn, vals[1], vals[2], None, uid=uid)
+        changes: dict[str, object] = {}
+        dropped_refs: list[str] = []
+
+        for (key, member_type), old_val in zip(table.members.items(), vals[4:]):
+            member = getattr(obj, key)
+            is_child = self._add_update_val(table, inserter, key, member, depth)
+            new_val = inserter.vals[-1]
+            is_stored = isinstance(old_val, str) and member_type not in BASE_TYPES
+            had_child = is_stored and REF_SEPARATOR not in old_val
+            had_ref = is_stored and REF_SEPARATOR in old_val
+
+            if is_child and (had_child or had_ref):
+                subtable = self._tables[type(member)]
+                sub_vals = self._tracked_vals(subtable, member)
+                if sub_vals is not None and (
+                    (had_child and new_val == old_val and sub_vals[1] == uid)
+                    or (had_ref and self._ref(subtable, sub_vals[0]) == old_val)
+                ):
+                    # Shared objects keep their reference
+                    inserter._vals[-1] = old_val
+                    if sub_vals[0] not in seen:
+                        self._update(subtable, member, sub_vals, depth+1, seen)
+                    continue
+
+            # The nested object was replaced
+            if had_child:
+                delete = Delete(table.base_type, self._tables)
+                delete._delete_children(locate_type(old_val), uid, False) # type: ignore
+            if had_ref:
+                dropped_refs += [old_val]
+            if is_child:
+                if parent is None:
+                    parent = Insert(
+                        table.fqcn, None, None, expires, self._locate(table, uid), uid=uid
+                    )
+                self._insert(member, expires, parent, depth+1)
+            if new_val != old_val:
+                changes[key] = new_val
+
+        if changes:
+            stmt = f"UPDATE \"{table.fqcn}\" SET "
+            stmt += ",".join(f"{key} = ?" for key in changes)
+            conn = table.dbconns[self._locate(table, uid)]
+            if conn.execute(stmt + " WHERE _uid_ = ?;", [*changes.values(), uid]).rowcount != 1:
+                raise UpdateError(f"Stored row of {obj} does not exist anymore!")
+            conn.commit()
+        # Shared objects which outlived the object they were stored with may be unreferenced now
+        for ref in dropped_refs:
+            Delete(table.base_type, self._tables)._delete_orphan(ref, False)
+        table.tracker.track(obj, [*inserter.vals[:3], expires, *inserter.vals[4:]])
+
+
+    def _add_update_val(
+            self,
+            table: Table,
+            inserter: Insert,
+            key: str,
+            member: object,
+            depth: int
+        ) -> bool:
+        """Adds the column value of a member of an updated object to the insert.
+
+        Returns:
+            bool: Whether the member is stored in a child row.
+        """
+        member_type = table.members[key]
+        is_child = bool(member) and member_type not in BASE_TYPES
+        if isinstance(member, Blob):
+            partition = self._locate(table, inserter.uid)
+            inserter.add_val(table.write_blob(member, inserter.uid, key, partition))
+        elif member is not None and is_packed(member_type):
+            inserter.add_val(pack(member), table.blobs)
+        elif is_child and depth >= self._max_depth:
+            is_child = False
+            inserter.add_val(table.serializer_of(key).dumps(member), table.blobs)
+        else:
+            inserter.add_val(
+                member if isinstance(member, member_type) else member_type(member),
+                table.blobs,
+                table.serializer_of(key)
+            )
+        return is_child
+
+
+    def _tracked_vals(self, table: Table, obj: object) -> tuple | None:
+        """Returns the remembered row values of a loaded or saved object. Values invalidated by
+        set-based updates are read from the database again.
+
+        Returns:
+            tuple | None: The row values or None if the object is not tracked or it's row does not
+                exist anymore.
+        """
+        vals = table.tracker.get(obj)
+        if vals is None or not table.tracker.is_stale(obj):
+            return vals
+        stmt = f"SELECT * FROM \"{table.fqcn}\" WHERE _uid_ = ?;"
+        row = table.dbconns[self._locate(table, vals[0])].execute(stmt, [vals[0]]).fetchone()
+        if row is None:
+            return None
+        table.tracker.track(obj, row)
+        return tuple(row)
+
+
+    @staticmethod
+    def _locate(table: Table, uid: str) -> int:
+        """Returns the partition holding the row with the given uid. Defaults to 0 if not found."""
+        if table.partitions == 1:
+            return 0
+        for i, conn in enumerate(table.dbconns):
+            stmt = f"SELECT 1 FROM \"{table.fqcn}\" WHERE _uid_ = ?;"
+            if conn.execute(stmt, [uid]).fetchone() is not None:
+                return i
+        return 0
+
+
+    def _get_table(self, type_: type) -> Table:
+        if not self.is_known_type(type_):
+            raise UnknownTypeError(f"Unknown type: {type_}")
+        return self._tables[type_]
 
 
     def select(self, type_: type) -> Select:
@@ -308,6 +754,28 @@ class BaseSchema:
             if not table.is_parent:
                 continue
             Delete(table.base_type, self._tables).commit()
+        self._blobs.clear()
+
+
+    def collect_blobs(self) -> int:
+        """Removes all externally stored values which are not referenced by any row anymore.
+        Blobs are shared by equal values, so they are not removed together with their rows.
+
+        Returns:
+            int: The number of removed blobs.
+        """
+        refs: set[str] = set()
+        for table in self._tables.values():
+            for name, type_ in table.members.items():
+                if type_ is str or type_ == str | None:
+                    continue
+                stmt = f"SELECT DISTINCT {name} FROM \"{table.fqcn}\" WHERE {name} LIKE ?;"
+                for conn in table.dbconns:
+                    refs |= {
+                        row[0] for row in conn.execute(stmt, [BLOB_PREFIX + "%"])
+                        if BlobStore.is_ref(row[0])
+                    }
+        return self._blobs.collect(refs)
 
 
     @property
@@ -322,6 +790,58 @@ class BaseSchema:
         self._max_depth = val
 
 
+    @property
+    def blob_threshold(self) -> int | None:
+        """Minimum size in bytes of binary and pickled values which are stored outside of the rows.
+        None stores all values inline."""
+        return self._blobs.threshold
+
+
+    @blob_threshold.setter
+    def blob_threshold(self, val: int | None):
+        self._blobs.threshold = val
+
+
+    @property
+    def serializer(self) -> Serializer:
+        """Serializer of containers and objects past the max depth. Members may override it by
+        `__odb_serializers__`."""
+        return self._serializer
+
+
+    @serializer.setter
+    def serializer(self, val: Serializer):
+        self._serializer = val
+        for table in self._tables.values():
+            table.serializer = val
+
+
+    @property
+    def track_loaded(self) -> bool:
+        """Whether the rows of loaded objects are remembered, so they can be updated in place."""
+        return self._track_loaded
+
+
+    @track_loaded.setter
+    def track_loaded(self, val: bool):
+        self._track_loaded = val
+        for table in self._tables.values():
+            table.tracker.track_loaded = val
+
+
+    @property
+    def track_saved(self) -> bool:
+        """Whether the rows of saved objects are remembered, so they can be updated in place."""
+        return self._track_saved
+
+
+    @track_saved.setter
+    def track_saved(self, val: bool):
+        self._track_saved = val
+        for table in self._tables.values():
+            table.tracker.track_saved = val
+
+
     @property
     def schema_size(self) -> int:
         """Number of table definitions / types in the current schema"""
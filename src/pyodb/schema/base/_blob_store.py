@@ -0,0 +1,154 @@
+"""Content addressed store keeping large binary column values outside of the table rows.
+"""
+import hashlib
+import mmap
+import os
+import shutil
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+
+from pyodb.schema.base._type_defs import REF_SEPARATOR
+
+# Prefix of the column values referencing a stored blob. Contains the reference separator so blob
+# references are never mistaken for nested objects.
+BLOB_PREFIX = f"pyodb.blob{REF_SEPARATOR}"
+
+
+class BlobStore:
+    """Stores binary values (bytes members and pickled values) of at least `threshold` bytes as
+    files named by the sha256 hash of their content. Equal values are stored once. The row only
+    holds a short reference, so rows stay small and queries not touching the value stay cheap.
+
+    Stored values are memory-mapped when loaded. Pages are only read once they are accessed.
+
+    Args:
+        path (Path): The folder holding the blob files.
+        threshold (int | None, optional): Minimum size of externally stored values in bytes.
+            Defaults to None which stores all values inline. Existing blobs are still readable.
+    """
+    def __init__(self, path: Path, threshold: int | None = None) -> None:
+        self.path = path
+        self.threshold = threshold
+        # Digests of the blobs written by this store
+        self._written: set[str] = set()
+
+
+    @property
+    def threshold(self) -> int | None:
+        """Minimum size of externally stored values in bytes. None disables the store."""
+        return self._threshold
+
+
+    @threshold.setter
+    def threshold(self, val: int | None):
+        if val is not None and val < 1:
+            raise ValueError("blob_threshold must be >= 1!")
+        self._threshold = val
+
+
+    @staticmethod
+    def is_ref(val: object) -> bool:
+        """Whether the column value references a stored blob."""
+        return isinstance(val, str) and val.startswith(BLOB_PREFIX)
+
+
+    def externalize(self, val: object) -> object:
+        """Stores the value if it is binary and at least `threshold` bytes large.
+
+        Args:
+            val (object): The column value.
+
+        Returns:
+            object: The reference to the stored blob or the unchanged value.
+        """
+        if (
+            self._threshold is None
+            or not isinstance(val, (bytes, bytearray))
+            or len(val) < self._threshold
+        ):
+            return val
+        return self.put(val)
+
+
+    def put(self, data: bytes | bytearray) -> str:
+        """Stores the data unless a blob with equal content exists.
+
+        Args:
+            data (bytes | bytearray): The data to store.
+
+        Returns:
+            str: The column value referencing the blob.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._file(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Readers never see partially written files
+            with NamedTemporaryFile(dir=path.parent, prefix=".", delete=False) as tmp:
+                tmp.write(data)
+            os.replace(tmp.name, path)
+            self._written.add(digest)
+        return BLOB_PREFIX + digest
+
+
+    def get(self, ref: str) -> memoryview:
+        """Maps the referenced blob into memory.
+
+        Args:
+            ref (str): The column value referencing the blob.
+
+        Returns:
+            memoryview: Read-only view of the blob's content. The file stays mapped as long as the
+                view is referenced.
+
+        Raises:
+            FileNotFoundError: In case the blob does not exist.
+        """
+        with open(self._file(ref[len(BLOB_PREFIX):]), "rb") as file:
+            return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+    def collect(self, refs: set[str]) -> int:
+        """Removes all blobs which are not referenced anymore.
+
+        Args:
+            refs (set[str]): The column values of all stored blob references.
+
+        Returns:
+            int: The number of removed blobs.
+        """
+        if not self.path.exists():
+            return 0
+        keep = {ref[len(BLOB_PREFIX):] for ref in refs}
+        removed = 0
+        for path in self.path.glob("*/*"):
+            # Temporary files of concurrent writes start with a dot
+            if path.name[0] != "." and path.name not in keep:
+                path.unlink(True)
+                removed += 1
+        return removed
+
+
+    def clear(self):
+        """Removes all blobs."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self._written.clear()
+
+
+    def discard_written(self):
+        """Removes the blobs written by this store only. Other stores of the same folder may hold
+        blobs which must be kept, e.g. of other database instances sharing the folder."""
+        for digest in self._written:
+            path = self._file(digest)
+            path.unlink(True)
+            for folder in (path.parent, self.path):
+                try:
+                    folder.rmdir()
+                except OSError:
+                    pass # Not empty or already removed
+        self._written.clear()
+
+
+    def _file(self, digest: str) -> Path:
+        # Fan out into sub folders so no single folder gets too large
+        return self.path / digest[:2] / digest
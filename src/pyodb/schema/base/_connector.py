@@ -0,0 +1,271 @@
+"""Module handling the SQLite3 connections of a schema.
+Every thread gets it's own connections. Optionally all database files are attached to one single
+connection per thread so statements and transactions can span multiple files.
+"""
+import sqlite3 as sql
+from contextlib import contextmanager
+from pathlib import Path
+from threading import local
+from typing import Callable, Iterator
+
+from pyodb.error import TransactionError
+
+# Default of SQLITE_MAX_ATTACHED. Used when the limit cannot be read from the connection.
+DEFAULT_ATTACH_LIMIT = 10
+
+
+def get_limit(conn: sql.Connection, category: str, default: int) -> int:
+    """Reads a runtime limit of the connection. `Connection.getlimit` is only available since
+    Python 3.11.
+
+    Args:
+        conn (sql.Connection): The connection to read the limit from.
+        category (str): Name of the limit category like "SQLITE_LIMIT_ATTACHED".
+        default (int): Returned in case the limit cannot be read.
+
+    Returns:
+        int: The limit.
+    """
+    if not hasattr(conn, "getlimit") or not hasattr(sql, category):
+        return default
+    return conn.getlimit(getattr(sql, category))
+
+
+class _Connection(sql.Connection):
+    """SQLite3 connection which can defer commits until the surrounding transaction ends."""
+    defer_commits: int = 0
+
+
+    def commit(self) -> None:
+        if self.defer_commits:
+            return
+        super().commit()
+
+
+class Connector:
+    """Hands out one SQLite3 connection per thread and database file.
+
+    If `attach` is set, the database files are attached to one connection per thread instead, up
+    to SQLite's attach limit. Files beyond the limit get their own connection, which is committed
+    separately. Statements using the attached connection may then reference tables of multiple
+    files and a transaction spans all attached files. Files cannot be attached while a
+    transaction is running.
+
+    Args:
+        attach (bool, optional): Whether to attach all database files to one connection per thread.
+            Defaults to False.
+    """
+    def __init__(self, attach: bool = False) -> None:
+        self._attach = attach
+        self._local = local()
+        self._files: dict[Path, bool] = {}
+
+
+    def register(self, path: Path, shared: bool = True):
+        """Registers a database file, which is attached when a transaction starts, in case it was
+        not used by the current thread yet.
+
+        Args:
+            path (Path): The path to the database file.
+            shared (bool, optional): See `connect`. Defaults to True.
+        """
+        self._files[path] = shared
+
+
+    @property
+    def attach(self) -> bool:
+        """Whether database files are attached to one connection per thread."""
+        return self._attach
+
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether the current thread is within a transaction. Connections of other threads are
+        not part of it."""
+        return getattr(self._local, "depth", 0) > 0
+
+
+    def on_rollback(self, callback: Callable[[], object]):
+        """Registers a callback which is run in case the current thread's transaction is rolled
+        back, like forgetting tables whose creation is rolled back as well. Callbacks registered
+        outside of a transaction are never run.
+
+        Args:
+            callback (Callable[[], object]): The callback.
+        """
+        if self.in_transaction:
+            self._local.rollbacks.append(callback)
+
+
+    def connect(self, path: Path, shared: bool = True) -> sql.Connection:
+        """Returns the connection of the current thread for the given database file.
+
+        Args:
+            path (Path): The path to the database file.
+            shared (bool, optional): Whether the file may be attached to the shared connection.
+                Files holding tables with the same names must not be attached. Defaults to True.
+
+        Returns:
+            sql.Connection: The connection. May be shared with other files if `attach` is set.
+        """
+        conns = self._conns()
+        conn = conns.get(path)
+        if conn is None:
+            conn = self._attach_file(path) if self._attach and shared else None
+            if conn is None:
+                conn = self.connect_file(path)
+            conn.defer_commits = self._local.depth # type: ignore
+            conns[path] = conn
+        return conn
+
+
+    def connect_file(self, path: Path) -> sql.Connection:
+        """Creates a new database connection for exactly one file with standard performance
+            boosting pragmas.
+
+        Args:
+            path (Path): The path to the database file.
+
+        Returns:
+            Connection: A new connection object.
+        """
+        conn = sql.connect(
+            path,
+            check_same_thread=True,
+            isolation_level="IMMEDIATE",
+            factory=_Connection
+        )
+        try:
+            # conn.execute("pragma journal_mode = WAL;")
+            conn.execute("pragma synchronous = normal;")
+            conn.execute("pragma page_size = 4096;")
+            conn.commit()
+        except sql.OperationalError:
+            # These pragmas are only for performance
+            # They may fail because the database is locked or because they are not supported
+            # it is not critical in any case
+            print("PyODB WARNING: Could not set database performance pragmas.")
+
+        conn.row_factory = sql.Row
+        return conn
+
+
+    def pragma(self, path: Path, name: str, value: object = None, shared: bool = True) -> object:
+        """Reads or sets a pragma of a database file on the current thread's connection. Pragmas of
+        attached files are set on their schema.
+
+        Args:
+            path (Path): The path to the database file.
+            name (str): Name of the pragma.
+            value (object, optional): The new value. Defaults to None which only reads the pragma.
+            shared (bool, optional): See `connect`. Defaults to True.
+
+        Returns:
+            object: The value of the pragma.
+        """
+        conn = self.connect(path, shared)
+        alias = self._local.aliases.get(path)
+        pragma = f"pragma \"{alias}\".{name}" if alias else f"pragma {name}"
+        if value is not None:
+            conn.execute(f"{pragma} = {value};")
+        return conn.execute(f"{pragma};").fetchone()[0]
+
+
+    def schema_name(self, path: Path, shared: bool = True) -> str:
+        """Returns the name of the database file's schema on the current thread's connection.
+
+        Args:
+            path (Path): The path to the database file.
+            shared (bool, optional): See `connect`. Defaults to True.
+
+        Returns:
+            str: The alias of attached files, otherwise "main".
+        """
+        self.connect(path, shared)
+        return self._local.aliases.get(path, "main")
+
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Context manager which defers all commits of the current thread's connections until the
+        outermost transaction ends. Everything is rolled back in case of an error.
+        Connections attached to one another are committed atomically.
+        """
+        self._conns()
+        if self._attach and not self._local.depth:
+            # Files cannot be attached once the transaction started
+            for path, shared in list(self._files.items()):
+                self.connect(path, shared)
+        self._local.depth += 1
+        for conn in set(self._local.conns.values()):
+            conn.defer_commits += 1
+
+        try:
+            yield
+        except BaseException:
+            self._end_transaction(False)
+            raise
+        self._end_transaction(True)
+
+
+    def _end_transaction(self, commit: bool):
+        self._local.depth -= 1
+        for conn in set(self._local.conns.values()):
+            conn.defer_commits -= 1
+            if conn.defer_commits:
+                continue
+            if commit:
+                conn.commit()
+            else:
+                conn.rollback()
+        if not self._local.depth:
+            callbacks, self._local.rollbacks = self._local.rollbacks, []
+            if not commit:
+                for callback in callbacks:
+                    callback()
+
+
+    def _conns(self) -> dict[Path, sql.Connection]:
+        """Returns the connections of the current thread by file."""
+        if not hasattr(self._local, "conns"):
+            self._local.conns = {}
+            self._local.hub = None
+            self._local.attached = 0
+            self._local.depth = 0
+            self._local.aliases = {}
+            self._local.rollbacks = []
+        return self._local.conns
+
+
+    def _attach_file(self, path: Path) -> sql.Connection | None:
+        """Attaches the file to the current thread's shared connection.
+
+        Args:
+            path (Path): The path to the database file.
+
+        Returns:
+            sql.Connection | None: The shared connection or None if the attach limit is reached.
+
+        Raises:
+            TransactionError: In case a transaction is running, since the file could neither be
+                attached nor written atomically with the attached files.
+        """
+        hub: sql.Connection | None = self._local.hub
+        if hub is None:
+            hub = self._local.hub = self.connect_file(Path(":memory:"))
+            hub.defer_commits = self._local.depth # type: ignore
+
+        if self._local.depth or hub.in_transaction:
+            raise TransactionError(
+                f"Cannot attach '{path}' while a transaction is running! "
+                "Access the type once before the transaction starts."
+            )
+        if self._local.attached >= get_limit(hub, "SQLITE_LIMIT_ATTACHED", DEFAULT_ATTACH_LIMIT):
+            return None
+
+        alias = f"shard_{self._local.attached}"
+        hub.execute("ATTACH DATABASE ? AS ?;", [str(path), alias])
+        hub.execute(f"pragma \"{alias}\".synchronous = normal;")
+        self._local.attached += 1
+        self._local.aliases[path] = alias
+        return hub
@@ -1,13 +1,26 @@
-import pickle
 import sqlite3 as sql
-from pydoc import locate
+from functools import partial
 from time import time
 from types import GenericAlias, NoneType, UnionType
 from typing import Any, Callable, Coroutine, Generator
 
-from pyodb.error import DisassemblyError, MixedTypesError
+from pyodb._util import locate_type
+from pyodb.blob import STREAMING_SUPPORTED, Blob
+from pyodb.error import BadTypeError, DisassemblyError, MixedTypesError
+from pyodb.packed import PACKED_TYPES, unpack
 from pyodb.schema.base._table import Table
-from pyodb.schema.base._type_defs import BASE_TYPES, CONTAINERS, PRIMITIVES
+from pyodb.schema.base._type_defs import BASE_TYPES, CONTAINERS, PRIMITIVES, REF_SEPARATOR
+from pyodb.serializer import loads
+
+
+class AssemblyMemo:
+    """Remembers the objects assembled by one query by their uid, so references to shared objects
+    resolve to the same instance. References are resolved once all rows of the query are
+    assembled, which also allows cyclic references."""
+    def __init__(self) -> None:
+        self.objs: dict[str, object] = {}
+        self.refs: list[tuple[object, str, str]] = []
+        self.reassemble: list[object] = []
 
 
 class Assembler:
@@ -17,7 +30,8 @@ class Assembler:
             cls,
             table: Table,
             tables: dict[type, Table],
-            parent: str
+            parent: str,
+            memo: AssemblyMemo
         ) -> dict[str, object]:
         """
         Get the rows for the subtypes of the table with the given parent id.
@@ -26,6 +40,7 @@ class Assembler:
             table (Table): The table from which to retrieve the rows.
             tables (dict[type, Table]): Dictionary mapping the types to their corresponding tables.
             parent (str): The parent id used to retrieve the rows.
+            memo (AssemblyMemo): The memo of the current query.
 
         Returns:
             dict[str, object]: A dictionary containing the retrieved rows.
@@ -33,18 +48,49 @@ class Assembler:
         Raises:
             DBConnError: If the table does not have a valid database connection.
         """
-        if cls.last_clean < time()-1:
-            table.dbconn.execute(f"DELETE FROM \"{table.fqcn}\" WHERE _expires_ < {time()}")
-            table.dbconn.commit()
+        clean = cls.last_clean < time()-1
+        if clean:
             cls.last_clean = time()
-        rows = table.dbconn.execute(
-            f"SELECT * FROM \"{table.fqcn}\" WHERE _parent_table_ = ? ORDER BY _parent_ DESC",
-            [parent]
-        ).fetchall()
-        objs = cls.assemble_types(table.base_type, tables, rows)
+
+        def select_partition(conn: sql.Connection) -> list[sql.Row]:
+            if clean:
+                conn.execute(f"DELETE FROM \"{table.fqcn}\" WHERE _expires_ < {time()}")
+                conn.commit()
+            return conn.execute(
+                f"SELECT * FROM \"{table.fqcn}\" WHERE _parent_table_ = ? ORDER BY _parent_ DESC",
+                [parent]
+            ).fetchall()
+
+        rows = [row for rows in table.map_partitions(select_partition) for row in rows]
+        objs = cls._assemble_types(table.base_type, tables, rows, memo)
         return {rows[i]["_parent_"]: objs[i] for i in range(len(rows))}
 
 
+    @classmethod
+    def _get_child_types(cls, table: Table, rows: list[sql.Row]) -> list[type]:
+        """
+        Get the types of all child rows referenced by the passed rows.
+
+        Args:
+            table (Table): The table the rows belong to.
+            rows (list[sql.Row]): The rows to collect the child types of.
+
+        Returns:
+            list[type]: The referenced child types.
+        """
+        type_names: set[str] = set()
+        for name, type_ in table.members.items():
+            if isinstance(type_, (GenericAlias, UnionType)):
+                type_ = cls.get_base_type(type_)
+            if type_ in PRIMITIVES or type_ in CONTAINERS or not isinstance(type_, type):
+                continue
+            type_names |= {
+                row[name] for row in rows
+                if isinstance(row[name], str) and REF_SEPARATOR not in row[name]
+            }
+        return [locate_type(type_name) for type_name in type_names] # type: ignore
+
+
     @classmethod
     def get_base_type(cls, type_: UnionType | GenericAlias) -> type:
         """
@@ -80,11 +126,34 @@ class Assembler:
         Returns:
             Any: An instance of the given type, populated with values from the SQL row.
         """
+        memo = AssemblyMemo()
+        objs = cls._assemble_types(base_type, tables, rows, memo)
+        cls._resolve(tables, memo)
+        return objs
+
+
+    @classmethod
+    def _assemble_types(
+            cls,
+            base_type: type,
+            tables: dict[type, Table],
+            rows: list[sql.Row],
+            memo: AssemblyMemo
+        ) -> list[Any]:
         table = tables[base_type]
         objs = []
         subrows: dict[type, dict[str, object]] = {}
+        if table.pool is not None and rows and not table.connector.in_transaction:
+            # Independent child tables are loaded concurrently, transactions only cover the
+            # connections of the current thread
+            child_types = cls._get_child_types(table, rows)
+            subrows = dict(zip(child_types, table.pool.map([
+                partial(cls._get_sub_rows, tables[ttype], tables, table.fqcn, memo)
+                for ttype in child_types
+            ])))
         for row in rows:
             obj: Any = object.__new__(base_type)
+            memo.objs[row["_uid_"]] = obj
             for name, type_ in table.members.items():
                 if row[name] is None:
                     obj.__dict__[name] = None
@@ -93,28 +162,65 @@ class Assembler:
                 if isinstance(type_, (GenericAlias, UnionType)):
                     type_ = cls.get_base_type(type_)
 
-                if type_ in PRIMITIVES:
+                if type_ is Blob or (type_ is not str and table.blobs.is_ref(row[name])):
+                    obj.__dict__[name] = cls._load_blob(table, type_, row, name)
+
+                elif type_ in PRIMITIVES:
                     obj.__dict__[name] = type_(row[name])
 
-                elif type_ in CONTAINERS:
-                    obj.__dict__[name] = pickle.loads(row[name])
+                # Objects past max_depth are pickled as well
+                elif type_ in CONTAINERS or isinstance(row[name], bytes):
+                    obj.__dict__[name] = cls._deserialize(type_, row[name])
 
                 elif isinstance(type_, type):
-                    if str(row[name])[:2] == "b'" or str(row[name])[:2] == "b\"":
-                        obj.__dict__[name] = pickle.loads(row[name])
+                    if REF_SEPARATOR in row[name]:
+                        obj.__dict__[name] = None
+                        memo.refs += [(obj, name, row[name])]
                         continue
 
-                    ttype: type = locate(row[name]) # type: ignore
+                    ttype: type = locate_type(row[name]) # type: ignore
 
                     if ttype not in subrows:
-                        subrows[ttype] = cls._get_sub_rows(tables[ttype], tables, table.fqcn)
+                        subrows[ttype] = cls._get_sub_rows(tables[ttype], tables, table.fqcn, memo)
                     obj.__dict__[name] = subrows[ttype][row["_uid_"]]
+            table.tracker.track_load(obj, row)
             if "__odb_reassemble__" in base_type.__dict__:
-                obj.__odb_reassemble__()
+                memo.reassemble += [obj]
             objs += [obj]
         return objs
 
 
+    @classmethod
+    def _load_blob(cls, table: Table, type_: type, row: sql.Row, name: str) -> Any:
+        """Loads an externally stored value. `Blob` members are bound to their stored value without
+        reading it. Other binary members are returned as a read-only memoryview of the
+        memory-mapped blob, everything else was pickled."""
+        if type_ is Blob:
+            blob = Blob()
+            blob._bind(
+                (table.fqcn, row["_uid_"], name), row[name], table.blob_opener(row["_uid_"], name)
+            )
+            return blob
+
+        view = table.blobs.get(row[name])
+        if type_ in (bytes, bytearray):
+            return view
+        return cls._deserialize(type_, view)
+
+
+    @classmethod
+    def _deserialize(cls, type_: type, data: bytes | memoryview) -> Any:
+        """Deserializes a container, a packed sequence or an object stored past the max depth.
+        Containers are converted back to their annotated type, since not every format keeps tuples
+        and sets."""
+        if type_ in PACKED_TYPES:
+            return unpack(data, type_)
+        val = loads(data)
+        if type_ in CONTAINERS and not isinstance(val, type_):
+            return type_(val)
+        return val
+
+
     @classmethod
     def assemble_type(cls, base_type: type, tables: dict[type, Table], row: sql.Row) -> Any:
         """
@@ -131,8 +237,23 @@ class Assembler:
         Raises:
             DBConnError: In case a sub-table does not have a valid database connection.
         """
+        memo = AssemblyMemo()
+        obj = cls._assemble_type(base_type, tables, row, memo)
+        cls._resolve(tables, memo)
+        return obj
+
+
+    @classmethod
+    def _assemble_type(
+            cls,
+            base_type: type,
+            tables: dict[type, Table],
+            row: sql.Row,
+            memo: AssemblyMemo
+        ) -> Any:
         table = tables[base_type]
         obj: Any = object.__new__(base_type)
+        memo.objs[row["_uid_"]] = obj
         for name, type_ in table.members.items():
             if row[name] is None:
                 obj.__dict__[name] = None
@@ -141,38 +262,77 @@ class Assembler:
             if isinstance(type_, (GenericAlias, UnionType)):
                 type_ = cls.get_base_type(type_)
 
-            if type_ in PRIMITIVES:
+            if type_ is Blob or (type_ is not str and table.blobs.is_ref(row[name])):
+                obj.__dict__[name] = cls._load_blob(table, type_, row, name)
+
+            elif type_ in PRIMITIVES:
                 obj.__dict__[name] = type_(row[name])
 
-            elif type_ in CONTAINERS:
-                obj.__dict__[name] = pickle.loads(row[name])
+            # Objects past max_depth are pickled as well
+            elif type_ in CONTAINERS or isinstance(row[name], bytes):
+                obj.__dict__[name] = cls._deserialize(type_, row[name])
 
             elif isinstance(type_, type):
-                if str(row[name])[:2] == "b'" or str(row[name])[:2] == "b\"":
-                    obj.__dict__[name] = pickle.loads(row[name])
+                if REF_SEPARATOR in row[name]:
+                    obj.__dict__[name] = None
+                    memo.refs += [(obj, name, row[name])]
                     continue
 
-                ttype: type = locate(row[name]) # type: ignore
+                ttype: type = locate_type(row[name]) # type: ignore
                 subtable = tables[ttype]
-                subrow: sql.Row = subtable.dbconn.execute(
-                    f"SELECT * FROM \"{subtable.fqcn}\" WHERE _parent_ = '{row['_uid_']}'"
-                ).fetchone()
-                obj.__dict__[name] = cls.assemble_type(ttype, tables, subrow)
+                for conn in subtable.dbconns:
+                    subrow: sql.Row = conn.execute(
+                        f"SELECT * FROM \"{subtable.fqcn}\" WHERE _parent_ = '{row['_uid_']}'"
+                    ).fetchone()
+                    if subrow is not None:
+                        break
+                obj.__dict__[name] = cls._assemble_type(ttype, tables, subrow, memo)
+        table.tracker.track_load(obj, row)
         if "__odb_reassemble__" in base_type.__dict__:
-            obj.__odb_reassemble__()
+            memo.reassemble += [obj]
         return obj
 
 
+    @classmethod
+    def _resolve(cls, tables: dict[type, Table], memo: AssemblyMemo):
+        """Resolves the references to shared objects and runs the post-assembly methods.
+        Objects referenced from outside the query are loaded by their uid. References to
+        deleted objects resolve to None.
+
+        Args:
+            tables (dict[type, Table]): A dictionary of type -> Table mappings.
+            memo (AssemblyMemo): The memo of the query.
+        """
+        while memo.refs:
+            obj, name, ref = memo.refs.pop()
+            type_name, _, uid = ref.rpartition(REF_SEPARATOR)
+            ttype = locate_type(type_name)
+            if uid not in memo.objs and ttype in tables:
+                for conn in tables[ttype].dbconns:
+                    row = conn.execute(
+                        f"SELECT * FROM \"{tables[ttype].fqcn}\" WHERE _uid_ = ?", [uid]
+                    ).fetchone()
+                    if row is not None:
+                        cls._assemble_type(ttype, tables, row, memo)
+                        break
+            obj.__dict__[name] = memo.objs.get(uid)
+
+        for obj in memo.reassemble:
+            obj.__odb_reassemble__() # type: ignore
+        memo.reassemble = []
+
+
 class Disassembler:
     sharded = False
 
     @classmethod
-    def _disassemble_union_type(cls, type_: UnionType) -> dict[type, dict]:
+    def _disassemble_union_type(cls, type_: UnionType, seen: set[type]) -> dict[type, dict]:
         """
         Given a UnionType object, returns a list of Table objects associated with the input type.
 
         Args:
             type_: A UnionType object.
+            seen: The types which are already being disassembled.
 
         Returns:
             A list of Table objects associated with each type of the Union.
@@ -190,8 +350,8 @@ or multiple primitives! Got: {type_}"
         for t in type_.__args__:
             if t is NoneType:
                 continue
-            else:
-                tables |= cls.disassemble_type(t)
+            elif t not in seen:
+                tables |= cls.disassemble_type(t, seen)
         return tables
 
 
@@ -218,12 +378,19 @@ or multiple primitives! Got: {type_}"
 
 
     @classmethod
-    def disassemble_type(cls, obj_type: type) -> dict[type, dict[str, type | UnionType]]:
+    def disassemble_type(
+            cls,
+            obj_type: type,
+            seen: set[type] | None = None
+        ) -> dict[type, dict[str, type | UnionType]]:
         """Disassembles a custom object type into a list of tables that represent the object's
-        structure in the database.
+        structure in the database. Types referencing themselves directly or indirectly are
+        disassembled only once.
 
         Args:
             obj_type (type): A custom object type to be disassembled.
+            seen (set[type] | None, optional): The types which are already being disassembled.
+                Defaults to None.
 
         Returns:
             list[Table]: A list of Table objects representing the structure of the disassembled
@@ -233,6 +400,8 @@ or multiple primitives! Got: {type_}"
         Raises:
             DisassemblyError: If obj_type is Any, NoneType, a primitive type or the passed argument
                 is not a type at all.
+            BadTypeError: If a member is a `Blob` and the sqlite3 module does not support
+                incremental blob I/O (before Python 3.11).
         """
         if obj_type is Any or obj_type is NoneType or obj_type in BASE_TYPES:
             raise DisassemblyError("'Any', 'None' and Primitive types are not supported!")
@@ -241,6 +410,7 @@ or multiple primitives! Got: {type_}"
             raise DisassemblyError(f"Passed argument must be a type! Got: {obj_type}")
 
         tables: dict = {obj_type: {}}
+        seen = (seen or set()) | {obj_type}
 
         if hasattr(obj_type, "__odb_members__"):
             members: dict[str, type|UnionType|GenericAlias] = getattr(obj_type, "__odb_members__")
@@ -255,13 +425,20 @@ or multiple primitives! Got: {type_}"
         for key, type_ in members.items():
             type_ = cls._break_down_type(type_)
 
+            if not STREAMING_SUPPORTED and (type_ is Blob or type_ == Blob | None):
+                raise BadTypeError(
+                    f"Member '{key}' of {obj_type} is a Blob, which requires Python 3.11 or newer!"
+                )
+
             tables[obj_type][key] = type_
             if type_ in BASE_TYPES:
                 continue
 
             if isinstance(type_, UnionType):
-                tables |= cls._disassemble_union_type(type_)
+                tables |= cls._disassemble_union_type(type_, seen)
+            elif type_ in seen:
+                continue
             elif isinstance(type_, (type, GenericAlias)) and hasattr(type_, "__annotations__"):
-                tables |= cls.disassemble_type(type_)
+                tables |= cls.disassemble_type(type_, seen)
 
         return tables
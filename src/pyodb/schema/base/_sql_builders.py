@@ -1,15 +1,16 @@
 import pickle
 import sqlite3.dbapi2 as sql
-from pydoc import locate
 from time import time
 from types import GenericAlias, UnionType
-from typing import Any
+from typing import Any, Iterator, get_args
 
-from pyodb._util import generate_uid
+from pyodb._util import generate_uid, locate_type
 from pyodb.error import BadTypeError, ExpiryError, ParentError, QueryError
-from pyodb.schema.base._operators import Assembler
+from pyodb.schema.base._blob_store import BlobStore
+from pyodb.schema.base._operators import REF_SEPARATOR, Assembler
 from pyodb.schema.base._table import Table
 from pyodb.schema.base._type_defs import BASE_TYPES, CONTAINERS, PRIMITIVES
+from pyodb.serializer import Serializer
 
 
 class Insert:
@@ -23,34 +24,50 @@ class Insert:
             None.
         expires (float, optional): A floating-point number representing the expiration time of the
             inserted data as a Unix timestamp. Default is None.
+        partition (int, optional): The partition of the table the data is routed to. Default is 0.
+        uid (str, optional): The uid of the inserted row. Default is None which generates a new uid.
     """
 
-    def __init__(
+    def __init__( # noqa: PLR0913
             self,
             table_name: str,
             parent: str | None,
             parent_table: str | None,
-            expires: float | None
+            expires: float | None,
+            partition: int = 0,
+            uid: str | None = None
         ) -> None:
         self._table_name = table_name
-        self._uid = generate_uid()
+        self._uid = uid or generate_uid()
+        self.partition = partition
         if expires and expires <= time():
             raise ExpiryError("expires must be greater than the current timestamp")
         self._vals: list = [parent, parent_table, expires]
 
-    def add_val(self, val: object) -> None:
+    def add_val(
+            self,
+            val: object,
+            blobs: BlobStore | None = None,
+            serializer: Serializer | None = None
+        ) -> None:
         """Add a value to the list of values to be inserted into the table.
 
         Args:
             val (object): The value to be added to the list.
+            blobs (BlobStore | None, optional): The store large binary values are moved to.
+                Defaults to None which keeps all values inline.
+            serializer (Serializer | None, optional): Serializes containers. Defaults to None
+                which pickles them.
         """
         type_ = type(val)
         if type_ in PRIMITIVES or val is None:
             self._vals += [val]
         elif type_ in CONTAINERS:
-            self._vals += [pickle.dumps(val)]
+            self._vals += [serializer.dumps(val) if serializer else pickle.dumps(val)]
         else:
             self._vals += [f"{type_.__module__}.{type_.__name__}"]
+        if blobs is not None:
+            self._vals[-1] = blobs.externalize(self._vals[-1])
 
     def commit(self, dbconn: sql.Connection) -> None:
         """Execute the INSERT statement and commit changes to the database.
@@ -123,9 +140,12 @@ class MultiInsert:
         insert = f"INSERT INTO \"{self._table_name}\" VALUES("
         insert += "?,"*len(self._vals[0])
         insert = insert[:-1] + ");"
-        with dbconn as conn:
-            conn.executemany(insert, self._vals)
-            conn.commit()
+        try:
+            dbconn.executemany(insert, self._vals)
+            dbconn.commit()
+        except sql.Error:
+            dbconn.rollback()
+            raise
 
 
     @property
@@ -175,6 +195,7 @@ class _Query:
         self._tables = tables
         self._wheres = []
         self._limit = None
+        self._offset = None
 
     def eq(self, or_: bool = False, **kwargs):
         """
@@ -386,14 +407,47 @@ class _Query:
         Raises:
             sqlite3.Error: If there is a problem executing the query.
         """
-        stmt = f"{start_text} \"{self._table.fqcn}\" "
-        vals = []
+        stmt, vals = self._build(start_text, reset)
+        return dbconn.execute(stmt, vals)
+
+
+    def _build(
+            self,
+            start_text: str,
+            reset: bool = True,
+            live: bool = False,
+            set_text: str = ""
+        ) -> tuple[str, list]:
+        """
+        Compiles the SQL query without executing it. Used to run the same statement on every
+        partition of a table.
+
+        Args:
+            start_text (str): The initial text of the SQL query, such as "SELECT * FROM".
+            reset (bool): A flag indicating whether to reset the query after compiling. Default is
+                True.
+            live (bool): Whether to omit expired rows. Default is False.
+            set_text (str): Text placed between the table name and the WHERE clause, such as the
+                SET clause of an UPDATE. Default is "".
+
+        Returns:
+            tuple[str, list]: The SQL statement and the parameters of the WHERE clause.
+        """
+        stmt = f"{start_text} \"{self._table.fqcn}\" {set_text}"
+        clause = ""
+        vals: list = []
+        for where in self._wheres:
+            clause += f"{where.colname}{where.operator}?{where.connector}"
+            vals += [where.value]
         if self._wheres:
-            stmt += "WHERE "
-            for where in self._wheres:
-                stmt += f"{where.colname}{where.operator}?{where.connector}"
-                vals += [where.value]
-            stmt = stmt[:-len(self._wheres[-1].connector)]
+            clause = clause[:-len(self._wheres[-1].connector)]
+        if live:
+            # The filters are grouped so OR-connected filters cannot bypass the expiry check
+            clause = f"({clause}) AND " if clause else ""
+            clause += "(_expires_ IS NULL OR _expires_ > ?)"
+            vals += [time()]
+        if clause:
+            stmt += f"WHERE {clause} "
 
         if self._limit is not None:
             stmt += f"LIMIT {self._limit}"
@@ -404,14 +458,24 @@ class _Query:
             self._wheres = []
             self._limit = None
             self._offset = None
-        return dbconn.execute(stmt + ";", vals)
+        return stmt + ";", vals
 
 
 class Delete(_Query):
     """
     Class representing a DELETE SQL statement to delete records from a table.
     Inherits from `_Query` class.
+
+    Sub-objects shared with other objects are kept as long as a reference to them remains and are
+    deleted together with the last reference.
     """
+    def __init__(self, type_: type, tables: dict[type, Table]) -> None:
+        super().__init__(type_, tables)
+        # Rows referencing shared objects by the type name of the shared objects. Shared by all
+        # cascading deletes, references cannot be added while deleting.
+        self._refs: dict[str, list[tuple[Table, str, str]]] = {}
+
+
     def commit(self, full_count: bool = False) -> int:
         """
         Deletes records from the table and returns the number of records deleted.
@@ -426,7 +490,9 @@ class Delete(_Query):
             raise ParentError("Cannot remove non-parent types directly!")
         self.eq(_parent_ = None)
 
-        return self._commit(full_count)
+        # Cascading deletes of all child rows are committed at once
+        with self._table.connector.transaction():
+            return self._commit(full_count)
 
 
     def _commit(self, count: bool) -> int:
@@ -440,10 +506,19 @@ class Delete(_Query):
             Returns:
                 int: The number of records deleted.
         """
-        res: list[sql.Row] = self._compile("SELECT * FROM", self._table.dbconn, False).fetchall()
+        select_stmt, vals = self._build("SELECT * FROM", False)
+        delete_stmt, _ = self._build("DELETE FROM")
+
+        def delete_partition(conn: sql.Connection) -> list[sql.Row]:
+            rows = conn.execute(select_stmt, vals).fetchall()
+            conn.execute(delete_stmt, vals)
+            conn.commit()
+            return rows
+
+        res: list[sql.Row] = [
+            row for rows in self._table.map_partitions(delete_partition) for row in rows
+        ]
         rlen = len(res)
-        self._compile("DELETE FROM", self._table.dbconn)
-        self._table.dbconn.commit()
 
         for key, type_ in self._table.members.items():
             if isinstance(type_, GenericAlias | UnionType):
@@ -455,19 +530,236 @@ class Delete(_Query):
             for item in res:
                 if str(item[key])[:2] == "b'" or str(item[key])[:2] == "b\"":
                     continue
-                subtype: type = locate(item[key]) # type: ignore
-                if subtype not in self._tables:
-                    raise BadTypeError("Subtype was invalid!")
-
-                delete = Delete(subtype, self._tables)
-                delete.eq(_parent_=item["_uid_"])
-                if count:
-                    rlen += delete._commit(True)
+                if item[key] is None:
+                    continue
+                if REF_SEPARATOR in item[key]:
+                    deleted = self._delete_orphan(item[key], count)
                 else:
-                    delete._commit(False)
+                    subtype: type = locate_type(item[key]) # type: ignore
+                    if subtype not in self._tables:
+                        raise BadTypeError("Subtype was invalid!")
+                    deleted = self._delete_children(subtype, item["_uid_"], count)
+                if count:
+                    rlen += deleted
         return rlen
 
 
+    def _delete_children(self, subtype: type, parent: str, count: bool) -> int:
+        """Deletes the child rows of a deleted or replaced parent. Children which other objects
+        still reference are kept, but detached from the parent.
+
+        Returns:
+            int: The number of deleted rows including their children.
+        """
+        subtable = self._tables[subtype]
+        stmt = f"SELECT _uid_ FROM \"{subtable.fqcn}\" WHERE _parent_ = ?;"
+        detach = f"UPDATE \"{subtable.fqcn}\" SET _parent_ = '', _parent_table_ = NULL "
+        deleted = 0
+        for conn in subtable.dbconns:
+            for row in conn.execute(stmt, [parent]).fetchall():
+                # References from within the child itself do not keep it
+                if not self._is_referenced(subtable, row[0], {row[0]}):
+                    deleted += self._delete_uid(subtype, row[0], count)
+                    continue
+                conn.execute(detach + "WHERE _uid_ = ?;", [row[0]])
+                conn.commit()
+        return deleted
+
+
+    def _delete_orphan(self, ref: str, count: bool) -> int:
+        """Deletes a shared object which outlived the object it was stored with, once the last
+        reference to it is deleted.
+
+        Returns:
+            int: The number of deleted rows including their children.
+        """
+        type_name, _, uid = ref.rpartition(REF_SEPARATOR)
+        ttype = locate_type(type_name)
+        if ttype not in self._tables or self._row(self._tables[ttype], uid) is None:
+            return 0
+        if self._is_live(self._tables[ttype], uid, set()):
+            return 0
+        return self._delete_uid(ttype, uid, count)
+
+
+    def _delete_uid(self, type_: type, uid: str, count: bool) -> int:
+        delete = Delete(type_, self._tables)
+        delete._refs = self._refs
+        return delete.eq(_uid_=uid)._commit(count)
+
+
+    def _is_live(self, table: Table, uid: str, seen: set[str]) -> bool:
+        """Whether the row is reachable from a top level row, either through it's parents or
+        through a reference. Rows in `seen` do not count, which excludes references from within
+        a deleted object and cycles."""
+        row = self._row(table, uid)
+        if row is None or uid in seen:
+            return False
+        if row["_parent_"] is None:
+            return True
+        seen = seen | {uid}
+        parent = next(
+            (ptable for ptable in self._tables.values() if ptable.fqcn == row["_parent_table_"]),
+            None
+        )
+        if parent is not None and self._row(parent, row["_parent_"]) is not None:
+            return self._is_live(parent, row["_parent_"], seen)
+        return self._is_referenced(table, uid, seen)
+
+
+    def _is_referenced(self, table: Table, uid: str, seen: set[str]) -> bool:
+        """Whether a live row references the row. See `_is_live`."""
+        return any(
+            self._is_live(ref_table, ref_uid, seen)
+            for ref_table, ref_uid, ref in self._references(table.fqcn)
+            if ref.rpartition(REF_SEPARATOR)[2] == uid
+        )
+
+
+    def _references(self, type_name: str) -> list[tuple[Table, str, str]]:
+        """Returns the table, the uid and the reference of all rows referencing objects of the
+        type. The rows are only read once per delete. Only columns of members whose type can hold
+        such objects are searched."""
+        if type_name not in self._refs:
+            refs = []
+            pattern = f"{type_name}{REF_SEPARATOR}%"
+            ref_type = next(
+                (ttype for ttype, table in self._tables.items() if table.fqcn == type_name), None
+            )
+            for table in self._tables.values():
+                for name, type_ in table.members.items():
+                    if type_ in BASE_TYPES or not self._can_hold(type_, ref_type):
+                        continue
+                    stmt = f"SELECT _uid_, {name} FROM \"{table.fqcn}\" WHERE {name} LIKE ?;"
+                    for conn in table.dbconns:
+                        refs += [
+                            (table, row[0], row[1]) for row in conn.execute(stmt, [pattern])
+                            if isinstance(row[1], str)
+                            and row[1].rpartition(REF_SEPARATOR)[0] == type_name
+                        ]
+            self._refs[type_name] = refs
+        return self._refs[type_name]
+
+
+    @staticmethod
+    def _can_hold(member_type: object, ref_type: type | None) -> bool:
+        """Whether a member of the type may be stored as a reference to an object of `ref_type`.
+        Unknown types may be referenced by any member."""
+        if ref_type is None:
+            return True
+        return any(
+            isinstance(type_, type) and issubclass(ref_type, type_)
+            for type_ in get_args(member_type) or (member_type,)
+        )
+
+
+    @staticmethod
+    def _row(table: Table, uid: str) -> sql.Row | None:
+        """Returns the parent columns of the row with the uid or None if it does not exist."""
+        stmt = f"SELECT _parent_, _parent_table_ FROM \"{table.fqcn}\" WHERE _uid_ = ?;"
+        for conn in table.dbconns:
+            row = conn.execute(stmt, [uid]).fetchone()
+            if row is not None:
+                return row
+        return None
+
+
+class Update(_Query):
+    """
+    Class representing an UPDATE SQL statement changing primitive columns of all matching rows at
+    once. Expired rows are not updated. Inherits from `_Query` class.
+    """
+    def __init__(self, type_: type, tables: dict[type, Table]) -> None:
+        super().__init__(type_, tables)
+        self._sets: dict[str, tuple[str, object]] = {}
+
+
+    def set(self, **kwargs):
+        """
+        Sets the passed columns to the passed values.
+
+        Parameters:
+            **kwargs: A dictionary of column names and their new values.
+                Allowed Types are: int, float, str, bool, NoneType
+
+        Returns:
+            self: The Update instance.
+
+        Raises:
+            QueryError: If a column is not a primitive member of the table.
+            BadTypeError: If the passed argument has an invalid type.
+        """
+        for key, val in kwargs.items():
+            self._check_column(key, (int, float, str, bool))
+            if val is not None and not isinstance(val, (int, float, str, bool)):
+                raise BadTypeError(
+                    f"Values must be int, float, str or bool for updates! Got: {type(val)}"
+                )
+            self._sets[key] = ("?", val)
+        return self
+
+
+    def incr(self, **kwargs):
+        """
+        Increments the passed columns by the passed values. Negative values decrement them.
+
+        Parameters:
+            **kwargs: A dictionary of column names and the values to add.
+                Allowed Types are: int, float
+
+        Returns:
+            self: The Update instance.
+
+        Raises:
+            QueryError: If a column is not a numeric member of the table.
+            BadTypeError: If the passed argument has an invalid type.
+        """
+        for key, val in kwargs.items():
+            self._check_column(key, (int, float))
+            if not isinstance(val, (int, float)) or isinstance(val, bool):
+                raise BadTypeError(f"Values must be int or float for increments! Got: {type(val)}")
+            self._sets[key] = (f"{key} + ?", val)
+        return self
+
+
+    def commit(self) -> int:
+        """
+        Updates all matching rows which are not expired and returns their number.
+
+        Returns:
+            int: The number of updated rows.
+
+        Raises:
+            QueryError: If nothing was set.
+        """
+        if not self._sets:
+            raise QueryError("Nothing to update! Use 'set' or 'incr' first.")
+
+        set_text = "SET " + ",".join(f"{key} = {expr}" for key, (expr, _) in self._sets.items())
+        stmt, vals = self._build("UPDATE", live=True, set_text=set_text + " ")
+        vals = [val for _, val in self._sets.values()] + vals
+        self._sets = {}
+
+        def update_partition(conn: sql.Connection) -> int:
+            count = conn.execute(stmt, vals).rowcount
+            conn.commit()
+            return count
+
+        count = sum(self._table.map_partitions(update_partition))
+        if count:
+            # Remembered rows of loaded objects may not match the stored rows anymore
+            self._table.tracker.invalidate()
+        return count
+
+
+    def _check_column(self, key: str, allowed: tuple[type, ...]):
+        type_ = self._table.members.get(key)
+        if isinstance(type_, UnionType):
+            type_ = Assembler.get_base_type(type_)
+        if type_ not in allowed:
+            raise QueryError(f"'{key}' is no column of type {allowed} of {self._table.base_type}!")
+
+
 class Select(_Query):
     """A class representing a SELECT query to retrieve data from a database table.
     Inherits from the _Query class.
@@ -497,7 +789,7 @@ class Select(_Query):
             self._limit = 2
             self._offset = None
 
-        rows = self._compile().fetchall()
+        rows = self._fetchall()
         if len(rows) > 1:
             raise QueryError("Too many results found for query")
         if len(rows) == 0:
@@ -514,15 +806,14 @@ class Select(_Query):
             Any: An object of the base type of the table representing the first result or None if
                 no table was found.
         """
-        if self._limit:
-            self._limit = 1
+        self._limit = 1
 
-        row = self._compile().fetchone()
-        if row is None:
+        rows = self._fetchall()
+        if not rows:
             return None
 
         return Assembler.assemble_type(
-            self._table.base_type, self._tables, row
+            self._table.base_type, self._tables, rows[0]
         )
 
 
@@ -533,10 +824,66 @@ class Select(_Query):
         Returns:
             list[Any]: A list of objects of the base type of the table representing all results.
         """
-        rows = self._compile().fetchall()
+        rows = self._fetchall()
         return Assembler.assemble_types(self._table.base_type, self._tables, rows)
 
 
+    def iter(self, chunk_size: int = 100) -> Iterator[Any]:
+        """
+        Returns an iterator over all results of the query. Rows are fetched and assembled lazily
+        in chunks of `chunk_size`, so only one chunk is held in memory at once. Partitions are
+        read one after another. The iterator must be consumed on the thread which created it.
+
+        Args:
+            chunk_size (int, optional): Number of objects assembled at once. Defaults to 100.
+
+        Returns:
+            Iterator[Any]: An iterator over objects of the base type of the table.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0!")
+        return self._iter(chunk_size)
+
+
+    def _iter(self, chunk_size: int) -> Iterator[Any]:
+        for rows in self._fetch_chunks(chunk_size):
+            yield from Assembler.assemble_types(self._table.base_type, self._tables, rows)
+
+
+    def _fetch_chunks(self, chunk_size: int) -> Iterator[list[sql.Row]]:
+        """
+        Fetches the rows matching the query from every partition of the table in chunks. Limit
+        and offset of partitioned tables are applied to the merged rows like in `_fetchall`.
+
+        Args:
+            chunk_size (int): Maximum number of rows per chunk.
+
+        Yields:
+            list[sql.Row]: The next chunk of matching rows.
+        """
+        skip, remaining = 0, None
+        if self._table.partitions > 1 and self._limit is not None:
+            skip, remaining = self._offset or 0, self._limit
+            self._limit, self._offset = self._limit + skip, None
+
+        now = time()
+        stmt, vals = self._build("SELECT * FROM")
+        for conn in self._table.dbconns:
+            conn.execute(f"DELETE FROM \"{self._table.fqcn}\" WHERE _expires_ < {now}")
+            conn.commit()
+            cursor = conn.execute(stmt, vals)
+            while rows := cursor.fetchmany(chunk_size):
+                dropped = min(skip, len(rows))
+                rows, skip = rows[dropped:], skip - dropped
+                if remaining is not None:
+                    rows = rows[:remaining]
+                    remaining -= len(rows)
+                if rows:
+                    yield rows
+                if remaining == 0:
+                    return
+
+
     def count(self) -> int:
         """
         Returns the number of rows in the table matching the query. Alos omits expired entries.
@@ -544,25 +891,90 @@ class Select(_Query):
         Returns:
             int: The number of rows matching the query.
         """
-        self.gt(True, _expires_ = time())
-        self.eq(_expires_ = None)
-        return self._compile("COUNT(*)").fetchone()[0]
+        return sum(rows[0][0] for rows in self._compile("COUNT(*)", True))
+
+
+    def update(self, **kwargs) -> int:
+        """
+        Sets the passed primitive columns of all rows matching the query at once, without loading
+        the objects. Expired rows are not updated.
+
+        Parameters:
+            **kwargs: A dictionary of column names and their new values.
+                Allowed Types are: int, float, str, bool, NoneType
+
+        Returns:
+            int: The number of updated rows.
+        """
+        return self._to_update().set(**kwargs).commit()
 
 
-    def _compile(self, get_what: str = "*") -> sql.Cursor: # type: ignore
+    def incr(self, **kwargs) -> int:
         """
-        Compiles and executes the SELECT query and returns a cursor object.
+        Increments the passed numeric columns of all rows matching the query at once, without
+        loading the objects. Expired rows are not updated.
+
+        Parameters:
+            **kwargs: A dictionary of column names and the values to add.
+                Allowed Types are: int, float
+
+        Returns:
+            int: The number of updated rows.
+        """
+        return self._to_update().incr(**kwargs).commit()
+
+
+    def _to_update(self) -> Update:
+        """Moves the filters of this query to a new `Update`."""
+        update = Update(self._table.base_type, self._tables)
+        update._wheres, self._wheres = self._wheres, []
+        return update
+
+
+    def _fetchall(self) -> list[sql.Row]:
+        """
+        Fetches all rows matching the query from every partition of the table. Limit and offset
+        are applied to the merged rows.
+
+        Returns:
+            list[sql.Row]: The matching rows.
+        """
+        if self._table.partitions == 1 or self._limit is None:
+            return [row for rows in self._compile() for row in rows]
+
+        limit, offset = self._limit, self._offset or 0
+        self._limit, self._offset = limit + offset, None
+        rows = [row for rows in self._compile() for row in rows]
+        return rows[offset:offset+limit]
+
+
+    def _compile( # type: ignore
+            self,
+            get_what: str = "*",
+            live: bool = False
+        ) -> list[list[sql.Row]]:
+        """
+        Compiles and executes the SELECT query on every partition of the table and returns the
+        fetched rows. Partitions are queried concurrently if the table has a fan-out pool.
 
         Args:
             get_what (str, optional): The columns to select in the query. Defaults to "*".
+            live (bool, optional): Whether to omit expired rows in the query itself.
+                Defaults to False.
 
         Returns:
-            sql.Cursor: A cursor object representing the results of the query.
+            list[list[sql.Row]]: One list of rows per partition representing the results of the
+                query.
 
         Raises:
             DBConnError: If the table does not have a valid database connection.
         """
-        self._table.dbconn.execute(f"DELETE FROM \"{self._table.fqcn}\" WHERE _expires_ < {time()}")
-        self._table.dbconn.commit()
+        now = time()
+        stmt, vals = self._build(f"SELECT {get_what} FROM", live=live)
+
+        def select_partition(conn: sql.Connection) -> list[sql.Row]:
+            conn.execute(f"DELETE FROM \"{self._table.fqcn}\" WHERE _expires_ < {now}")
+            conn.commit()
+            return conn.execute(stmt, vals).fetchall()
 
-        return super()._compile(f"SELECT {get_what} FROM", self._table.dbconn)
+        return self._table.map_partitions(select_partition)
@@ -3,11 +3,23 @@ statements.
 Including create and remove table statements in case the fields contained by a class were changed.
 """
 import sqlite3 as sql
+import zlib
 from pathlib import Path
-from threading import get_ident as get_thread_id
 from types import UnionType
+from typing import Callable, TypeVar
 
+from pyodb._util import FanOutPool
+from pyodb.blob import CHUNK_SIZE, Blob, BlobOpener
+from pyodb.schema.base._blob_store import BlobStore
+from pyodb.schema.base._connector import Connector
+from pyodb.schema.base._tracker import Tracker
 from pyodb.schema.base._type_defs import BASE_TYPE_SQL_MAP, BASE_TYPES
+from pyodb.serializer import Serializer
+
+T = TypeVar("T")
+
+# Number of column values buffered per chunk when streaming objects into a table
+CHUNK_VALUES = 32768
 
 
 class Table:
@@ -16,10 +28,14 @@ class Table:
     Args:
         base_type (type): The type of objects that the table will store.
         sharded (bool): A flag indicating whether the table has it's own db file or not.
+        partitions (int, optional): Number of db files the rows of a sharded table are spread
+            across. Defaults to 1.
     """
+    # Only these members are saved with the schema definition
     base_type: type
     is_parent: bool
     _sharded: bool
+    _partitions: int
 
 
     def __init__(
@@ -27,16 +43,23 @@ class Table:
             base_type: type,
             base_path: Path,
             members: dict[str, type | UnionType],
-            sharded: bool
+            sharded: bool,
+            partitions: int = 1
         ) -> None:
+        if partitions < 1:
+            raise ValueError("partitions must be >= 1!")
         self._members = {}
         self.base_type = base_type
         self.is_parent = False
         self._sharded = sharded
+        self._partitions = partitions if sharded else 1
         self.base_path = base_path
         self._members = members
-        self._dbconn = self._create_dbconn()
-        self._cur_thread = get_thread_id()
+        self.pool: FanOutPool | None = None
+        self.connector = Connector()
+        self.tracker = Tracker()
+        self.blobs = BlobStore(base_path / "blobs")
+        self.serializer = Serializer()
 
 
     @property
@@ -59,15 +82,109 @@ class Table:
         return f"{self.base_type.__module__}.{self.base_type.__name__}"
 
 
+    @property
+    def blob_table(self) -> str:
+        """Name of the side table holding the values of `Blob` members."""
+        return f"{self.fqcn}.blobs"
+
+
+    @property
+    def blob_members(self) -> list[str]:
+        """Names of all members of type `Blob`."""
+        return [
+            name for name, type_ in self._members.items() if type_ is Blob or type_ == Blob | None
+        ]
+
+
+    def serializer_of(self, member: str) -> Serializer:
+        """Returns the serializer of the member. Types may override the serializer of single
+        members by a dictionary named `__odb_serializers__` mapping member names to serializers.
+
+        Args:
+            member (str): The name of the member.
+
+        Returns:
+            Serializer: The serializer of the member.
+        """
+        return getattr(self.base_type, "__odb_serializers__", {}).get(member, self.serializer)
+
+
+    @property
+    def partitions(self) -> int:
+        """Number of db files (partitions) the rows of this table are spread across. Definitions
+        saved before the partition count was stored have none, they were never partitioned."""
+        return self._partitions or 1
+
+
+    @property
+    def db_paths(self) -> list[Path]:
+        """Paths of all db files holding rows of this table. One per partition."""
+        if not self._sharded:
+            return [self.base_path / "pyodb.db"]
+        if self._partitions == 1:
+            return [self.base_path / (self.base_type.__name__ + ".db")]
+        return [
+            self.base_path / f"{self.base_type.__name__}.{i}.db"
+            for i in range(self._partitions)
+        ]
+
+
     @property
     def dbconn(self) -> sql.Connection:
-        """SQLite3 Database Connection"""
-        tid = get_thread_id()
-        if self._cur_thread != tid:
-            self._dbconn = self._create_dbconn()
-            self._cur_thread = tid
+        """SQLite3 Database Connection (of the first partition)"""
+        return self.dbconns[0]
+
+
+    @property
+    def dbconns(self) -> list[sql.Connection]:
+        """SQLite3 Database Connections of all partitions. Every thread has it's own connections."""
+        # Partitions hold tables with equal names and can therefore not be attached
+        shared = self._partitions == 1
+        return [self.connector.connect(path, shared) for path in self.db_paths]
+
+
+    @property
+    def chunk_size(self) -> int:
+        """Number of rows written per chunk when streaming objects into the table. The size is
+        estimated from the row width, so every chunk buffers about `CHUNK_VALUES` column values
+        no matter how wide the rows are. Rows are inserted with `executemany`, so the chunk size
+        is not bound by SQLite's variable limit."""
+        # Every row has 4 additional internal columns
+        return max(CHUNK_VALUES // (len(self._members) + 4), 1)
+
+
+    def map_partitions(self, func: Callable[[sql.Connection], T]) -> list[T]:
+        """Runs the passed function once per partition with the partition's connection. If the
+        table has a fan-out pool the partitions are processed concurrently, unless a transaction
+        is running, which only covers the connections of the current thread.
+
+        Args:
+            func (Callable[[sql.Connection], T]): Function taking the connection of a partition.
+                Must not return cursors since connections are bound to their thread.
+
+        Returns:
+            list[T]: The results of every partition in partition order.
+        """
+        if self.pool is None or self._partitions == 1 or self.connector.in_transaction:
+            return [func(conn) for conn in self.dbconns]
+        return self.pool.map([
+            lambda i=i: func(self.dbconns[i]) for i in range(self._partitions)
+        ])
 
-        return self._dbconn
+
+    def partition_of(self, key: object) -> int:
+        """Returns the partition a row with the given shard key is routed to.
+        Uses crc32 instead of `hash` so the routing is stable across processes.
+
+        Args:
+            key (object): The shard key. Usually the uid of the row.
+
+        Returns:
+            int: Index of the partition.
+        """
+        if self._partitions == 1:
+            return 0
+        return zlib.crc32(str(key).encode()) % self._partitions
 
 
     def create_table(self):
@@ -77,8 +194,7 @@ class Table:
         Raises:
             DBConnError: If the table does not have a valid connection to any database.
         """
-        self.dbconn.execute(self._create_table_sql())
-        self.dbconn.commit()
+        self._run_ddl([self._create_table_sql(), *self._create_blob_table_sql()])
 
 
     def drop_table(self):
@@ -88,8 +204,7 @@ class Table:
         Raises:
             DBConnError: If the table does not have a valid connection to any database.
         """
-        self.dbconn.execute(self._drop_table_sql())
-        self.dbconn.commit()
+        self._run_ddl([self._drop_table_sql(), f"DROP TABLE IF EXISTS \"{self.blob_table}\";"])
 
 
     def delete_parent_entries(self, parent):
@@ -102,8 +217,90 @@ class Table:
         Raises:
             DBConnError: If the table does not have a valid connection to a database.
         """
-        self.dbconn.execute(f"DELETE FROM \"{self.fqcn}\" WHERE _parent_table_ = '{parent.name}'")
-        self.dbconn.commit()
+        for conn in self.dbconns:
+            conn.execute(f"DELETE FROM \"{self.fqcn}\" WHERE _parent_table_ = '{parent.name}'")
+            conn.commit()
+
+
+    def write_blob(self, blob: Blob, uid: str, member: str, partition: int) -> int:
+        """Copies the content of the blob into the side table in chunks and binds the blob to the
+        stored value. A previously stored value of the member is replaced.
+
+        Args:
+            blob (Blob): The blob to store. Stored blobs are copied from their start.
+            uid (str): The uid of the owning row.
+            member (str): The name of the member.
+            partition (int): The partition of the owning row.
+
+        Returns:
+            int: The size of the blob, which is stored in the member's column.
+        """
+        if blob.key == (self.fqcn, uid, member):
+            return len(blob)
+        conn = self.dbconns[partition]
+        conn.execute(
+            f"DELETE FROM \"{self.blob_table}\" WHERE owner = ? AND member = ?;", [uid, member]
+        )
+        rowid = conn.execute(
+            f"INSERT INTO \"{self.blob_table}\" VALUES (?, ?, zeroblob(?));",
+            [uid, member, len(blob)]
+        ).lastrowid
+
+        if blob.stored:
+            blob.seek(0)
+        schema = self.connector.schema_name(self.db_paths[partition], self._partitions == 1)
+        with conn.blobopen(self.blob_table, "data", rowid, name=schema) as handle: # type: ignore
+            for chunk in iter(lambda: blob.read(CHUNK_SIZE), b""):
+                handle.write(chunk)
+        blob._bind((self.fqcn, uid, member), len(blob), self.blob_opener(uid, member))
+        return len(blob)
+
+
+    def blob_opener(self, uid: str, member: str) -> BlobOpener:
+        """Returns a function opening the stored value of a `Blob` member on the current thread's
+        connection. The location of the value is looked up on first use.
+
+        Args:
+            uid (str): The uid of the owning row.
+            member (str): The name of the member.
+
+        Returns:
+            BlobOpener: Function taking whether the value is opened read-only.
+        """
+        location: list[int] = []
+
+        def opener(readonly: bool) -> "sql.Blob":
+            if not location:
+                stmt = f"SELECT rowid FROM \"{self.blob_table}\" WHERE owner = ? AND member = ?;"
+                for partition, conn in enumerate(self.dbconns):
+                    row = conn.execute(stmt, [uid, member]).fetchone()
+                    if row is not None:
+                        location.extend((partition, row[0]))
+                        break
+                else:
+                    raise FileNotFoundError(f"Stored value of {self.fqcn}.{member} was deleted!")
+            partition, rowid = location
+            schema = self.connector.schema_name(self.db_paths[partition], self._partitions == 1)
+            return self.dbconns[partition].blobopen( # type: ignore
+                self.blob_table, "data", rowid, readonly=readonly, name=schema
+            )
+        return opener
+
+
+    def _run_ddl(self, stmts: list[str]):
+        """Runs the statements creating or dropping the table on every db file. Attached
+        connections cannot be used since unqualified table definitions end up in their in-memory
+        main database, so dedicated connections are opened and closed again."""
+        dedicated = self.connector.attach
+        for i, path in enumerate(self.db_paths):
+            conn = self.connector.connect_file(path) if dedicated else self.dbconns[i]
+            try:
+                for stmt in stmts:
+                    conn.execute(stmt)
+                conn.commit()
+            finally:
+                if dedicated:
+                    conn.close()
 
 
     def _create_table_sql(self) -> str:
@@ -119,43 +316,26 @@ _parent_table_ TEXT,_expires_ REAL,"
         return sql[:-1] + ");"
 
 
+    def _create_blob_table_sql(self) -> list[str]:
+        """Returns the SQL statements creating the side table of `Blob` members. Stored values are
+        removed together with their owning row."""
+        if not self.blob_members:
+            return []
+        return [
+            f"CREATE TABLE IF NOT EXISTS \"{self.blob_table}\" (owner TEXT NOT NULL,\
+member TEXT NOT NULL,data BLOB NOT NULL);",
+            f"CREATE INDEX IF NOT EXISTS \"{self.blob_table}.owner\" ON \"{self.blob_table}\" \
+(owner, member);",
+            f"CREATE TRIGGER IF NOT EXISTS \"{self.blob_table}.delete\" AFTER DELETE ON \
+\"{self.fqcn}\" BEGIN DELETE FROM \"{self.blob_table}\" WHERE owner = OLD._uid_; END;",
+        ]
+
+
     def _drop_table_sql(self) -> str:
         """Returns the drop table sql for this table."""
         return f"DROP TABLE IF EXISTS \"{self.fqcn}\";"
 
 
-    def _create_dbconn(self) -> sql.Connection:
-        """Static method for creating a new database connection with standard performance boosting
-            pragmas.
-
-        Args:
-            path (Path): The path to the database file.
-
-        Returns:
-            Connection: A new connection object.
-        """
-        conn = sql.connect(
-            self.base_path / (self.base_type.__name__ + ".db")
-                if self._sharded
-                else self.base_path / "pyodb.db",
-            check_same_thread=True,
-            isolation_level="IMMEDIATE"
-        )
-        try:
-            # conn.execute("pragma journal_mode = WAL;")
-            conn.execute("pragma synchronous = normal;")
-            conn.execute("pragma page_size = 4096;")
-            conn.commit()
-        except sql.OperationalError:
-            # These pragmas are only for performance
-            # They may fail because the database is locked or because they are not supported
-            # it is not critical in any case
-            print("PyODB WARNING: Could not set database performance pragmas.")
-
-        conn.row_factory = sql.Row
-        return conn
-
-
     def __repr__(self) -> str:
         return f"{self.base_type.__name__}: \
 { {k: str(t) if isinstance(t, UnionType) else t.__name__ for k, t in self._members.items()} };"
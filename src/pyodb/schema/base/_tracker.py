@@ -0,0 +1,102 @@
+"""Module keeping track of the rows loaded and saved objects are stored in.
+"""
+import weakref
+from typing import Sequence
+
+
+class Tracker:
+    """Remembers the row values of loaded and saved objects without modifying the objects. Entries
+    are removed once the object is garbage collected. Objects which do not support weak references
+    (like pydantic models) are not tracked.
+
+    The row values are stored in column order: `_uid_`, `_parent_`, `_parent_table_`, `_expires_`
+    followed by the members of the table.
+
+    Loaded objects are only tracked if `track_loaded` is set and saved objects only if
+    `track_saved` is set, since tracking every selected or saved object is not free.
+    """
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[weakref.ref, tuple, int]] = {}
+        # Entries remembered before the last invalidation are stale
+        self._epoch = 0
+        self.track_loaded = False
+        self.track_saved = False
+
+
+    def track(self, obj: object, vals: Sequence):
+        """Remembers the row values of the object.
+
+        Args:
+            obj (object): The loaded or saved object.
+            vals (Sequence): The values of the object's row.
+        """
+        key = id(obj)
+        try:
+            ref = weakref.ref(obj, lambda ref: self._forget(key, ref))
+        except TypeError:
+            return
+        self._entries[key] = (ref, tuple(vals), self._epoch)
+
+
+    def track_load(self, obj: object, vals: Sequence):
+        """Remembers the row values of a loaded object in case `track_loaded` is set.
+
+        Args:
+            obj (object): The loaded object.
+            vals (Sequence): The values of the object's row.
+        """
+        if self.track_loaded:
+            self.track(obj, vals)
+
+
+    def track_save(self, obj: object, vals: Sequence):
+        """Remembers the row values of a saved object in case `track_saved` is set.
+
+        Args:
+            obj (object): The saved object.
+            vals (Sequence): The values of the object's row.
+        """
+        if self.track_saved:
+            self.track(obj, vals)
+
+
+    def get(self, obj: object) -> tuple | None:
+        """Returns the row values of the object.
+
+        Args:
+            obj (object): The object to look up.
+
+        Returns:
+            tuple | None: The row values or None if the object is not tracked.
+        """
+        entry = self._entries.get(id(obj))
+        if entry is None or entry[0]() is not obj:
+            return None
+        return entry[1]
+
+
+    def is_stale(self, obj: object) -> bool:
+        """Whether the remembered row values of the object were invalidated. Only the uid of
+        stale row values is reliable.
+
+        Args:
+            obj (object): The tracked object.
+
+        Returns:
+            bool: True if the row may have changed since it was remembered.
+        """
+        entry = self._entries.get(id(obj))
+        return entry is not None and entry[2] != self._epoch
+
+
+    def invalidate(self):
+        """Marks the row values of all tracked objects as stale. Called after rows were changed
+        without their objects, like by set-based updates."""
+        self._epoch += 1
+
+
+    def _forget(self, key: int, ref: weakref.ref):
+        # The id may already be reused by a newer object
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is ref:
+            del self._entries[key]
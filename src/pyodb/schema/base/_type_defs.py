@@ -1,5 +1,11 @@
+from array import array
 from types import UnionType
 
+from pyodb.blob import Blob
+
+# Separates the type from the uid in references to shared objects
+REF_SEPARATOR = "@"
+
 BASE_TYPE_SQL_MAP: dict[type | UnionType, str] = {
     int: "INTEGER NOT NULL",
     float: "REAL NOT NULL",
@@ -13,6 +19,11 @@ BASE_TYPE_SQL_MAP: dict[type | UnionType, str] = {
     tuple: "BLOB NOT NULL",
     bytes: "BLOB NOT NULL",
     bytearray: "BLOB NOT NULL",
+    # Blobs are stored in a side table, the column holds their size
+    Blob: "INTEGER NOT NULL",
+    # Packed numeric sequences
+    array: "BLOB NOT NULL",
+    memoryview: "BLOB NOT NULL",
     int | None: "INTEGER",
     float | None: "REAL",
     complex | None: "TEXT",
@@ -25,6 +36,9 @@ BASE_TYPE_SQL_MAP: dict[type | UnionType, str] = {
     tuple | None: "BLOB",
     bytes | None: "BLOB",
     bytearray | None: "BLOB",
+    Blob | None: "INTEGER",
+    array | None: "BLOB",
+    memoryview | None: "BLOB",
 }
 CONTAINERS: list[type] = [
     list, set, frozenset,
@@ -1,14 +1,48 @@
+from functools import partial
 from pathlib import Path
 
+from pyodb._util import FanOutPool
 from pyodb.schema._base_schema import BaseSchema
+from pyodb.schema.base._connector import Connector
 from pyodb.schema.base._operators import Disassembler
 from pyodb.schema.base._table import Table
 
 
 class ShardSchema(BaseSchema):
-    def __init__(self, base_path: Path, max_depth: int, persistent: bool) -> None:
+    """Schema which stores every type in it's own db file. The rows of every type may additionally
+    be hash-partitioned across multiple db files. Queries on independent files are run concurrently
+    on a thread pool.
+
+    Args:
+        base_path (Path): The path to the database folder.
+        max_depth (int): The maximum depth to which nested objects are inserted into the database.
+        persistent (bool): If True, the schema instance will be saved to disk upon exit.
+        partitions (int, optional): Number of db files each new type is spread across. Types
+            loaded from the saved schema keep the partition count they were created with.
+            Defaults to 1.
+        attach (bool, optional): Whether to attach all db files to one connection per thread, so
+            writes of nested objects and cascading deletes run in one transaction across files.
+            Partitioned tables are never attached. Defaults to False.
+    """
+    def __init__(
+            self,
+            base_path: Path,
+            max_depth: int,
+            persistent: bool,
+            partitions: int = 1,
+            attach: bool = False
+        ) -> None:
+        if partitions < 1:
+            raise ValueError("partitions must be >= 1!")
         Disassembler.sharded = True
+        self._partitions = partitions
+        # Partition counts of the types loaded from the saved schema
+        self._loaded_partitions: dict[type, int] = {}
+        self._pool = FanOutPool()
+        # All db files of the schema, including those of tables forgotten after a rollback
+        self._files: set[Path] = set()
         super().__init__(base_path, max_depth, persistent)
+        self._connector = Connector(attach)
 
 
     def add_type(self, base_type: type):
@@ -16,14 +50,30 @@ class ShardSchema(BaseSchema):
         for ttype, members in ttypes.items():
             if self.is_known_type(ttype):
                 continue
-            self._tables[ttype] = Table(ttype, self._base_path, members, True)
+            # The schema definitions are never partitioned so they can always be re-loaded
+            partitions = 1 if ttype is Table else self._loaded_partitions.get(
+                ttype, self._partitions
+            )
+            self._tables[ttype] = Table(ttype, self._base_path, members, True, partitions)
+            self._tables[ttype].connector = self._connector
+            for path in self._tables[ttype].db_paths:
+                self._connector.register(path, partitions == 1)
+                self._files.add(path)
+            self._tables[ttype].blobs = self._blobs
+            self._tables[ttype].serializer = self._serializer
+            self._tables[ttype].tracker.track_loaded = self._track_loaded
+            self._tables[ttype].tracker.track_saved = self._track_saved
+            self._tables[ttype].pool = self._pool
             self._tables[ttype].create_table()
+            # The table may be created within the transaction and then be rolled back with it
+            self._connector.on_rollback(partial(self._tables.pop, ttype, None))
         self._tables[base_type].is_parent = True
 
 
     def load_existing(self) -> None:
-        self.add_type(Table)
-        old_tables: list[Table] = self.select(Table).all()
+        old_tables = self._load_table_defs()
+        # Rows are routed by the partition count, so it must not change once rows are stored
+        self._loaded_partitions.update((table.base_type, table.partitions) for table in old_tables)
         for old_table in old_tables:
             self.add_type(old_table.base_type)
             self._tables[old_table.base_type].is_parent = old_table.is_parent
@@ -37,12 +87,16 @@ class ShardSchema(BaseSchema):
 
 
     def __del__(self):
+        if "_pool" not in vars(self):
+            return # The arguments were invalid
+        self._pool.shutdown()
         if self.is_persistent:
             if self.save_table_defs:
                 self._save_schema()
             return
 
-        for table in self._tables.values():
-            (self._base_path / (table.name + ".db")).unlink(True)
-            (self._base_path / (table.name + ".db-shm")).unlink(True)
-            (self._base_path / (table.name + ".db-wal")).unlink(True)
+        self._blobs.discard_written()
+        for path in self._files:
+            path.unlink(True)
+            path.with_name(path.name + "-shm").unlink(True)
+            path.with_name(path.name + "-wal").unlink(True)
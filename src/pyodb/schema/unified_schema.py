@@ -1,3 +1,5 @@
+from functools import partial
+
 from pyodb.schema._base_schema import BaseSchema
 from pyodb.schema.base._operators import Disassembler
 from pyodb.schema.base._table import Table
@@ -10,14 +12,19 @@ class UnifiedSchema(BaseSchema):
             if self.is_known_type(ttype):
                 continue
             self._tables[ttype] = Table(ttype, self._base_path, members, False)
+            self._tables[ttype].connector = self._connector
+            self._tables[ttype].blobs = self._blobs
+            self._tables[ttype].serializer = self._serializer
+            self._tables[ttype].tracker.track_loaded = self._track_loaded
+            self._tables[ttype].tracker.track_saved = self._track_saved
             self._tables[ttype].create_table()
+            # The table may be created within the transaction and then be rolled back with it
+            self._connector.on_rollback(partial(self._tables.pop, ttype, None))
         self._tables[base_type].is_parent = True
 
 
     def load_existing(self) -> None:
-        self.add_type(Table)
-        old_tables: list[Table] = self.select(Table).all()
-        for old_table in old_tables:
+        for old_table in self._load_table_defs():
             self.add_type(old_table.base_type)
             self._tables[old_table.base_type].is_parent = old_table.is_parent
 
@@ -36,6 +43,7 @@ class UnifiedSchema(BaseSchema):
                 self._save_schema()
             return
 
+        self._blobs.discard_written()
         del self._tables
         (self._base_path / "pyodb.db").unlink(True)
         (self._base_path / "pyodb.db-shm").unlink(True)
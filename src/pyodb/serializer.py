@@ -0,0 +1,144 @@
+"""Serializers for containers and objects stored past the max depth. Serialized values are tagged
+with their format, so the serializer can be changed without breaking existing rows.
+"""
+import json
+import lzma
+import marshal
+import pickle
+import zlib
+from typing import Any, Callable
+
+# Tagged values start with a null byte. Untagged values are plain pickles, which never do.
+_MAGIC = b"\x00"
+
+_FORMATS: dict[str, bytes] = {"pickle": b"p", "marshal": b"m", "json": b"j"}
+_COMPRESSIONS: dict[str | None, bytes] = {None: b"n", "zlib": b"z", "lzma": b"x"}
+
+_COMPRESSORS: dict[bytes, Callable[[bytes], bytes]] = {
+    b"n": bytes,
+    b"z": zlib.compress,
+    b"x": lzma.compress,
+}
+_DECOMPRESSORS: dict[bytes, Callable[[bytes], bytes]] = {
+    b"n": bytes,
+    b"z": zlib.decompress,
+    b"x": lzma.decompress,
+}
+_LOADERS: dict[bytes, Callable[[bytes], Any]] = {
+    b"p": pickle.loads,
+    b"m": marshal.loads,
+    b"j": json.loads,
+}
+# Types which are restored exactly by JSON
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _is_json(val: Any) -> bool:
+    """Checks whether JSON restores the value exactly. Only lists, dictionaries with string keys
+    and scalars qualify, subclasses do not. Cyclic values do not qualify either."""
+    stack, seen = [val], set()
+    while stack:
+        item = stack.pop()
+        type_ = type(item)
+        if type_ in (list, dict):
+            if id(item) in seen:
+                return False
+            seen.add(id(item))
+        if type_ is list:
+            stack += item
+        elif type_ is dict:
+            if any(type(key) is not str for key in item):
+                return False
+            stack += item.values()
+        elif type_ not in _JSON_SCALARS:
+            return False
+    return True
+
+
+def loads(data: bytes | memoryview) -> Any:
+    """Deserializes a value written by any serializer. Untagged values are read as pickle.
+
+    Args:
+        data (bytes | memoryview): The stored value.
+
+    Returns:
+        Any: The deserialized value.
+    """
+    if data[:1] != _MAGIC:
+        return pickle.loads(data)
+    return _LOADERS[bytes(data[1:2])](_DECOMPRESSORS[bytes(data[2:3])](data[3:]))
+
+
+class Serializer:
+    """Converts containers and objects stored past the max depth into bytes.
+
+    - `pickle` supports everything picklable.
+    - `marshal` is faster for plain data built of primitives, lists, tuples, sets and dicts.
+    - `json` is portable but only keeps JSON types. Top-level tuples are restored by the member's
+        annotation. Dictionary keys must be strings.
+
+    Values the format cannot represent exactly, like nested tuples or non-string keys in JSON, are
+    pickled instead. Serialized values of at least `threshold` bytes are compressed.
+
+    Args:
+        format (str, optional): "pickle", "marshal" or "json". Defaults to "pickle".
+        compression (str | None, optional): None, "zlib" or "lzma". Defaults to None.
+        threshold (int, optional): Minimum size in bytes of compressed values. Defaults to 1024.
+        protocol (int, optional): The pickle protocol. Defaults to `pickle.HIGHEST_PROTOCOL`.
+
+    Raises:
+        ValueError: In case the format or compression is unknown.
+    """
+    def __init__(
+            self,
+            format: str = "pickle",
+            compression: str | None = None,
+            threshold: int = 1024,
+            protocol: int = pickle.HIGHEST_PROTOCOL
+        ) -> None:
+        if format not in _FORMATS:
+            raise ValueError(f"Unknown format '{format}'! Use one of {list(_FORMATS)}")
+        if compression not in _COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression '{compression}'! Use one of {list(_COMPRESSIONS)}"
+            )
+        self.format = format
+        self.compression = compression
+        self.threshold = threshold
+        self.protocol = protocol
+
+
+    def dumps(self, val: Any) -> bytes:
+        """Serializes the value.
+
+        Args:
+            val (Any): The value to serialize.
+
+        Returns:
+            bytes: The tagged value.
+        """
+        tag = _FORMATS[self.format]
+        try:
+            if self.format == "marshal":
+                data = marshal.dumps(val)
+            elif self.format == "json":
+                if not _is_json(list(val) if type(val) is tuple else val):
+                    raise TypeError(f"JSON cannot represent {type(val)} exactly")
+                data = json.dumps(val, separators=(",", ":")).encode()
+            else:
+                data = pickle.dumps(val, self.protocol)
+        except (TypeError, ValueError):
+            tag, data = b"p", pickle.dumps(val, self.protocol)
+
+        compression = _COMPRESSIONS[self.compression if len(data) >= self.threshold else None]
+        return _MAGIC + tag + compression + _COMPRESSORS[compression](data)
+
+
+    @staticmethod
+    def loads(data: bytes | memoryview) -> Any:
+        """See `pyodb.serializer.loads`"""
+        return loads(data)
+
+
+    def __repr__(self) -> str:
+        return f"Serializer({self.format!r}, {self.compression!r}, {self.threshold})"
@@ -0,0 +1,122 @@
+import asyncio
+import gc
+import threading
+from test.test_models.complex_models import ComplexBasic
+from test.test_models.primitive_models import PrimitiveBasic
+from unittest import IsolatedAsyncioTestCase
+
+from pyodb.async_pyodb import AsyncPyODB, AsyncPyODBCache
+
+
+class Abort(BaseException):
+    pass
+
+
+class AsyncPyODBTest(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.odb = AsyncPyODB(sharding=True, max_workers=4)
+        return super().setUp()
+
+
+    async def asyncTearDown(self) -> None:
+        await self.odb.aclose()
+        del self.odb
+        # Errors of failed saves keep the instance alive in reference cycles
+        gc.collect()
+        return await super().asyncTearDown()
+
+
+    async def test_save_select(self):
+        objs = [PrimitiveBasic() for _ in range(20)]
+        await asyncio.gather(*(self.odb.save(obj) for obj in objs))
+
+        self.assertEqual(await self.odb.select(PrimitiveBasic).count(), 20)
+        res = await self.odb.select(PrimitiveBasic).eq(integer=objs[3].integer).first()
+        self.assertEqual(res.integer, objs[3].integer)
+        self.assertEqual(len(await self.odb.select(PrimitiveBasic).limit(5).all()), 5)
+
+
+    async def test_save_error(self):
+        await self.odb.add_type(PrimitiveBasic)
+        good = PrimitiveBasic()
+        res = await asyncio.gather(
+            self.odb.save(good), self.odb.save(PrimitiveBasic(), -1), return_exceptions=True
+        )
+        self.assertIsNone(res[0])
+        self.assertIsInstance(res[1], Exception)
+        self.assertEqual(await self.odb.select(PrimitiveBasic).count(), 1)
+
+
+    async def test_save_error_new_type(self):
+        odb = AsyncPyODB(max_workers=1)
+        await odb.add_type(PrimitiveBasic)
+        res = await asyncio.gather(
+            odb.save(PrimitiveBasic()), odb.save(ComplexBasic()), odb.save(PrimitiveBasic(), -1),
+            return_exceptions=True
+        )
+        self.assertEqual(res[:2], [None, None])
+        self.assertIsInstance(res[2], Exception)
+
+        # The tables of the new type are kept although the batch adding it failed
+        await odb.save(ComplexBasic())
+        self.assertEqual(await odb.select(ComplexBasic).count(), 2)
+        await odb.aclose()
+        del odb, res
+
+
+    async def test_aiter_delete(self):
+        await self.odb.add_type(ComplexBasic)
+        await self.odb.save_multiple([ComplexBasic() for _ in range(25)])
+
+        objs = [obj async for obj in self.odb.select(ComplexBasic).aiter(10)]
+        self.assertEqual(len(objs), 25)
+        self.assertIsInstance(objs[0], ComplexBasic)
+
+        self.assertEqual(await self.odb.delete(ComplexBasic).commit(), 25)
+        self.assertEqual(await self.odb.select(ComplexBasic).count(), 0)
+
+
+    async def test_aiter_stop(self):
+        odb = AsyncPyODB(sharding=True, partitions=3, max_workers=1)
+        await odb.save_multiple([PrimitiveBasic() for _ in range(50)])
+        async for _ in odb.select(PrimitiveBasic).aiter(5):
+            break
+
+        # The single worker thread is released by the stopped iteration
+        objs = [obj async for obj in odb.select(PrimitiveBasic).limit(12, 20).aiter(5)]
+        self.assertEqual(len(objs), 12)
+        self.assertEqual(await odb.select(PrimitiveBasic).count(), 50)
+        with self.assertRaises(ValueError):
+            [obj async for obj in odb.select(PrimitiveBasic).aiter(0)]
+        await odb.aclose()
+        del odb
+
+
+    async def test_batch_base_exception(self):
+        def abort(batch):
+            raise Abort()
+        self.odb._write_batch = abort
+        res = await asyncio.gather(
+            self.odb.save(PrimitiveBasic()), self.odb.save(PrimitiveBasic()), return_exceptions=True
+        )
+        self.assertIsInstance(res[0], Abort)
+        self.assertIsInstance(res[1], Abort)
+        await asyncio.wait_for(self.odb.aclose(), 5)
+
+
+class AsyncPyODBCacheTest(IsolatedAsyncioTestCase):
+    async def test_get_data(self):
+        calls = []
+
+        def data_func():
+            calls.append(threading.current_thread().name)
+            return [PrimitiveBasic() for _ in range(10)]
+
+        async with AsyncPyODBCache() as cache:
+            await cache.add_cache("test", data_func, PrimitiveBasic)
+            res = await asyncio.gather(*(cache.get_data("test") for _ in range(5)))
+
+            self.assertEqual(len(calls), 1)
+            self.assertTrue(calls[0].startswith("pyodb-async"))
+            self.assertTrue(all(len(data) == 10 for data in res))
+            self.assertEqual(len(await cache.get_data("test")), 10)
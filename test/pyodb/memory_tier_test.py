@@ -0,0 +1,74 @@
+from time import time
+from unittest import TestCase
+
+from pyodb._memory_tier import MemoryTier, approximate_size
+
+
+class _Obj:
+    def __init__(self, payload: str) -> None:
+        self.payload = payload
+
+
+class MemoryTierTest(TestCase):
+    def test_approximate_size(self):
+        small = approximate_size([_Obj("a")])
+        large = approximate_size([_Obj("a" * 10000)])
+        self.assertGreater(large - small, 9000)
+
+        shared = _Obj("a" * 10000)
+        self.assertLess(approximate_size([shared, shared]), 2 * approximate_size([shared]))
+
+
+    def test_lru(self):
+        tier = MemoryTier(max_entries=2)
+        expires = time() + 60
+        tier.put("a", 1, expires)
+        tier.put("b", 2, expires)
+        tier.get("a")
+        tier.put("c", 3, expires)
+        self.assertEqual(tier.keys(), ["a", "c"])
+        self.assertEqual(tier.evictions, 1)
+
+
+    def test_lfu(self):
+        tier = MemoryTier(max_entries=2, eviction="lfu")
+        expires = time() + 60
+        tier.put("a", 1, expires)
+        tier.put("b", 2, expires)
+        tier.get("a")
+        tier.get("a")
+        tier.get("b")
+        tier.put("c", 3, expires)
+        self.assertEqual(sorted(tier.keys()), ["a", "c"])
+
+
+    def test_max_bytes(self):
+        tier = MemoryTier(max_bytes=30000)
+        expires = time() + 60
+        tier.put("a", "a" * 20000, expires)
+        tier.put("b", "b" * 20000, expires)
+        self.assertEqual(tier.keys(), ["b"])
+        self.assertLessEqual(tier.size, 30000)
+
+        # Entries exceeding the budget on their own are not stored
+        tier.put("c", "c" * 40000, expires)
+        self.assertNotIn("c", tier)
+        self.assertIn("b", tier)
+
+
+    def test_expiry(self):
+        tier = MemoryTier()
+        tier.put("a", 1, time() - 1, time() + 60)
+        self.assertIsNone(tier.get("a"))
+        self.assertEqual(tier.get("a", stale=True)[0], 1)
+
+        tier.put("b", 2, time() - 2, time() - 1)
+        tier.put("c", 3, time() + 60)
+        self.assertNotIn("b", tier)
+        self.assertIn("a", tier)
+
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, MemoryTier, eviction="fifo")
+        self.assertRaises(ValueError, MemoryTier, max_entries=0)
+        self.assertRaises(ValueError, MemoryTier, max_bytes=0)
@@ -0,0 +1,73 @@
+import os
+import pickle
+import subprocess
+import sys
+from array import array
+from importlib.util import find_spec
+from unittest import TestCase, skipIf
+
+from pyodb.error import BadTypeError
+from pyodb.packed import is_packed, pack, to_numpy, unpack
+
+
+class PackedTest(TestCase):
+    def test_round_trip(self):
+        for typecode in "bBhHiIlLqQfd":
+            arr = array(typecode, range(10))
+            self.assertEqual(unpack(pack(arr), array), arr)
+            self.assertEqual(unpack(pack(memoryview(arr)), memoryview).tolist(), arr.tolist())
+        self.assertEqual(unpack(pack([1, 2, 3]), array).typecode, "q")
+        self.assertEqual(unpack(pack((1, 2.5)), array), array("d", [1, 2.5]))
+
+
+    def test_zero_copy(self):
+        data = pack(array("d", [1.5, 2.5]))
+        view = unpack(data, memoryview)
+        self.assertTrue(view.readonly)
+        self.assertEqual(view.format, "d")
+        self.assertIs(view.obj, data)
+
+
+    def test_byteorder(self):
+        arr = array("i", [1, 2, 3])
+        data = bytearray(pack(arr))
+        swapped = array("i", arr)
+        swapped.byteswap()
+        data[2:3] = b">" if data[2:3] == b"<" else b"<"
+        data[8:] = swapped.tobytes()
+        self.assertEqual(unpack(bytes(data), array), arr)
+        self.assertEqual(unpack(bytes(data), memoryview).tolist(), [1, 2, 3])
+
+
+    def test_legacy(self):
+        self.assertEqual(unpack(pickle.dumps([1.0, 2.0]), array), array("d", [1.0, 2.0]))
+
+
+    def test_invalid(self):
+        self.assertRaises(BadTypeError, pack, ["a", "b"])
+        self.assertRaises(BadTypeError, pack, 1)
+        self.assertTrue(is_packed(array | None))
+        self.assertFalse(is_packed(list))
+
+
+    def test_lazy_numpy(self):
+        # Importing pyodb must not import NumPy
+        res = subprocess.run(
+            [sys.executable, "-c", "import sys, pyodb; print('numpy' in sys.modules)"],
+            capture_output=True, text=True, check=True,
+            env=os.environ | {"PYTHONPATH": os.pathsep.join(sys.path)}
+        )
+        self.assertEqual(res.stdout.strip(), "False")
+
+
+    @skipIf(find_spec("numpy") is not None, "NumPy is installed")
+    def test_to_numpy_missing(self):
+        self.assertRaises(ImportError, to_numpy, array("d"))
+
+
+    @skipIf(find_spec("numpy") is None, "NumPy is not installed")
+    def test_to_numpy(self):
+        import numpy
+        view = unpack(pack(array("d", [1.5, 2.5])), memoryview)
+        self.assertEqual(to_numpy(view).tolist(), [1.5, 2.5])
+        self.assertEqual(unpack(pack(numpy.arange(3)), array).tolist(), [0, 1, 2])
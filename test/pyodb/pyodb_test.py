@@ -1,16 +1,32 @@
 import multiprocessing
+from array import array
+import os
+import shutil
 import random
 import threading
+from io import BytesIO
 from logging import Logger
 from multiprocessing import Process
+from pathlib import Path
 from test.test_models.complex_models import ComplexBasic, ComplexMulti, ComplexPydantic, ComplexTypingModel
 from test.test_models.high_complex_models import HighComplexL3
-from test.test_models.primitive_models import PrimitiveBasic, PrimitiveContainer, PrimitivePydantic
+from test.test_models.primitive_models import (
+    PrimitiveArray,
+    PrimitiveArrayHint,
+    PrimitiveBasic,
+    PrimitiveBinary,
+    PrimitiveContainer,
+    PrimitivePydantic,
+    PrimitiveStream,
+)
 from time import sleep, time
-from unittest import TestCase
+from unittest import TestCase, mock, skipUnless
 
-from pyodb.error import BadTypeError, CacheError, PyODBError
-from pyodb.pyodb import PyODB, PyODBCache
+from pyodb.blob import STREAMING_SUPPORTED, Blob
+from pyodb.error import BadTypeError, CacheError, ExpiryError, PyODBError, PyODBWarning
+from pyodb._util import hash_args
+from pyodb.pyodb import NO_ARGS, PyODB, PyODBCache
+from pyodb.serializer import Serializer
 
 
 class PyODBTest(TestCase):
@@ -69,6 +85,184 @@ class PyODBTest(TestCase):
         self.assertTrue(self.pyodb.contains_type(ComplexMulti))
 
 
+    def test_save_multiple_mixed(self):
+        objs = [PrimitiveBasic(), ComplexMulti(), PrimitiveBasic(), ComplexMulti(), PrimitiveBasic()]
+        self.pyodb.save_multiple(objs)
+        self.assertTrue(self.pyodb.contains_type(ComplexMulti))
+        self.assertEqual(self.pyodb.select(ComplexMulti).count(), 2)
+        self.assertIn(objs[2].integer, [obj.integer for obj in self.pyodb.select(PrimitiveBasic).all()])
+
+        self.assertRaises(Exception, self.pyodb.save_multiple, [PrimitiveBasic(), ComplexMulti()], -1)
+        self.assertEqual(self.pyodb.select(ComplexMulti).count(), 2)
+
+
+    def test_save_iter(self):
+        saved = self.pyodb.save_iter((PrimitiveBasic() for _ in range(25)), chunk_size=10)
+        self.assertEqual(saved, 25)
+        self.assertEqual(self.pyodb.select(PrimitiveBasic).count(), 25)
+
+        saved = self.pyodb.save_iter(ComplexMulti() if i % 2 else PrimitiveBasic() for i in range(10))
+        self.assertEqual(saved, 10)
+        self.assertEqual(self.pyodb.select(ComplexMulti).count(), 5)
+        self.assertGreater(self.pyodb._schema._tables[PrimitiveBasic].chunk_size, 1)
+        self.assertRaises(ValueError, self.pyodb.save_iter, [], chunk_size=0)
+
+
+    def test_blob_store(self):
+        blobs = self.pyodb._schema._blobs.path
+        self.pyodb.blob_threshold = 64
+        self.assertEqual(self.pyodb.blob_threshold, 64)
+        payload = bytes(range(256)) * 4
+        objs = [PrimitiveBinary(payload, b"small"), PrimitiveBinary(payload)]
+        self.pyodb.save_multiple(objs)
+        container = PrimitiveContainer()
+        container.listing = list(range(100))
+        container.dictionary, container.ptuple = {}, None
+        self.pyodb.save(container)
+        self.assertEqual(len(list(blobs.glob("*/*"))), 2)
+
+        row = self.pyodb._schema._tables[PrimitiveBinary].dbconn.execute(
+            "SELECT payload, extra FROM \"test.test_models.primitive_models.PrimitiveBinary\""
+        ).fetchone()
+        self.assertTrue(row[0].startswith("pyodb.blob@"))
+        self.assertEqual(row[1], b"small")
+
+        res = self.pyodb.select(PrimitiveBinary).eq(name=objs[0].name).one()
+        self.assertIsInstance(res.payload, memoryview)
+        self.assertEqual(res.payload, payload)
+        self.assertEqual(res.extra, b"small")
+        self.assertEqual(self.pyodb.select(PrimitiveContainer).one().listing, container.listing)
+
+        self.pyodb.delete(PrimitiveBinary).eq(name=objs[0].name).commit()
+        self.assertEqual(self.pyodb.collect_blobs(), 0)
+        self.pyodb.delete(PrimitiveBinary).commit()
+        self.assertEqual(self.pyodb.collect_blobs(), 1)
+        self.pyodb.clear()
+        self.assertFalse(blobs.exists())
+        self.assertRaises(ValueError, setattr, self.pyodb, "blob_threshold", 0)
+
+
+    def test_shared_blob_folder(self):
+        folder = Path(".pyodb_shared_blobs")
+        keep = PyODB(pyodb_folder=folder, sharding=True, persistent=True, blob_threshold=16)
+        keep.save(PrimitiveBinary(bytes(64)))
+        temp = PyODB(pyodb_folder=folder, sharding=True, load_existing=False, blob_threshold=16)
+        container = PrimitiveContainer()
+        container.listing = list(range(100))
+        container.dictionary, container.ptuple = {}, None
+        temp.save(container)
+        self.assertEqual(len(list((folder / "blobs").glob("*/*"))), 2)
+
+        # Only the blobs written by the non-persistent instance are removed
+        del temp
+        self.assertEqual(len(list((folder / "blobs").glob("*/*"))), 1)
+        self.assertEqual(keep.select(PrimitiveBinary).one().payload, bytes(64))
+        del keep
+        shutil.rmtree(folder)
+
+
+    @skipUnless(STREAMING_SUPPORTED, "Blob members require Python 3.11 or newer")
+    def test_streamed_blobs(self):
+        self.pyodb.track_loaded = True
+        payload = bytes(range(256)) * 1000
+        obj = PrimitiveStream(Blob(BytesIO(payload)), Blob(b"thumb"))
+        self.pyodb.save(obj)
+        self.pyodb.save_multiple([PrimitiveStream(Blob(payload[:10]))])
+        self.assertTrue(obj.data.stored)
+        reader, writer = os.pipe()
+        with open(reader, "rb") as source, open(writer, "wb"):
+            self.assertRaises(ValueError, Blob, source)
+
+        res = self.pyodb.select(PrimitiveStream).eq(data=len(payload)).one()
+        self.assertEqual(len(res.data), len(payload))
+        self.assertEqual(res.data.read(), payload)
+        res.data.seek(-4, 2)
+        self.assertEqual(res.data.read(10), payload[-4:])
+        self.assertEqual(res.thumb.read(), b"thumb")
+
+        res.data.seek(1)
+        res.data.write(b"abc")
+        self.assertRaises(ValueError, res.data.write, bytes(len(payload)))
+        res = self.pyodb.select(PrimitiveStream).eq(name=obj.name).one()
+        self.assertEqual(res.data.read(5), payload[:1] + b"abc" + payload[4:5])
+
+        res.thumb = Blob(b"other")
+        self.pyodb.update(res)
+        res = self.pyodb.select(PrimitiveStream).eq(name=obj.name).one()
+        self.assertEqual(res.thumb.read(), b"other")
+
+        table = self.pyodb._schema._tables[PrimitiveStream]
+        self.pyodb.delete(PrimitiveStream).eq(name=obj.name).commit()
+        self.assertEqual(
+            table.dbconn.execute(f"SELECT COUNT(*) FROM \"{table.blob_table}\"").fetchone()[0], 1
+        )
+        self.assertRaises(FileNotFoundError, res.data.read)
+
+
+    def test_streamed_blobs_unsupported(self):
+        with mock.patch("pyodb.schema.base._operators.STREAMING_SUPPORTED", False):
+            self.assertRaises(BadTypeError, self.pyodb.save, PrimitiveStream(Blob(b"data")))
+        self.assertFalse(self.pyodb.contains_type(PrimitiveStream))
+
+
+    def test_serializer(self):
+        old = PrimitiveContainer()
+        self.pyodb.save(old)
+        self.pyodb.serializer = Serializer("json", "zlib", threshold=0)
+        self.assertEqual(self.pyodb.serializer.format, "json")
+        new = PrimitiveContainer()
+        new.ptuple = (1, 2.5, "three", True)
+        self.pyodb.save(new)
+
+        res = {tuple(obj.listing): obj for obj in self.pyodb.select(PrimitiveContainer).all()}
+        self.assertEqual(res[tuple(old.listing)].dictionary, old.dictionary)
+        self.assertEqual(res[tuple(new.listing)].ptuple, new.ptuple)
+        self.assertIsInstance(res[tuple(new.listing)].pset, set)
+
+        PrimitiveContainer.__odb_serializers__ = {"listing": Serializer("marshal")}
+        try:
+            self.pyodb.save(new)
+            row = self.pyodb._schema._tables[PrimitiveContainer].dbconn.execute(
+                "SELECT listing, dictionary FROM \"test.test_models.primitive_models.PrimitiveContainer\""
+            ).fetchall()[-1]
+            self.assertEqual(row[0][:3], b"\x00mn")
+            self.assertEqual(row[1][:3], b"\x00jz")
+        finally:
+            del PrimitiveContainer.__odb_serializers__
+        self.assertEqual(self.pyodb.select(PrimitiveContainer).count(), 3)
+
+
+    def test_packed_arrays(self):
+        self.pyodb.track_loaded = True
+        obj = PrimitiveArray()
+        other = PrimitiveArray(10)
+        other.floats, other.ints = [1.5, 2.5], None
+        self.pyodb.save(obj)
+        self.pyodb.save_multiple([other])
+
+        res = sorted(self.pyodb.select(PrimitiveArray).all(), key=lambda res: len(res.floats))
+        self.assertEqual(res[0].floats, array("d", [1.5, 2.5]))
+        self.assertIsNone(res[0].ints)
+        self.assertIsInstance(res[1].floats, array)
+        self.assertEqual(res[1].floats, obj.floats)
+        self.assertIsInstance(res[1].ints, memoryview)
+        self.assertEqual(res[1].ints.tolist(), obj.ints.tolist())
+
+        res[0].ints = array("q", [1, 2])
+        self.pyodb.update(res[0])
+        self.assertEqual(self.pyodb.select(PrimitiveArray).eq(ints=None).count(), 0)
+
+        # Lists of members declared packed by `__odb_members__` are packed as well
+        hint = PrimitiveArrayHint()
+        self.pyodb.save(hint)
+        res = self.pyodb.select(PrimitiveArrayHint).one()
+        self.assertEqual(res.samples, array("d", hint.samples))
+        self.assertEqual(res.timestamps.tolist(), hint.timestamps)
+        table = self.pyodb._schema._tables[PrimitiveArrayHint]
+        stored = table.dbconn.execute(f"SELECT samples FROM \"{table.fqcn}\"").fetchone()[0]
+        self.assertEqual(stored[:2], b"\x00a")
+
+
     def test_contains_type(self):
         self.pyodb.add_type(ComplexMulti)
         self.assertTrue(self.pyodb.contains_type(ComplexMulti))
@@ -247,6 +441,100 @@ class ThreadingTest(TestCase):
             del pyodb
 
 
+class WriteBehindTest(TestCase):
+    def setUp(self) -> None:
+        self.pyodb = PyODB(sharding=True)
+        return super().setUp()
+
+
+    def tearDown(self) -> None:
+        del self.pyodb
+        return super().tearDown()
+
+
+    def test_batched_save(self):
+        self.pyodb.enable_write_behind(batch_size=10, interval=10)
+        for _ in range(25):
+            self.pyodb.save(PrimitiveBasic())
+        self.pyodb.save(ComplexBasic())
+
+        self.pyodb.flush()
+        # The ComplexBasic contains one PrimitiveBasic as well
+        self.assertEqual(self.pyodb.select(PrimitiveBasic).count(), 26)
+        self.assertEqual(self.pyodb.select(ComplexBasic).count(), 1)
+
+
+    def test_interval(self):
+        self.pyodb.enable_write_behind(interval=0.01)
+        self.pyodb.save(PrimitiveBasic())
+        sleep(0.3)
+        self.assertEqual(self.pyodb.select(PrimitiveBasic).count(), 1)
+
+        self.pyodb.save(PrimitiveBasic())
+        self.pyodb.disable_write_behind()
+        self.assertEqual(self.pyodb.select(PrimitiveBasic).count(), 2)
+
+
+    def test_error_callback(self):
+        errors = []
+        self.pyodb.enable_write_behind(on_error=lambda err, objs: errors.append((err, objs)))
+        self.assertRaises(ExpiryError, self.pyodb.save, PrimitiveBasic(), -1)
+
+        # Only the failing object of the batch is reported
+        obj = PrimitiveContainer()
+        obj.listing = [lambda: "not picklable"]
+        self.pyodb.save(obj)
+        self.pyodb.save(PrimitiveContainer())
+        self.pyodb.flush()
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][1], [obj])
+        self.assertEqual(self.pyodb.select(PrimitiveContainer).count(), 1)
+
+
+    def test_error_warning(self):
+        obj = PrimitiveContainer()
+        obj.listing = [lambda: "not picklable"]
+        self.pyodb.enable_write_behind()
+        with self.assertWarns(PyODBWarning):
+            self.pyodb.save(obj)
+            self.pyodb.flush()
+
+        def failing_callback(err, objs):
+            raise ValueError()
+        self.pyodb.enable_write_behind(on_error=failing_callback)
+        with self.assertWarns(PyODBWarning):
+            self.pyodb.save(obj)
+            self.pyodb.flush()
+
+
+    def test_flush_stopped_writer(self):
+        self.pyodb.enable_write_behind()
+        write_behind = self.pyodb._write_behind
+        write_behind.close()
+        self.assertRaises(RuntimeError, self.pyodb.save, PrimitiveBasic())
+
+        # Objects queued before the thread stopped are never written
+        write_behind._queue.put((PrimitiveBasic(), None))
+        self.assertRaises(RuntimeError, self.pyodb.flush)
+        self.pyodb._write_behind = None
+
+
+WARM_CALLS: list[int] = []
+
+
+def warm_data(amount: int) -> list[PrimitiveBasic]:
+    WARM_CALLS.append(amount)
+    return [PrimitiveBasic() for _ in range(amount)]
+
+
+def shared_memory_job(queue: multiprocessing.Queue):
+    cache = PyODBCache(persistent=True, shared_memory=True)
+    cache.add_cache("shared", lambda amount: [], PrimitiveBasic)
+    data = cache.get_data("shared", 3)
+    queue.put(([pb.integer for pb in data], cache.stats("shared")["shared"]["shared_hits"]))
+
+
 class PyODBCacheTest(TestCase):
     def setUp(self) -> None:
         self.cache = PyODBCache()
@@ -344,6 +632,345 @@ class PyODBCacheTest(TestCase):
         del cache2
 
 
+    def test_argument_keys(self):
+        self.cache.add_cache(
+            "param_test",
+            lambda amount, prefix="": [PrimitiveBasic() for _ in range(amount)],
+            PrimitiveBasic,
+            lifetime=1
+        )
+        self.assertEqual(len(self.cache.get_data("param_test", amount=5)), 5)
+        self.assertEqual(len(self.cache.get_data("param_test", amount=50)), 50)
+        self.assertEqual(len(self.cache.get_data("param_test", 7, prefix="a")), 7)
+        self.assertEqual(len([key for key in self.cache.memory.keys() if key[0] == "param_test"]), 3)
+
+        # Entries are loaded from the database by their arguments
+        cache2 = PyODBCache()
+        cache2.add_cache("param_test", lambda amount: [], PrimitiveBasic, lifetime=1)
+        self.assertEqual(len(cache2.get_data("param_test", amount=50)), 50)
+        self.assertEqual(len(cache2.get_data("param_test", amount=5)), 5)
+
+        # Entries expire independently
+        memory = self.cache.memory
+        first, second = [key for key in memory.keys() if key[0] == "param_test"][:2]
+        memory.set_expiry(first, 0)
+        before = memory.get(second)
+        self.assertEqual(len(self.cache.get_data("param_test", amount=5)), 5)
+        self.assertGreater(memory.get(first)[1], 0)
+        self.assertEqual(memory.get(second), before)
+        del cache2
+
+
+    def test_single_flight_refresh(self):
+        calls = []
+        def slow_data():
+            calls.append(1)
+            sleep(0.3)
+            return [PrimitiveBasic() for _ in range(10)]
+
+        caches = [PyODBCache() for _ in range(4)]
+        for cache in caches:
+            cache.add_cache("slow", slow_data, PrimitiveBasic, lifetime=5)
+        results = [None] * len(caches)
+        def load(i):
+            results[i] = caches[i]["slow"]
+        threads = [threading.Thread(target=load, args=(i,)) for i in range(len(caches))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([len(res) for res in results], [10] * len(caches))
+
+        # Instances not holding the lease serve their expired data
+        caches[0].pyodb.clear()
+        caches[0].caches["slow"].expires = 0
+        lease = caches[1].caches["slow"].lease
+        self.assertTrue(lease.acquire(NO_ARGS, "other", 5))
+        self.assertIs(caches[0]["slow"], results[0])
+        self.assertFalse(caches[1].caches["slow"].lease.acquire(NO_ARGS, "another", 5))
+        lease.release(NO_ARGS, "other")
+        self.assertEqual(len(calls), 1)
+        del caches
+
+
+    def test_memory_bounds(self):
+        cache = PyODBCache(max_entries=2)
+        calls = []
+        def data(amount):
+            calls.append(amount)
+            return [PrimitiveBasic() for _ in range(amount)]
+        cache.add_cache("bounded", data, PrimitiveBasic)
+
+        for amount in (1, 2, 3):
+            cache.get_data("bounded", amount)
+        self.assertEqual(len(cache.memory), 2)
+        self.assertEqual(cache.memory.evictions, 1)
+        self.assertNotIn(("bounded", hash_args((1,), {})), cache.memory)
+
+        # Evicted entries are reloaded from the database
+        self.assertEqual(len(cache.get_data("bounded", 1)), 1)
+        self.assertEqual(calls, [1, 2, 3])
+        self.assertIn(("bounded", hash_args((1,), {})), cache.memory)
+        self.assertNotIn(("bounded", hash_args((2,), {})), cache.memory)
+
+        # Entries are accounted by their approximate size
+        size = cache.memory.size
+        cache.memory.clear()
+        self.assertGreater(size, 0)
+        self.assertEqual(cache.memory.size, 0)
+        del cache
+
+
+    def test_stale_while_revalidate(self):
+        calls = []
+        def slow_data():
+            calls.append(1)
+            sleep(0.3)
+            return [PrimitiveBasic() for _ in range(len(calls))]
+        self.cache.add_cache("stale", slow_data, PrimitiveBasic, lifetime=0.5, stale_ttl=5)
+
+        first = self.cache["stale"]
+        self.assertEqual(len(first), 1)
+        sleep(0.6)
+
+        # Stale data is returned immediately while being refreshed in the background
+        start = time()
+        self.assertIs(self.cache["stale"], first)
+        self.assertIs(self.cache["stale"], first)
+        self.assertLess(time() - start, 0.25)
+
+        deadline = time() + 5
+        while self.cache.caches["stale"].get_data() is None and time() < deadline:
+            sleep(0.05)
+        self.assertEqual(len(self.cache["stale"]), 2)
+        self.assertEqual(len(calls), 2)
+        while self.cache._refreshing:
+            sleep(0.05)
+        self.assertEqual(self.cache.stats("stale")["stale"]["refreshes"], 1)
+
+        # Stale rows are served from the database as well
+        self.cache.memory.clear()
+        sleep(0.6)
+        self.assertEqual(len(self.cache["stale"]), 2)
+        while self.cache._refreshing:
+            sleep(0.05)
+        self.assertEqual(len(calls), 3)
+
+
+    def test_failed_background_refresh(self):
+        calls = []
+        def failing_data():
+            calls.append(1)
+            if len(calls) > 1:
+                raise ValueError("unavailable")
+            return [PrimitiveBasic()]
+        self.cache.add_cache("failing", failing_data, PrimitiveBasic, lifetime=0.2, stale_ttl=5)
+        first = self.cache["failing"]
+        sleep(0.3)
+
+        with self.assertWarns(PyODBWarning):
+            self.assertIs(self.cache["failing"], first)
+            while self.cache._refreshing:
+                sleep(0.05)
+        self.assertEqual(len(calls), 2)
+
+
+    def test_cross_instance_invalidation(self):
+        first = self.cache["test"]
+        self.assertIs(self.cache["test"], first)
+
+        other = PyODBCache()
+        other.add_cache("test", lambda: [PrimitiveBasic() for _ in range(3)], PrimitiveBasic)
+        self.assertEqual(len(other["test"]), 10)
+        other.clear("test")
+        self.assertEqual(len(other["test"]), 3)
+
+        # The in-memory data was dropped since the other instance changed the cache
+        self.assertEqual(len(self.cache["test"]), 3)
+        self.assertEqual(self.cache.caches["test"].version, other.caches["test"].version)
+        self.assertRaises(CacheError, other.clear, "unknown")
+
+        # Unrelated writes do not invalidate the in-memory data
+        data2 = self.cache["test2"]
+        other.pyodb.save(PrimitiveBasic())
+        self.assertIs(self.cache["test2"], data2)
+        del other
+
+
+    def test_blob_storage(self):
+        self.cache.add_cache(
+            "blob",
+            lambda amount: [PrimitiveBasic() for _ in range(amount)],
+            PrimitiveBasic,
+            storage="blob",
+            serializer=Serializer(compression="zlib", threshold=1)
+        )
+        data = self.cache.get_data("blob", 20)
+        self.assertEqual(self.cache.pyodb.select(self.cache.caches["blob"].dataclass).count(), 1)
+
+        other = PyODBCache()
+        other.add_cache("blob", lambda amount: [], PrimitiveBasic, storage="blob")
+        loaded = other.get_data("blob", 20)
+        self.assertEqual([pb.integer for pb in loaded], [pb.integer for pb in data])
+        self.assertIsInstance(loaded[0], PrimitiveBasic)
+
+        # Switching the storage recreates the cache table
+        other.add_cache("blob", lambda amount: [PrimitiveBasic()], PrimitiveBasic, force=True)
+        self.assertEqual(other.caches["blob"].storage, "rows")
+        self.assertEqual(len(other.get_data("blob", 20)), 1)
+        self.assertRaises(ValueError, other.add_cache, "x", list, PrimitiveBasic, storage="file")
+        del other
+
+
+    def test_cached_decorator(self):
+        calls = []
+
+        @self.cache.cached(lifetime=5)
+        def lookup(name: str, scale: int = 1) -> dict[str, int] | None:
+            calls.append(name)
+            return {name: len(name) * scale} if name else None
+
+        self.assertEqual(lookup("abc"), {"abc": 3})
+        self.assertEqual(lookup("abc"), {"abc": 3})
+        self.assertEqual(lookup("abc", scale=2), {"abc": 6})
+        self.assertIsNone(lookup(""))
+        self.assertIsNone(lookup(""))
+        self.assertEqual(calls, ["abc", "abc", ""])
+        self.assertEqual(lookup.__name__, "lookup")
+
+        info = lookup.cache_info()
+        self.assertEqual((info.hits, info.misses, info.lifetime, info.size), (2, 3, 5, 3))
+
+        lookup.cache_clear()
+        self.assertEqual(lookup("abc"), {"abc": 3})
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(lookup.cache_info().size, 1)
+        self.assertRaises(CacheError, self.cache.cache_info, "unknown")
+
+
+    def test_cached_collision(self):
+        def make(val: int):
+            def func() -> int:
+                return val
+            return func
+
+        first = self.cache.cached()(make(1))
+        self.assertRaises(CacheError, self.cache.cached(), make(2))
+        second = self.cache.cached(cache_key="second")(make(2))
+        self.assertEqual((first(), second()), (1, 2))
+
+        # Re-decorating the same function replaces the cache
+        func = make(3)
+        self.cache.cached(cache_key="third")(func)
+        self.assertEqual(self.cache.cached(cache_key="third", lifetime=10)(func)(), 3)
+        self.assertEqual(self.cache.cache_info("third").lifetime, 10)
+
+
+    def test_warm(self):
+        for sharding in (False, True):
+            folder = Path(".pyodb_warm")
+            try:
+                cache = PyODBCache(pyodb_folder=folder, persistent=True, sharding=sharding)
+                cache.add_cache("warm", warm_data, PrimitiveBasic, lifetime=30, stale_ttl=5)
+                cache.add_cache("warm_blob", warm_data, PrimitiveBasic, storage="blob")
+                # Lambdas cannot be restored
+                cache.add_cache("local", lambda: [], PrimitiveBasic)
+                cache.add_cache("replaced", warm_data, PrimitiveBasic)
+                cache.add_cache("replaced", lambda amount: [], PrimitiveBasic, force=True)
+                for amount in (1, 2):
+                    cache.get_data("warm", amount)
+                    cache.get_data("warm_blob", amount)
+                del cache
+                WARM_CALLS.clear()
+
+                # Definitions are restored and entries are loaded without calling the data function
+                restarted = PyODBCache(pyodb_folder=folder, persistent=True, sharding=sharding)
+                self.assertEqual(restarted.warm(), 4)
+                self.assertEqual(restarted.caches["warm"].stale_ttl, 5)
+                self.assertEqual(restarted.caches["warm_blob"].storage, "blob")
+                self.assertEqual(sorted(restarted.caches), ["warm", "warm_blob"])
+                self.assertEqual(len(restarted.memory), 4)
+                self.assertEqual(len(restarted.get_data("warm", 2)), 2)
+                self.assertEqual(len(restarted.get_data("warm_blob", 1)), 1)
+                self.assertEqual(restarted.cache_info("warm"), (1, 0, 30, 2))
+                self.assertEqual(WARM_CALLS, [])
+                self.assertRaises(CacheError, restarted.warm, ["unknown"])
+                restarted.pyodb.persistent = False
+                del restarted
+            finally:
+                shutil.rmtree(folder, ignore_errors=True)
+
+
+    def test_stats(self):
+        self.cache["test"]
+        self.cache["test"]
+        self.cache.memory.clear()
+        self.cache["test"]
+
+        stats = self.cache.stats()
+        self.assertEqual(set(stats), {"test", "test2"})
+        test = stats["test"]
+        self.assertEqual(
+            (test["memory_hits"], test["db_hits"], test["misses"], test["refreshes"]), (1, 1, 1, 0)
+        )
+        self.assertEqual(test["entries"], 1)
+        self.assertGreater(test["size"], 0)
+        self.assertEqual(stats["test2"]["entries"], 0)
+
+        latency = test["latency"]["miss"]
+        self.assertEqual(latency["count"], 1)
+        self.assertEqual(sum(latency["buckets"].values()), 1)
+        self.assertGreater(latency["total"], 0)
+        self.assertEqual(list(latency["buckets"])[-1], float("inf"))
+
+        self.assertEqual(self.cache.stats("test", reset=True)["test"]["misses"], 1)
+        self.assertEqual(self.cache.stats("test")["test"]["misses"], 0)
+        self.assertEqual(self.cache.stats("test")["test"]["latency"]["miss"]["count"], 0)
+        self.assertRaises(CacheError, self.cache.stats, "unknown")
+
+
+    def test_shared_memory(self):
+        calls = []
+        def data_func(amount: int) -> list[PrimitiveBasic]:
+            calls.append(amount)
+            return [PrimitiveBasic() for _ in range(amount)]
+
+        first, second = PyODBCache(shared_memory=True), PyODBCache(shared_memory=True)
+        for cache in (first, second):
+            cache.add_cache("shared", data_func, PrimitiveBasic)
+        data = first.get_data("shared", 3)
+        loaded = second.get_data("shared", 3)
+        self.assertEqual([pb.integer for pb in loaded], [pb.integer for pb in data])
+        self.assertEqual(calls, [3])
+        self.assertEqual(second.stats("shared")["shared"]["shared_hits"], 1)
+        self.assertEqual(second.cache_info("shared").hits, 1)
+
+        # Processes read the entries without querying the database
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        job = context.Process(target=shared_memory_job, args=[queue])
+        job.start()
+        self.assertEqual(queue.get(timeout=30), ([pb.integer for pb in data], 1))
+        job.join()
+        self.assertIsNotNone(second.get_data("shared", 3))
+
+        # Clearing invalidates the entries of all instances
+        second.clear("shared")
+        self.assertEqual(len(first.get_data("shared", 3)), 3)
+        self.assertEqual(calls, [3, 3])
+        self.assertEqual(first.stats("shared")["shared"]["shared_hits"], 0)
+
+        # Data which cannot be mirrored is still returned
+        def full(*args):
+            raise OSError("No space left")
+        with mock.patch.object(first._shared, "put", side_effect=full):
+            with self.assertWarns(PyODBWarning):
+                self.assertEqual(len(first.get_data("shared", 4)), 4)
+        del first, second
+
+
     def test_cache_overwrite(self):
         self.cache.add_cache(
             "test",
@@ -5,7 +5,7 @@ from time import sleep, time
 from unittest import TestCase
 
 from pyodb.error import BadTypeError, ExpiryError, ParentError, QueryError
-from pyodb.schema.base._sql_builders import Delete, Insert, MultiInsert, Select
+from pyodb.schema.base._sql_builders import Delete, Insert, MultiInsert, Select, Update
 from pyodb.schema.unified_schema import UnifiedSchema
 
 
@@ -166,6 +166,57 @@ class SelectTest(TestCase):
     def test_count(self):
         res = Select(ComplexMulti, self.schema._tables).count()
         self.assertEqual(res, 10)
+        res = Select(PrimitiveBasic, self.schema._tables).eq(_private = self.pbs[0]._private).count()
+        self.assertEqual(res, 1)
+
+
+class UpdateTest(TestCase):
+    def setUp(self) -> None:
+        self.schema = UnifiedSchema(Path(".pyodb"), 3, False)
+        self.schema.add_type(PrimitiveBasic)
+        self.pbs = [PrimitiveBasic() for _ in range(10)]
+        for i, pb in enumerate(self.pbs):
+            pb.integer = i
+        self.schema.insert_many(self.pbs, None)
+        expiring = PrimitiveBasic()
+        expiring.integer = 100
+        self.schema.insert_many([expiring], time() + 0.2)
+        return super().setUp()
+
+
+    def tearDown(self) -> None:
+        del self.schema
+        return super().tearDown()
+
+
+    def test_set(self):
+        res = self.schema.select(PrimitiveBasic).lt(integer = 5).update(text = "updated")
+        self.assertEqual(res, 5)
+        res = Select(PrimitiveBasic, self.schema._tables).eq(text = "updated").all()
+        self.assertEqual(sorted(pb.integer for pb in res), [0, 1, 2, 3, 4])
+
+
+    def test_incr(self):
+        update = Update(PrimitiveBasic, self.schema._tables).incr(integer = 10).set(truth = True)
+        self.assertEqual(update.eq(integer = 3, or_ = True).eq(integer = 4).commit(), 2)
+        res = Select(PrimitiveBasic, self.schema._tables).ge(integer = 10).lt(integer = 100).all()
+        self.assertEqual(sorted(pb.integer for pb in res), [13, 14])
+        self.assertTrue(all(pb.truth for pb in res))
+
+
+    def test_expired(self):
+        sleep(0.25)
+        self.assertEqual(self.schema.select(PrimitiveBasic).incr(_private = 1.5), 10)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 10)
+
+
+    def test_errors(self):
+        update = Update(PrimitiveBasic, self.schema._tables)
+        self.assertRaises(QueryError, update.commit)
+        self.assertRaises(QueryError, update.set, unknown = 1)
+        self.assertRaises(QueryError, update.incr, text = 1)
+        self.assertRaises(BadTypeError, update.set, text = [1])
+        self.assertRaises(BadTypeError, update.incr, integer = "1")
 
 
 class DeleteTest(TestCase):
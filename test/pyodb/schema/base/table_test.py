@@ -1,6 +1,7 @@
 from pathlib import Path
 from test.test_models.complex_models import ComplexBasic
 from test.test_models.primitive_models import PrimitiveBasic, PrimitiveContainer
+from threading import Thread
 from unittest import TestCase
 
 from pyodb.schema.unified_schema import UnifiedSchema
@@ -39,3 +40,12 @@ class TableTest(TestCase):
     def test_fqcn(self):
         self.assertEqual(self.tpbasic.fqcn, "test.test_models.primitive_models.PrimitiveBasic")
         self.assertEqual(self.tpbasic.name, "PrimitiveBasic")
+
+
+    def test_per_thread_connections(self):
+        conns = []
+        thread = Thread(target=lambda: conns.append(self.tpbasic.dbconn))
+        thread.start()
+        thread.join()
+        self.assertIsNot(conns[0], self.tpbasic.dbconn)
+        self.assertIs(self.tpbasic.dbconn, self.tpbasic.dbconn)
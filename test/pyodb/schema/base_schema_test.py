@@ -1,10 +1,10 @@
 import sqlite3 as sql
 from pathlib import Path
-from test.test_models.complex_models import ComplexBasic, ComplexContainer, ComplexMulti, ComplexPydantic, ComplexTypingModel
+from test.test_models.complex_models import ComplexBasic, ComplexContainer, ComplexMulti, ComplexNode, ComplexPydantic, ComplexTypingModel
 from test.test_models.primitive_models import PrimitiveBasic, PrimitiveContainer, PrimitivePydantic
 from unittest import TestCase
 
-from pyodb.error import DisassemblyError, ParentError, UnknownTypeError
+from pyodb.error import DisassemblyError, ParentError, QueryError, UnknownTypeError, UpdateError
 from pyodb.schema._base_schema import BaseSchema
 from pyodb.schema.base._sql_builders import Delete, Select
 from pyodb.schema.unified_schema import UnifiedSchema
@@ -137,15 +137,270 @@ class BaseSchemaTest(TestCase):
         ).fetchone()[0]
         self.assertEqual(count, 10)
 
+        # The sub-objects are shared by all 10 objects and therefore only stored once
         count: int = dbconn.execute(
             "SELECT COUNT(*) FROM \"test.test_models.primitive_models.PrimitiveBasic\";"
         ).fetchone()[0]
-        self.assertEqual(count, 10)
+        self.assertEqual(count, 1)
 
         count: int = dbconn.execute(
             "SELECT COUNT(*) FROM \"test.test_models.primitive_models.PrimitiveContainer\";"
         ).fetchone()[0]
-        self.assertEqual(count, 10)
+        self.assertEqual(count, 1)
+
+
+    def test_shared_sub_objects(self):
+        Path(".pyodb/pyodb.db").unlink(True)
+        self.schema = UnifiedSchema(Path(".pyodb"), 2, False)
+        self.schema.add_type(ComplexBasic)
+        shared = PrimitiveBasic()
+        cbs = [ComplexBasic() for _ in range(3)]
+        for cb in cbs:
+            cb.basic = shared
+        self.schema.insert_many(cbs, None)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 1)
+
+        loaded: list[ComplexBasic] = self.schema.select(ComplexBasic).all()
+        self.assertEqual(loaded, cbs)
+        self.assertIs(loaded[0].basic, loaded[1].basic)
+        self.assertIs(loaded[0].basic, loaded[2].basic)
+
+        # 3 objects, 3 containers and the shared PrimitiveBasic
+        self.assertEqual(self.schema.delete(ComplexBasic).commit(True), 7)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 0)
+
+
+    def test_delete_shared_owner(self):
+        Path(".pyodb/pyodb.db").unlink(True)
+        self.schema = UnifiedSchema(Path(".pyodb"), 2, False)
+        self.schema.track_loaded = True
+        self.schema.add_type(ComplexBasic)
+        shared = PrimitiveBasic()
+        cbs = [ComplexBasic() for _ in range(3)]
+        for i, cb in enumerate(cbs):
+            cb.random_number = i
+            cb.basic = shared
+        self.schema.insert_many(cbs, None)
+
+        # The object the shared object was stored with is deleted first
+        self.schema.delete(ComplexBasic).eq(random_number=0).commit()
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 1)
+        loaded = self.schema.select(ComplexBasic).all()
+        self.assertEqual([cb.basic for cb in loaded], [shared, shared])
+        self.assertIs(loaded[0].basic, loaded[1].basic)
+
+        # Updates keep the reference and update the shared object
+        loaded[0].basic.integer = 5000
+        self.schema.update(loaded[0])
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 1)
+        self.assertEqual(self.schema.select(ComplexBasic).eq(random_number=2).one().basic.integer, 5000)
+
+        # The shared object is deleted with the last reference
+        self.schema.delete(ComplexBasic).eq(random_number=1).commit()
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 1)
+        loaded = self.schema.select(ComplexBasic).one()
+        loaded.basic = PrimitiveBasic()
+        self.schema.update(loaded)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 1)
+        self.assertEqual(self.schema.delete(ComplexBasic).commit(True), 3)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 0)
+
+
+    def test_delete_reference_scan(self):
+        Path(".pyodb/pyodb.db").unlink(True)
+        self.schema = UnifiedSchema(Path(".pyodb"), 2, False)
+        self.schema.add_type(ComplexBasic)
+        self.schema.add_type(ComplexMulti)
+        self.schema.insert_many([ComplexBasic() for _ in range(3)], None)
+
+        stmts: list[str] = []
+        self.schema._tables[ComplexBasic].dbconn.set_trace_callback(stmts.append)
+        self.assertEqual(self.schema.delete(ComplexBasic).commit(True), 9)
+        # Only members which may reference the deleted sub-objects are searched
+        scanned = {
+            (column, pattern.split(".")[-1].split("@")[0])
+            for column, _, pattern in (
+                stmt.split(" WHERE ")[1].split()[:3] for stmt in stmts if " LIKE " in stmt
+            )
+        }
+        self.assertEqual(scanned, {
+            ("basic", "PrimitiveBasic"), ("multi", "PrimitiveBasic"),
+            ("container", "PrimitiveContainer"), ("multi", "PrimitiveContainer"),
+        })
+
+
+    def test_replace_shared_child(self):
+        Path(".pyodb/pyodb.db").unlink(True)
+        self.schema = UnifiedSchema(Path(".pyodb"), 2, False)
+        self.schema.add_type(ComplexBasic)
+        self.schema.track_saved = True
+        first, second = ComplexBasic(), ComplexBasic()
+        second.basic = first.basic
+        self.schema.insert_many([first, second], None)
+
+        # Replacing the child of it's owner keeps it for the other reference
+        first.basic = PrimitiveBasic()
+        self.schema.update(first)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 2)
+        loaded = {cb.random_number: cb for cb in self.schema.select(ComplexBasic).all()}
+        self.assertEqual(loaded[first.random_number].basic, first.basic)
+        self.assertEqual(loaded[second.random_number].basic, second.basic)
+
+        self.schema.delete(ComplexBasic).eq(random_number=second.random_number).commit()
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 1)
+
+
+    def test_cyclic_objects(self):
+        Path(".pyodb/pyodb.db").unlink(True)
+        self.schema = UnifiedSchema(Path(".pyodb"), 5, False)
+        self.schema.add_type(ComplexNode)
+        first = ComplexNode("first")
+        first.next_ = ComplexNode("second", first)
+        self.schema.insert(first, None)
+        self.schema.insert_many([first], None)
+
+        for loaded in self.schema.select(ComplexNode).eq(name="first").all():
+            self.assertEqual(loaded.next_.name, "second")
+            self.assertIs(loaded.next_.next_, loaded)
+
+        loaded = self.schema.select(ComplexNode).eq(name="first").first()
+        self.assertIs(loaded.next_.next_, loaded)
+        self.assertEqual(self.schema.delete(ComplexNode).commit(True), 4)
+
+
+    def test_transaction(self):
+        Path(".pyodb/pyodb.db").unlink(True)
+        self.schema = UnifiedSchema(Path(".pyodb"), 2, False)
+        self.schema.add_type(ComplexBasic)
+
+        def failing_insert():
+            with self.schema.transaction():
+                self.schema.insert_many([ComplexBasic() for _ in range(3)], None)
+                raise ValueError("Abort")
+
+        self.assertRaises(ValueError, failing_insert)
+        self.assertEqual(self.schema.select(ComplexBasic).count(), 0)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 0)
+
+        with self.schema.transaction():
+            self.schema.insert(ComplexBasic(), None)
+            self.schema.insert(ComplexBasic(), None)
+        self.assertEqual(self.schema.select(ComplexBasic).count(), 2)
+
+
+    def test_transaction_new_type(self):
+        Path(".pyodb/pyodb.db").unlink(True)
+        self.schema = UnifiedSchema(Path(".pyodb"), 2, False)
+        self.schema.add_type(PrimitiveBasic)
+
+        def failing_insert():
+            with self.schema.transaction():
+                self.schema.insert(PrimitiveBasic(), None)
+                self.schema.add_type(ComplexBasic)
+                self.schema.insert(ComplexBasic(), None)
+                raise ValueError("Abort")
+
+        # Types whose tables were rolled back are forgotten, known types are kept
+        self.assertRaises(ValueError, failing_insert)
+        self.assertFalse(self.schema.is_known_type(ComplexBasic))
+        self.assertFalse(self.schema.is_known_type(PrimitiveContainer))
+        self.assertTrue(self.schema.is_known_type(PrimitiveBasic))
+
+        self.schema.add_type(ComplexBasic)
+        self.schema.insert(ComplexBasic(), None)
+        self.assertEqual(self.schema.select(ComplexBasic).count(), 1)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 1)
+
+
+    def test_bulk_load(self):
+        Path(".pyodb/pyodb.db").unlink(True)
+        self.schema = UnifiedSchema(Path(".pyodb"), 2, False)
+        self.schema.add_type(PrimitiveBasic)
+        table = self.schema._tables[PrimitiveBasic]
+        table.dbconn.execute(f"CREATE INDEX idx_integer ON \"{table.fqcn}\" (integer);")
+        table.dbconn.commit()
+
+        with self.schema.bulk_load():
+            self.assertEqual(self.schema._connector.pragma(table.db_paths[0], "synchronous"), 0)
+            self.assertEqual(table.dbconn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL;"
+            ).fetchone()[0], 0)
+            self.schema.insert_many([PrimitiveBasic() for _ in range(50)], None)
+
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 50)
+        self.assertEqual(self.schema._connector.pragma(table.db_paths[0], "synchronous"), 1)
+        self.assertEqual(table.dbconn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL;"
+        ).fetchone()[0], "idx_integer")
+
+        def failing_load():
+            with self.schema.bulk_load():
+                self.schema.insert_many([PrimitiveBasic() for _ in range(5)], None)
+                raise ValueError("Abort")
+
+        self.assertRaises(ValueError, failing_load)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 50)
+
+
+    def test_update(self):
+        Path(".pyodb/pyodb.db").unlink(True)
+        self.schema = UnifiedSchema(Path(".pyodb"), 2, False)
+        self.schema.add_type(ComplexBasic)
+        saved = ComplexBasic()
+        self.schema.insert(saved, None)
+        self.assertRaises(UpdateError, self.schema.update, ComplexBasic())
+        # Loaded and saved objects are only remembered on demand
+        self.assertRaises(UpdateError, self.schema.update, self.schema.select(ComplexBasic).first())
+        self.assertRaises(UpdateError, self.schema.update, saved)
+        self.schema.track_saved = True
+        self.schema.insert(saved, None)
+        saved.random_number = 4
+        self.schema.update(saved)
+        self.assertEqual(self.schema.select(ComplexBasic).eq(random_number=4).count(), 1)
+        self.schema.delete(ComplexBasic).eq(random_number=4).commit()
+
+        self.schema.track_loaded = True
+        loaded: ComplexBasic = self.schema.select(ComplexBasic).first()
+        loaded.random_number = 5
+        loaded.basic.text = "changed"
+        loaded.container.listing = [1, 2]
+        self.schema.update(loaded)
+        self.assertEqual(self.schema.select(ComplexBasic).first(), loaded)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 1)
+
+        loaded.basic = PrimitiveBasic()
+        self.schema.update(loaded)
+        self.assertEqual(self.schema.select(ComplexBasic).first(), loaded)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 1)
+
+        # Set-based updates invalidate the remembered rows
+        self.schema.select(ComplexBasic).update(random_number=9)
+        self.schema.update(loaded)
+        self.assertEqual(self.schema.select(ComplexBasic).first().random_number, 5)
+        self.schema.select(ComplexBasic).incr(random_number=1)
+        self.schema.delete(ComplexBasic).commit()
+        self.assertRaises(UpdateError, self.schema.update, loaded)
+
+
+    def test_upsert(self):
+        Path(".pyodb/pyodb.db").unlink(True)
+        self.schema = UnifiedSchema(Path(".pyodb"), 2, False)
+        self.schema.add_type(ComplexBasic)
+        self.schema.track_saved = True
+
+        obj = ComplexBasic()
+        obj.random_number = 7
+        self.schema.upsert(obj, "random_number")
+        obj.basic.integer = 3
+        self.schema.upsert(obj)
+
+        other = ComplexBasic()
+        other.random_number = 7
+        self.schema.upsert(other, "random_number")
+        self.assertEqual(self.schema.select(ComplexBasic).count(), 1)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 1)
+        self.assertEqual(self.schema.select(ComplexBasic).first(), other)
+        self.assertRaises(QueryError, self.schema.upsert, ComplexBasic(), "unknown")
 
 
     def test_insert_errors(self):
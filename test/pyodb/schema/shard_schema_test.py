@@ -1,9 +1,15 @@
 import os
+import shutil
+import sqlite3 as sql
 from pathlib import Path
 from test.test_models.complex_models import ComplexBasic
 from test.test_models.primitive_models import PrimitiveBasic, PrimitiveContainer
+from threading import Thread
 from unittest import TestCase
 
+from pyodb.error import TransactionError
+from pyodb.pyodb import PyODB
+from pyodb.schema.base._table import Table
 from pyodb.schema.shard_schema import ShardSchema
 
 
@@ -36,3 +42,224 @@ class ShardSchemaTest(TestCase):
         self.schema.add_type(ComplexBasic)
         self.schema.add_type(PrimitiveBasic)
         self.assertTrue(self.schema._tables[PrimitiveBasic].is_parent)
+
+
+class ShardKeyModel:
+    __odb_shard_key__ = "user"
+    user: str
+    basic: PrimitiveBasic
+
+    def __init__(self, user: str) -> None:
+        self.user = user
+        self.basic = PrimitiveBasic()
+
+
+class PartitionedShardSchemaTest(TestCase):
+    def setUp(self) -> None:
+        self.base_path = Path(".pyodb")
+        self.base_path.mkdir(755, exist_ok=True)
+        self.schema = ShardSchema(self.base_path, 2, False, partitions=4)
+        return super().setUp()
+
+
+    def tearDown(self) -> None:
+        del self.schema
+        return super().tearDown()
+
+
+    def test_partition_files(self):
+        self.schema.add_type(ComplexBasic)
+        table = self.schema._tables[ComplexBasic]
+        self.assertEqual(table.partitions, 4)
+        for i in range(4):
+            self.assertTrue(Path(f".pyodb/ComplexBasic.{i}.db").is_file())
+
+
+    def test_insert_select_delete(self):
+        self.schema.add_type(ComplexBasic)
+        cbs = [ComplexBasic() for _ in range(20)]
+        self.schema.insert_many(cbs[:15], None)
+        for cb in cbs[15:]:
+            self.schema.insert(cb, None)
+
+        table = self.schema._tables[ComplexBasic]
+        counts = [
+            conn.execute(f"SELECT COUNT(*) FROM \"{table.fqcn}\"").fetchone()[0]
+            for conn in table.dbconns
+        ]
+        self.assertEqual(sum(counts), 20)
+        self.assertGreater(len([c for c in counts if c > 0]), 1)
+
+        self.assertEqual(self.schema.select(ComplexBasic).count(), 20)
+        res = self.schema.select(ComplexBasic).all()
+        self.assertEqual(len(res), 20)
+        for cb in cbs:
+            self.assertIn(cb, res)
+        self.assertEqual(self.schema.select(ComplexBasic).eq(random_number=cbs[3].random_number).one(), cbs[3])
+        self.assertEqual(len(self.schema.select(ComplexBasic).limit(5, 17).all()), 3)
+        self.assertEqual(list(self.schema.select(ComplexBasic).iter(3)), res)
+        self.assertEqual(
+            list(self.schema.select(ComplexBasic).limit(8, 5).iter(3)),
+            self.schema.select(ComplexBasic).limit(8, 5).all()
+        )
+
+        deleted = self.schema.delete(ComplexBasic).gt(random_number=cbs[0].random_number).commit()
+        self.assertEqual(self.schema.select(ComplexBasic).count(), 20 - deleted)
+        self.assertEqual(
+            self.schema.select(PrimitiveBasic).count(), 20 - deleted
+        )
+
+
+    def test_reopen_partitions(self):
+        folder = Path(".pyodb_partitions")
+        folder.mkdir(exist_ok=True)
+        schema = ShardSchema(folder, 2, True, partitions=3)
+        schema.add_type(ComplexBasic)
+        schema.insert_many([ComplexBasic() for _ in range(10)], None)
+        del schema
+
+        # Stored types keep their partition count, new types use the passed one
+        schema = ShardSchema(folder, 2, True, partitions=2)
+        schema.load_existing()
+        self.assertEqual(schema._tables[ComplexBasic].partitions, 3)
+        self.assertEqual(schema.select(ComplexBasic).count(), 10)
+        schema.add_type(ShardKeyModel)
+        self.assertEqual(schema._tables[ShardKeyModel].partitions, 2)
+        del schema
+
+        # Definitions saved before the partition count was stored were never partitioned
+        with sql.connect(folder / "Table.db") as conn:
+            conn.execute(f"ALTER TABLE \"{Table.__module__}.Table\" DROP COLUMN _partitions;")
+        conn.close()
+        schema = ShardSchema(folder, 2, False, partitions=2)
+        schema.load_existing()
+        self.assertEqual(schema._tables[ComplexBasic].partitions, 1)
+        del schema
+        shutil.rmtree(folder)
+
+
+    def test_invalid_partitions(self):
+        folder = Path(".pyodb_invalid")
+        self.assertRaises(ValueError, ShardSchema, folder, 2, False, partitions=0)
+        self.assertRaises(ValueError, PyODB, pyodb_folder=folder, sharding=True, partitions=0)
+        self.assertFalse(folder.exists())
+
+
+    def test_shard_key(self):
+        self.schema.add_type(ShardKeyModel)
+        table = self.schema._tables[ShardKeyModel]
+        self.schema.insert_many([ShardKeyModel("alice") for _ in range(5)], None)
+        self.schema.insert(ShardKeyModel("alice"), None)
+
+        partition = table.partition_of("alice")
+        for i, conn in enumerate(table.dbconns):
+            count = conn.execute(f"SELECT COUNT(*) FROM \"{table.fqcn}\"").fetchone()[0]
+            self.assertEqual(count, 6 if i == partition else 0)
+
+        # Sub-objects are co-located with their parent
+        sub_table = self.schema._tables[PrimitiveBasic]
+        count = sub_table.dbconns[partition].execute(
+            f"SELECT COUNT(*) FROM \"{sub_table.fqcn}\""
+        ).fetchone()[0]
+        self.assertEqual(count, 6)
+        self.assertEqual(len(self.schema.select(ShardKeyModel).all()), 6)
+
+
+    def test_transaction(self):
+        self.schema.add_type(ComplexBasic)
+        cbs = [ComplexBasic() for _ in range(6)]
+        for i, cb in enumerate(cbs):
+            cb.random_number = i % 2
+        self.schema.insert_many(cbs, None)
+
+        # Partitions are processed by the transaction's thread instead of the fan-out pool
+        with self.schema.transaction():
+            self.schema.insert(ComplexBasic(), None)
+            self.assertEqual(self.schema.delete(ComplexBasic).eq(random_number=1).commit(True), 9)
+            self.assertEqual(len(self.schema.select(ComplexBasic).all()), 4)
+        self.assertEqual(self.schema.select(ComplexBasic).count(), 4)
+
+        def failing_delete():
+            with self.schema.transaction():
+                self.schema.delete(ComplexBasic).commit()
+                raise ValueError("Abort")
+
+        self.assertRaises(ValueError, failing_delete)
+        self.assertEqual(self.schema.select(ComplexBasic).count(), 4)
+
+
+    def test_bad_partitions(self):
+        self.assertRaises(ValueError, ShardSchema, self.base_path, 2, False, 0)
+
+
+class AttachedShardSchemaTest(TestCase):
+    def setUp(self) -> None:
+        self.base_path = Path(".pyodb")
+        self.base_path.mkdir(755, exist_ok=True)
+        self.schema = ShardSchema(self.base_path, 2, False, attach=True)
+        self.schema.add_type(ComplexBasic)
+        return super().setUp()
+
+
+    def tearDown(self) -> None:
+        del self.schema
+        return super().tearDown()
+
+
+    def test_shared_connection(self):
+        tables = self.schema._tables
+        self.assertIs(tables[ComplexBasic].dbconn, tables[PrimitiveBasic].dbconn)
+        self.assertIs(tables[ComplexBasic].dbconn, tables[PrimitiveContainer].dbconn)
+        dbpath = Path(".pyodb/ComplexBasic.db")
+        self.assertTrue(dbpath.is_file())
+
+
+    def test_insert_select_delete(self):
+        cbs = [ComplexBasic() for _ in range(5)]
+        self.schema.insert(cbs[0], None)
+        self.schema.insert_many(cbs[1:], None)
+
+        res = self.schema.select(ComplexBasic).all()
+        self.assertEqual(len(res), 5)
+        for cb in cbs:
+            self.assertIn(cb, res)
+
+        self.assertEqual(self.schema.delete(ComplexBasic).commit(True), 15)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 0)
+
+
+    def test_attach_in_transaction(self):
+        # Known files are attached once a transaction starts on a new thread
+        def insert():
+            with self.schema.transaction():
+                self.schema.insert(ComplexBasic(), None)
+        thread = Thread(target=insert)
+        thread.start()
+        thread.join()
+        self.assertEqual(self.schema.select(ComplexBasic).count(), 1)
+
+        def add_type():
+            with self.schema.transaction():
+                self.schema.add_type(ShardKeyModel)
+                self.schema.insert(ShardKeyModel("alice"), None)
+
+        self.assertRaises(TransactionError, add_type)
+        # The file of the table forgotten after the rollback is removed as well
+        self.assertFalse(self.schema.is_known_type(ShardKeyModel))
+        path = self.base_path / "ShardKeyModel.db"
+        self.assertTrue(path.exists())
+        del self.schema
+        self.assertFalse(path.exists())
+        self.schema = ShardSchema(self.base_path, 2, False, attach=True)
+
+
+    def test_transaction_rollback(self):
+        def failing_insert():
+            with self.schema.transaction():
+                self.schema.insert(ComplexBasic(), None)
+                raise ValueError("Abort")
+
+        self.assertRaises(ValueError, failing_insert)
+        self.assertEqual(self.schema.select(ComplexBasic).count(), 0)
+        self.assertEqual(self.schema.select(PrimitiveBasic).count(), 0)
+        self.assertEqual(self.schema.select(PrimitiveContainer).count(), 0)
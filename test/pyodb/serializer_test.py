@@ -0,0 +1,52 @@
+import pickle
+from test.test_models.primitive_models import PrimitiveBasic
+from unittest import TestCase
+
+from pyodb.serializer import Serializer, loads
+
+
+class SerializerTest(TestCase):
+    def test_formats(self):
+        data = {"listing": [1, 2.5, "three", True, None], "nested": {"a": [1, 2]}}
+        for format in ("pickle", "marshal", "json"):
+            for compression in (None, "zlib", "lzma"):
+                serializer = Serializer(format, compression, threshold=0)
+                self.assertEqual(loads(serializer.dumps(data)), data)
+        self.assertEqual(loads(Serializer("marshal").dumps({1, 2})), {1, 2})
+
+
+    def test_compression_threshold(self):
+        data = list(range(1000))
+        small = Serializer("pickle", "zlib", threshold=10**6).dumps(data)
+        compressed = Serializer("pickle", "zlib").dumps(data)
+        self.assertLess(len(compressed), len(small))
+        self.assertEqual(loads(memoryview(compressed)), data)
+
+
+    def test_fallback(self):
+        obj = PrimitiveBasic()
+        for format in ("marshal", "json"):
+            res = loads(Serializer(format).dumps(obj))
+            self.assertIsInstance(res, PrimitiveBasic)
+            self.assertEqual(res.integer, obj.integer)
+
+        # JSON does not keep non-string keys and nested tuples
+        serializer = Serializer("json")
+        cyclic: list = []
+        cyclic.append(cyclic)
+        res = loads(serializer.dumps(cyclic))
+        self.assertIs(res[0], res)
+        for data in ({1: (1, 2)}, [(1, 2)], {"a": {(1, 2): "b"}}, [{1, 2}]):
+            self.assertEqual(loads(serializer.dumps(data)), data)
+            self.assertEqual(serializer.dumps(data)[1:2], b"p")
+        self.assertEqual(serializer.dumps((1, [2])), serializer.dumps([1, [2]]))
+
+
+    def test_legacy(self):
+        self.assertEqual(loads(pickle.dumps([1, 2, 3])), [1, 2, 3])
+        self.assertEqual(loads(pickle.dumps({"a": 1}, 0)), {"a": 1})
+
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, Serializer, "yaml")
+        self.assertRaises(ValueError, Serializer, "json", "gzip")
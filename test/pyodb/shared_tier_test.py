@@ -0,0 +1,106 @@
+import errno
+import os
+import subprocess
+import sys
+from pathlib import Path
+from time import time
+from unittest import TestCase, mock, skipUnless
+
+from pyodb._shared_tier import SharedTier
+from pyodb._util import generate_uid
+
+
+class SharedTierTest(TestCase):
+    def setUp(self) -> None:
+        self.namespace = generate_uid()
+        self.tier = SharedTier(self.namespace)
+        return super().setUp()
+
+
+    def tearDown(self) -> None:
+        self.tier.close(unlink=True)
+        return super().tearDown()
+
+
+    def test_put_get(self):
+        expires = time() + 60
+        self.assertIsNone(self.tier.get("test", "a"))
+        self.tier.put("test", "a", b"payload", expires)
+        self.assertEqual(self.tier.get("test", "a"), (b"payload", expires))
+        self.assertIsNone(self.tier.get("test", "b"))
+        self.assertIsNone(self.tier.get("other", "a"))
+
+        # Other instances of the namespace read the same segments
+        other = SharedTier(self.namespace)
+        self.assertEqual(other.get("test", "a"), (b"payload", expires))
+        self.assertIsNone(SharedTier(generate_uid()).get("test", "a"))
+
+        # Replaced payloads are read once they are completely written
+        self.tier.put("test", "a", b"new payload" * 1000, expires + 1)
+        self.assertEqual(other.get("test", "a"), (b"new payload" * 1000, expires + 1))
+        self.tier.put("test", "a", b"", expires)
+        self.assertEqual(other.get("test", "a"), (b"", expires))
+        other.close()
+
+
+    def test_invalidate(self):
+        expires = time() + 60
+        self.tier.put("test", "a", b"a", expires)
+        self.tier.put("test2", "a", b"a", expires)
+        self.tier.invalidate("test")
+        self.assertIsNone(self.tier.get("test", "a"))
+        self.assertEqual(self.tier.get("test2", "a"), (b"a", expires))
+
+        self.tier.put("test", "a", b"b", expires)
+        self.assertEqual(self.tier.get("test", "a"), (b"b", expires))
+
+
+    def test_close(self):
+        self.tier.put("test", "a", b"a", time() + 60)
+        other = SharedTier(self.namespace)
+        other.close(unlink=True)
+        self.assertIsNotNone(self.tier.get("test", "a"))
+
+        self.tier.close(unlink=True)
+        self.assertIsNone(SharedTier(self.namespace).get("test", "a"))
+
+
+    @skipUnless(Path("/proc/self/fd").exists(), "Requires /proc")
+    def test_open_files(self):
+        expires = time() + 60
+        self.tier.put("test", "a", b"a", expires)
+        self.tier.get("test", "a")
+        open_files = len(os.listdir("/proc/self/fd"))
+        # Only the most recently used headers stay attached, payloads are detached after reading
+        with mock.patch("pyodb._shared_tier._MAX_ATTACHED", 8):
+            for i in range(50):
+                self.tier.put("test", str(i), b"payload", expires)
+                self.tier.put("test", str(i), b"new payload", expires)
+                self.assertEqual(self.tier.get("test", str(i)), (b"new payload", expires))
+        self.assertLessEqual(len(os.listdir("/proc/self/fd")), open_files + 8)
+
+
+    def test_attach_error(self):
+        self.tier.put("test", "a", b"a", time() + 60)
+        other = SharedTier(self.namespace)
+        too_many = OSError(errno.EMFILE, "Too many open files")
+        with mock.patch("pyodb._shared_tier._open_segment", side_effect=too_many):
+            self.assertIsNone(other.get("test", "a"))
+        self.assertIsNotNone(other.get("test", "a"))
+        other.close()
+
+
+    def test_no_tracker_errors(self):
+        code = (
+            "from time import time\n"
+            "from pyodb._shared_tier import SharedTier\n"
+            "tier = SharedTier('tracker')\n"
+            "for i in range(4):\n"
+            "    tier.put('test', 'a', b'payload', time() + 60)\n"
+            "tier.close(unlink=True)\n"
+        )
+        res = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            env=os.environ | {"PYTHONPATH": os.pathsep.join(sys.path)}
+        )
+        self.assertEqual(res.stderr, "")
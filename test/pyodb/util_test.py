@@ -1,10 +1,79 @@
 import re
+from threading import get_ident
 from unittest import TestCase
 
-from pyodb._util import generate_uid
+from pyodb._util import FanOutPool, generate_uid, hash_args, locate_type
+from pyodb.error import CacheError
+
+
+class Slotted:
+    __slots__ = ("value",)
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+
+class AddressRepr:
+    def __repr__(self) -> str:
+        return f"<AddressRepr at {hex(id(self))}>"
 
 
 class UtilTest(TestCase):
     def test_create_uid(self):
         for i in range(1, 100):
             self.assertIsInstance(re.fullmatch(rf"[\d\w_-]{{{i}}}", generate_uid(i)), re.Match)
+
+
+    def test_locate_type(self):
+        self.assertIs(locate_type("pyodb._util.FanOutPool"), FanOutPool)
+        self.assertIsNone(locate_type("pyodb._util.Unknown"))
+        self.assertIsNone(locate_type("pyodb.unknown_module.Unknown"))
+
+
+    def test_hash_args(self):
+        self.assertEqual(hash_args((1, "a"), {"x": 1, "y": 2}), hash_args((1, "a"), {"y": 2, "x": 1}))
+        self.assertEqual(hash_args(({3, 2, 1},), {}), hash_args(({1, 2, 3},), {}))
+        self.assertNotEqual(hash_args((1,), {}), hash_args(("1",), {}))
+        self.assertNotEqual(hash_args(([1],), {}), hash_args(((1,),), {}))
+        self.assertNotEqual(hash_args((5,), {}), hash_args((), {"amount": 5}))
+        self.assertEqual(hash_args((FanOutPool(2),), {}), hash_args((FanOutPool(2),), {}))
+        self.assertNotEqual(hash_args((FanOutPool(2),), {}), hash_args((FanOutPool(3),), {}))
+        self.assertEqual(hash_args((Slotted(1),), {}), hash_args((Slotted(1),), {}))
+        self.assertNotEqual(hash_args((Slotted(1),), {}), hash_args((Slotted(2),), {}))
+        self.assertEqual(hash_args((generate_uid,), {}), hash_args((generate_uid,), {}))
+        self.assertRaises(CacheError, hash_args, (lambda: 1,), {})
+        self.assertRaises(CacheError, hash_args, (), {"method": Slotted(1).__init__})
+        self.assertRaises(CacheError, hash_args, ([AddressRepr()],), {})
+
+
+class FanOutPoolTest(TestCase):
+    def setUp(self) -> None:
+        self.pool = FanOutPool(4)
+        return super().setUp()
+
+
+    def tearDown(self) -> None:
+        self.pool.shutdown()
+        return super().tearDown()
+
+
+    def test_map(self):
+        res = self.pool.map([lambda i=i: i*2 for i in range(10)])
+        self.assertEqual(res, [i*2 for i in range(10)])
+        self.assertEqual(self.pool.map([]), [])
+
+
+    def test_runs_on_workers(self):
+        tids = self.pool.map([get_ident for _ in range(4)])
+        self.assertNotIn(get_ident(), tids)
+
+        # Single functions are run inline
+        self.assertEqual(self.pool.map([get_ident]), [get_ident()])
+
+
+    def test_nested_inline(self):
+        def nested() -> list[int]:
+            return self.pool.map([get_ident, get_ident])
+
+        for tids in self.pool.map([nested, nested]):
+            self.assertEqual(len(set(tids)), 1)
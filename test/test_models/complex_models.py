@@ -140,6 +140,17 @@ class ComplexTypingModel:
         self.obj_decimal = Decimal(self.obj_decimal)
 
 
+class ComplexNode:
+    name: str
+
+    def __init__(self, name: str, next_: "ComplexNode | None" = None) -> None:
+        self.name = name
+        self.next_ = next_
+
+# Self references can only be annotated once the class exists
+ComplexNode.__annotations__["next_"] = ComplexNode | None
+
+
 class ComplexIllegal1:
     illegal: PrimitiveBasic | str
 
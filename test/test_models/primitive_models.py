@@ -1,7 +1,10 @@
+from array import array
 from types import UnionType
 from pydantic import BaseModel
 from random import choice, randint, random
 
+from pyodb.blob import Blob
+
 
 def get_random_text(limit: int = 100) -> str:
     allowed_chars = " abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789=!\"§$&/()\\`´\
@@ -136,6 +139,45 @@ listing BLOB NOT NULL,pset BLOB NOT NULL,ptuple BLOB,dictionary BLOB NOT NULL);"
         return False
 
 
+class PrimitiveBinary:
+    name: str
+    payload: bytes
+    extra: bytes | None
+
+    def __init__(self, payload: bytes, extra: bytes | None = None) -> None:
+        self.name = get_random_text(20)
+        self.payload = payload
+        self.extra = extra
+
+
+class PrimitiveStream:
+    name: str
+    data: Blob
+    thumb: Blob | None
+
+    def __init__(self, data: Blob, thumb: Blob | None = None) -> None:
+        self.name = get_random_text(20)
+        self.data = data
+        self.thumb = thumb
+
+
+class PrimitiveArray:
+    floats: array
+    ints: memoryview | None
+
+    def __init__(self, size: int = 1000) -> None:
+        self.floats = array("d", [random() for _ in range(size)])
+        self.ints = memoryview(array("q", [randint(-1000, 1000) for _ in range(size)]))
+
+
+class PrimitiveArrayHint:
+    __odb_members__ = {"samples": array, "timestamps": memoryview | None}
+
+    def __init__(self, size: int = 10) -> None:
+        self.samples = [random() for _ in range(size)]
+        self.timestamps = list(range(size))
+
+
 class PrimitivePydantic(BaseModel):
     test_str: str
     test_float: float